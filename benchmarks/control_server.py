@@ -0,0 +1,86 @@
+"""
+Control server check: sends volume commands through local socket at full speed
+and reports command rate, round trip and audio backend writes.
+Fake audio backend is used, no Windows audio is needed.
+
+Usage (from repository root):
+    python benchmarks/control_server.py --commands 5000
+    python benchmarks/control_server.py --batch 8
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# pylint: disable=wrong-import-position # Reason: Repository root is added to path first
+from PySide6.QtNetwork import QLocalSocket
+from PySide6.QtWidgets import QApplication
+from core.audio_backend import FakeAudioBackend
+from core.control_server import ControlServer
+from core.drawing_window import DrawingWindow
+from core.settings import SettingsManager
+
+
+def exchange(app, client, lines):
+    """ Sends request lines and waits for all responses, returns (responses, seconds) """
+    start = time.perf_counter()
+    client.write(b"".join(json.dumps(line).encode() + b"\n" for line in lines))
+    received = b""
+    while received.count(b"\n") < len(lines):
+        app.processEvents()
+        client.waitForReadyRead(0)
+        received += bytes(client.readAll())
+    return [json.loads(line) for line in received.splitlines()], time.perf_counter() - start
+
+
+def main():
+    """ Runs check and prints report as JSON """
+    parser = argparse.ArgumentParser(description="Control server command rate")
+    parser.add_argument("--commands", type=int, default=2000, help="volume commands to send")
+    parser.add_argument("--batch", type=int, default=0,
+                        help="applications per batch command, 0 sends set commands")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    settings = SettingsManager()
+    settings.audio_backend = FakeAudioBackend([f"App{i}.exe" for i in range(max(args.batch, 1))])
+    window = DrawingWindow(settings)
+    window.volume_writer.backend = settings.audio_backend
+    server = ControlServer(window, f"remixer-benchmark-{os.getpid()}")
+    server.listen()
+
+    client = QLocalSocket()
+    client.connectToServer(server.name)
+    client.waitForConnected(1000)
+
+    _, single = exchange(app, client, [{"cmd": "get", "app": "App0.exe"}])
+    if args.batch:
+        lines = [{"cmd": "batch", "changes": [{"app": f"App{j}.exe", "volume": (i % 100) / 100}
+                                              for j in range(args.batch)]}
+                 for i in range(args.commands)]
+    else:
+        lines = [{"cmd": "set", "app": "App0.exe", "delta": 0.01 if (i // 50) % 2 else -0.01}
+                 for i in range(args.commands)]
+    responses, elapsed = exchange(app, client, lines)
+    window.volume_writer.flush(5)
+    window.volume_writer.stop()
+    server.close()
+
+    print(json.dumps({
+        "commands": args.commands,
+        "batch": args.batch,
+        "failed": sum(not response["ok"] for response in responses),
+        "commands_per_s": round(args.commands / elapsed, 1),
+        "round_trip_ms": round(single * 1000, 3),
+        "backend_calls": dict(settings.audio_backend.calls)
+    }, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Deep-idle check: shows and hides menu, uses volume writer, scroller and (on Linux/macOS)
+serial reader once, then counts wakeups while Remixer is hidden.
+Qt timer events of UI thread and context switches of every thread are counted,
+hidden Remixer is expected to have none. Exits with 1 if there are any
+(main thread is allowed to wake once to end measurement).
+
+Usage (from repository root):
+    python benchmarks/idle_wakeups.py --seconds 5
+    python benchmarks/idle_wakeups.py --keep-draw-timer   # old behaviour, expected to fail
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# pylint: disable=wrong-import-position # Reason: Repository root is added to path first
+from PySide6.QtCore import QObject, QEvent, QTimer
+from PySide6.QtWidgets import QApplication
+from core.audio_backend import FakeAudioBackend
+from core.drawing_window import DrawingWindow
+from core.key_injector import FakeKeyInjector
+from core.settings import SettingsManager
+from modules.scroller import AdaptiveTouchScroller, RecordingSink
+
+
+class TimerEventCounter(QObject):
+    """ Counts timer events of every UI thread object except ignored one """
+    def __init__(self, ignored):
+        super().__init__()
+        self.ignored = ignored
+        self.count = 0
+
+    def eventFilter(self, watched, event): # pylint: disable=invalid-name # Reason: Qt method name
+        """ Counts timer event """
+        if event.type() == QEvent.Type.Timer and watched is not self.ignored:
+            self.count += 1
+        return False
+
+
+def thread_switches():
+    """
+    Returns voluntary context switches (sleeps and wakeups) of every thread by name.
+    Uses /proc on Linux, process total from psutil elsewhere.
+    """
+    names = {thread.native_id: thread.name for thread in threading.enumerate()}
+    task_dir = "/proc/self/task"
+    if os.path.isdir(task_dir):
+        switches = {}
+        for tid in os.listdir(task_dir):
+            try:
+                with open(os.path.join(task_dir, tid, "status"), encoding="utf-8") as file:
+                    for line in file:
+                        if line.startswith("voluntary_ctxt_switches"):
+                            name = names.get(int(tid), f"native {tid}")
+                            switches[name] = int(line.split()[1])
+            except OSError:
+                continue
+        return switches
+
+    import psutil # pylint: disable=import-outside-toplevel # Reason: Only needed without /proc
+    return {"process": psutil.Process().num_ctx_switches().voluntary}
+
+
+def open_serial_device():
+    """
+    Opens pseudo-terminal serial device and sends one event through it.
+    Returns (reader, master fd), None where pseudo-terminals are not available.
+    """
+    if not hasattr(os, "openpty"):
+        return None
+    import tty # pylint: disable=import-outside-toplevel # Reason: POSIX only
+    from modules.serial_port import SerialDevice, SerialReader # pylint: disable=import-outside-toplevel # Reason: Optional part of check
+
+    master, slave = os.openpty()
+    tty.setraw(master)
+    received = threading.Event()
+    device = SerialDevice(os.ttyname(slave), SerialDevice.baud_from_int(115200))
+    device.add_event(SerialDevice.RotaryEncoder.ButtonEvents.CLICK,
+                     lambda _device_time=None: received.set())
+    reader = SerialReader()
+    reader.add_device(device)
+    os.write(master, (SerialDevice.RotaryEncoder.ButtonEvents.CLICK.value + "\n").encode())
+    received.wait(2)
+    return reader, master
+
+
+def report(args, timer_count, wakeups, threads):
+    """
+    Returns report of idle measurement, "idle" is False if anything woke up
+
+    Parameters:
+        args (Namespace): Parsed arguments.
+        timer_count (int): Qt timer events of UI thread.
+        wakeups (dict): Voluntary context switches by thread name.
+        threads (list): Names of running threads.
+    """
+    timer_events = round(timer_count / args.seconds, 2)
+    # Main thread (or process without /proc) wakes once to end measurement
+    allowed = {"MainThread": 1, "process": 1}
+    awake = [name for name, count in wakeups.items() if count > allowed.get(name, 0)]
+    return {
+        "seconds": args.seconds,
+        "draw_timer_kept": args.keep_draw_timer,
+        "qt_timer_events_per_s": timer_events,
+        "thread_wakeups_per_s": {name: round(count / args.seconds, 2)
+                                 for name, count in wakeups.items()},
+        "threads": threads,
+        "awake_threads": awake,
+        "idle": timer_events == 0 and not awake
+    }
+
+
+def main(): # pylint: disable=too-many-locals # Aknowledged
+    """ Runs check and prints report as JSON """
+    parser = argparse.ArgumentParser(description="Count wakeups of hidden Remixer")
+    parser.add_argument("--seconds", type=float, default=5.0, help="idle measurement length")
+    parser.add_argument("--keep-draw-timer", action="store_true",
+                        help="keep frame timer running while hidden (behaviour before deep idle)")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    settings = SettingsManager()
+    backend = FakeAudioBackend()
+    settings.audio_backend = backend
+    window = DrawingWindow(settings)
+    window.volume_writer.backend = backend
+    window.input.key_injector = FakeKeyInjector()
+    window.input._scroller = AdaptiveTouchScroller( # pylint: disable=protected-access # Reason: Scroller without Windows mouse input
+                                                    dict(AdaptiveTouchScroller.DEFAULT_SETTINGS),
+                                                    RecordingSink()
+    )
+    window.show()
+
+    # Wake every part once: menu, volume write, scroll, serial read
+    window.show_menu()
+    window.volume_writer.set_volume(backend.sessions[0], 0.5)
+    window.input.scroll("vertical", "clockwise", 3)
+    serial = open_serial_device()
+    window.hide_menu()
+
+    while window.menu_visible:
+        app.processEvents()
+    window.volume_writer.flush(5)
+    if args.keep_draw_timer:
+        window.timers.start_drawing()
+
+    # Let background threads finish their last work (read-back, scroll decay)
+    settle = QTimer()
+    settle.setSingleShot(True)
+    settle.timeout.connect(app.quit)
+    settle.start(int(window.volume_writer.settle_time * 1000) + 500)
+    app.exec()
+
+    end = QTimer()
+    end.setSingleShot(True)
+    end.timeout.connect(app.quit)
+    counter = TimerEventCounter(end)
+    app.installEventFilter(counter)
+
+    before = thread_switches()
+    end.start(int(args.seconds * 1000))
+    app.exec()
+    after = thread_switches()
+    app.removeEventFilter(counter)
+    threads = sorted(thread.name for thread in threading.enumerate())
+
+    if serial is not None:
+        serial[0].stop()
+        os.close(serial[1])
+    window.input.scroller.stop()
+    window.volume_writer.stop()
+
+    document = report(args, counter.count,
+                      {name: count - before.get(name, 0) for name, count in after.items()},
+                      threads)
+    print(json.dumps(document, indent=4))
+    sys.exit(0 if document["idle"] else 1)
+
+
+if __name__ == "__main__":
+    main()
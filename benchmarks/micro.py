@@ -0,0 +1,312 @@
+"""
+Micro-benchmarks of hot paths outside rendering: icon tinting, menu building, serial line
+parsing, scroller and volume acceleration math, settings loading with large theme files.
+Every case is timed in several rounds, results are saved as JSON baseline and later runs
+are compared with it. Baselines are machine specific, compare runs of the same machine.
+Fake audio backend is used, no Windows audio is needed.
+
+Usage (from repository root):
+    python benchmarks/micro.py run --save baseline.json
+    python benchmarks/micro.py compare baseline.json --threshold 0.15
+    python benchmarks/micro.py run --only build_menu
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# pylint: disable=wrong-import-position # Reason: Repository root is added to path first
+from PySide6.QtWidgets import QApplication
+from core.audio_backend import FakeAudioBackend
+from core.drawing_window import DrawingWindow
+from core.icon_manager import IconManager
+from core.menu_manager import MenuManager
+from core.remixer_theme import RemixerTheme
+from core.settings import SettingsManager
+from modules.scroller import AdaptiveTouchScroller, RecordingSink
+from modules.serial_port import SerialDevice
+
+CASES = {}   # name: (setup function returning timed callable, operations per call)
+CLEANUPS = []   # Called after case is measured, stop threads started by setup
+
+
+def case(name, operations=1):
+    """
+    Registers benchmark case.
+
+    Parameters:
+        name (str): Case name used in results and baselines.
+        operations (int): Operations performed by one call, results are per operation.
+    """
+    def decorator(setup):
+        CASES[name] = (setup, operations)
+        return setup
+    return decorator
+
+
+def make_settings(sessions=8):
+    """ Returns settings with fake audio backend of given number of sessions """
+    settings = SettingsManager()
+    settings.audio_backend = FakeAudioBackend([f"App{i}.exe" for i in range(sessions)])
+    return settings
+
+
+@case("icon_tint")
+def icon_tint():
+    """ PIL recoloring of one colorable icon """
+    settings = make_settings()
+    path = os.path.join(IconManager.internal_icon_dirs()[0], "Theme_Colorable.png")
+    color = settings.get_showing_theme().preferred_icon_color
+    return lambda: IconManager.tint(path, color)
+
+
+@case("icon_load_colored_icons")
+def icon_load_colored_icons():
+    """ Recoloring of every internal icon, done on theme change """
+    return make_settings().icon_manager.load_colored_icons
+
+
+def build_menu_case(sessions):
+    """ Registers menu building with given number of audio sessions """
+    @case(f"build_menu[{sessions} sessions]")
+    def build_menu():
+        # Menu actions are not performed, every callback is None
+        return MenuManager(make_settings(sessions), defaultdict(lambda: None)).build_menu
+    return build_menu
+
+
+for count_ in (10, 100, 500):
+    build_menu_case(count_)
+
+
+ENCODER = SerialDevice.RotaryEncoder
+# Protocol strings of device, with and without device time, and one line matching no event
+SERIAL_LINES = [
+    ENCODER.EncoderEvents.CLOCKWISE.value + "t=1234.5",
+    ENCODER.EncoderEvents.ANTICLOCKWISE.value,
+    ENCODER.ButtonEvents.CLICK.value,
+    ENCODER.ButtonEvents.DOUBLE_CLICK.value + " t=1240",
+    "Debug: heartbeat 42",
+]
+
+
+def serial_device():
+    """ Returns line protocol device with every encoder event registered, port is not opened """
+    device = SerialDevice("COM0", SerialDevice.BaudRates.BAUD_115200)
+    for events in (SerialDevice.RotaryEncoder.EncoderEvents,
+                   SerialDevice.RotaryEncoder.ButtonEvents):
+        for event in events:
+            device.add_event(event, lambda _device_time: None)
+    return device
+
+
+@case("serial_parse_line", operations=len(SERIAL_LINES))
+def serial_parse_line():
+    """ Event lookup, device time parsing and callbacks of decoded lines (line protocol) """
+    protocol = serial_device()._protocol # pylint: disable=protected-access # Reason: Protocol of benchmarked device
+    def dispatch():
+        for line in SERIAL_LINES:
+            for callback, device_time in protocol.parse_line(line):
+                callback(device_time)
+    return dispatch
+
+
+@case("serial_feed_chunk", operations=64)
+def serial_feed_chunk():
+    """ Splitting and decoding of 64 received lines in one chunk """
+    protocol = serial_device()._protocol # pylint: disable=protected-access # Reason: Protocol of benchmarked device
+    chunk = "".join(SERIAL_LINES[i % len(SERIAL_LINES)] + "\r\n" for i in range(64)).encode()
+    return lambda: protocol.feed(chunk)
+
+
+@case("scroller_scroll_pixels")
+def scroller_scroll_pixels():
+    """ Speed multiplier and accumulation of one scroll command """
+    scroller = AdaptiveTouchScroller(AdaptiveTouchScroller.DEFAULT_SETTINGS, RecordingSink())
+    CLEANUPS.append(scroller.stop)
+    return lambda: scroller.scroll_pixels(1)
+
+
+@case("get_volume_delta")
+def get_volume_delta():
+    """ Volume acceleration of knob turning every 5 ms """
+    window = DrawingWindow(make_settings())
+    clock = [0]
+    def delta():
+        clock[0] += 5_000_000
+        return window.input.get_volume_delta(0.01, clock[0])
+    return delta
+
+
+def load_settings_case(themes):
+    """ Registers settings loading with themes.json of given number of themes """
+    @case(f"load_settings[{themes} themes]")
+    def load_settings():
+        settings = make_settings()
+        with open(os.path.join(ROOT, "themes.json"), encoding="utf-8") as file:
+            original = json.load(file)
+        configs = list(original.values())
+        selected = configs[0]["name"]
+        large = {}
+        for i in range(themes):
+            name = selected if i == 0 else f"Theme{i}"
+            large[name] = dict(configs[i % len(configs)], name=name)
+
+        directory = tempfile.mkdtemp(prefix="remixer-micro-")
+        CLEANUPS.append(lambda: shutil.rmtree(directory, ignore_errors=True))
+        shutil.copy(os.path.join(ROOT, "settings.json"), directory)
+        with open(os.path.join(directory, "settings.json"), encoding="utf-8") as file:
+            settings_json = json.load(file)
+        settings_json["SelectedTheme"] = selected
+        with open(os.path.join(directory, "settings.json"), "w", encoding="utf-8") as file:
+            json.dump(settings_json, file)
+        with open(os.path.join(directory, "themes.json"), "w", encoding="utf-8") as file:
+            json.dump(large, file)
+
+        def load():
+            # Settings files are read from working directory,
+            # loaded themes are forgotten so every call loads them as at startup
+            RemixerTheme.name_index.clear()
+            os.chdir(directory)
+            try:
+                settings._load_settings() # pylint: disable=protected-access # Reason: Benchmarked method
+            finally:
+                os.chdir(ROOT)
+        return load
+    return load_settings
+
+
+for count_ in (12, 500):
+    load_settings_case(count_)
+
+
+def measure(function, operations, rounds, round_ms):
+    """
+    Times function in rounds, number of calls per round is chosen to last about round_ms.
+    Returns result with per-operation microseconds.
+    """
+    function()
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed * 1000 >= round_ms / 2 or calls >= 1_000_000:
+            break
+        calls *= 2
+
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(calls):
+            function()
+        times.append((time.perf_counter() - start) / (calls * operations) * 1e6)
+    return {
+        "median_us": round(statistics.median(times), 4),
+        "min_us": round(min(times), 4),
+        "calls_per_round": calls
+    }
+
+
+def run(only=None, rounds=7, round_ms=100):
+    """ Runs cases whose name contains only (all if None), returns results document """
+    results = {}
+    for name, (setup, operations) in CASES.items():
+        if only and only not in name:
+            continue
+        results[name] = measure(setup(), operations, rounds, round_ms)
+        while CLEANUPS:
+            CLEANUPS.pop()()
+        print(f"{name:32} {results[name]['median_us']:12.3f} us", file=sys.stderr, flush=True)
+    return {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.node(),
+            "rounds": rounds
+        },
+        "results": results
+    }
+
+
+def compare(baseline, current, threshold):
+    """
+    Compares minimal round times of cases present in both documents.
+    Returns (report rows, number of regressions).
+    """
+    rows = []
+    regressions = 0
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            rows.append({"case": name, "status": "new", "current_us": result["min_us"]})
+            continue
+        change = result["min_us"] / base["min_us"] - 1 if base["min_us"] else 0.0
+        status = "ok"
+        if change > threshold:
+            status = "REGRESSION"
+            regressions += 1
+        elif change < -threshold:
+            status = "faster"
+        rows.append({"case": name, "status": status, "baseline_us": base["min_us"],
+                     "current_us": result["min_us"], "change": round(change, 4)})
+    return rows, regressions
+
+
+def main():
+    """ Runs suite or comparison, comparison exits with 1 if there is regression """
+    parser = argparse.ArgumentParser(description="Remixer micro-benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="run cases and print results as JSON")
+    run_parser.add_argument("--save", metavar="FILE", help="write results to FILE (baseline)")
+    compare_parser = commands.add_parser("compare", help="run cases and compare with baseline")
+    compare_parser.add_argument("baseline", help="results saved by run --save")
+    compare_parser.add_argument("--current", metavar="FILE",
+                                help="compare saved results instead of running cases")
+    compare_parser.add_argument("--threshold", type=float, default=0.15,
+                                help="relative slowdown reported as regression")
+    for command_parser in (run_parser, compare_parser):
+        command_parser.add_argument("--only", help="run cases whose name contains this text")
+        command_parser.add_argument("--rounds", type=int, default=7, help="rounds per case")
+        command_parser.add_argument("--round-ms", type=float, default=100,
+                                    help="approximate length of one round")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1]) # pylint: disable=unused-variable # Reason: Pixmaps and windows need application
+    if args.command == "run":
+        document = run(args.only, args.rounds, args.round_ms)
+        if args.save:
+            with open(args.save, "w", encoding="utf-8") as file:
+                json.dump(document, file, indent=4)
+        print(json.dumps(document, indent=4))
+        return
+
+    with open(args.baseline, encoding="utf-8") as file:
+        baseline = json.load(file)
+    if args.current:
+        with open(args.current, encoding="utf-8") as file:
+            current = json.load(file)
+    else:
+        current = run(args.only, args.rounds, args.round_ms)
+    rows, regressions = compare(baseline, current, args.threshold)
+    print(json.dumps({"threshold": args.threshold, "regressions": regressions,
+                      "cases": rows}, indent=4))
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Render thread check: spins menu pointer while UI thread is blocked periodically
+(slow icon extraction, settings write) and reports gaps between painted frames.
+Without "RenderThread" frames are painted in paintEvent, with it in render thread.
+Stall is busy loop holding GIL by default, like Python work in UI thread;
+sleep stall releases GIL, like blocking system call.
+
+Usage (from repository root):
+    python benchmarks/render_thread.py --seconds 3 --stall-ms 50 --every-ms 200
+    python benchmarks/render_thread.py --render-thread
+    python benchmarks/render_thread.py --render-thread --stall sleep
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# pylint: disable=wrong-import-position # Reason: Repository root is added to path first
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QApplication
+from core.audio_backend import FakeAudioBackend
+from core.drawing_window import DrawingWindow
+from core.key_injector import FakeKeyInjector
+from core.settings import SettingsManager
+from core.tracer import Tracer
+
+
+def frame_gaps(name):
+    """ Returns gaps (ms) between trace events with given name """
+    times = sorted(event["ts"] for event in Tracer.events if event["name"] == name)
+    return [(b - a) / 1000 for a, b in zip(times, times[1:])]
+
+
+def busy_stall(seconds):
+    """ Blocks calling thread without releasing GIL """
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def main():
+    """ Runs check and prints report as JSON """
+    parser = argparse.ArgumentParser(description="Frame gaps while UI thread stalls")
+    parser.add_argument("--seconds", type=float, default=3.0, help="measurement length")
+    parser.add_argument("--stall-ms", type=float, default=50.0, help="UI thread stall length")
+    parser.add_argument("--every-ms", type=int, default=200, help="UI thread stall period")
+    parser.add_argument("--stall", choices=("busy", "sleep"), default="busy",
+                        help="busy loop holds GIL, sleep releases it")
+    parser.add_argument("--render-thread", action="store_true", help="paint in render thread")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    settings = SettingsManager()
+    settings.render_thread = args.render_thread
+    settings.audio_backend = FakeAudioBackend()
+    window = DrawingWindow(settings)
+    window.volume_writer.backend = settings.audio_backend
+    window.show()
+    window.input.key_injector = FakeKeyInjector()
+    window.show_menu()
+    window.timers.stop_inactivity()
+
+    # Pointer keeps moving: one turn per frame interval of 60 Hz
+    spin = QTimer()
+    spin.timeout.connect(lambda: window.input_queue.push("cw", "benchmark"))
+    spin.start(16)
+    stall = QTimer()
+    stall_function = busy_stall if args.stall == "busy" else time.sleep
+    stall.timeout.connect(lambda: stall_function(args.stall_ms / 1000))
+    stall.start(args.every_ms)
+    end = QTimer()
+    end.setSingleShot(True)
+    end.timeout.connect(app.quit)
+
+    Tracer.start()
+    end.start(int(args.seconds * 1000))
+    app.exec()
+    Tracer.stop()
+
+    if window.render_thread is not None:
+        window.render_thread.stop()
+    window.volume_writer.stop()
+
+    # Frame is painted in paintEvent, or by render thread
+    gaps = frame_gaps("render frame" if args.render_thread else "paintEvent")
+    presented = frame_gaps("frame presented")
+    print(json.dumps({
+        "render_thread": args.render_thread,
+        "refresh_rate": settings.refresh_rate,
+        "stall_ms": args.stall_ms,
+        "stall": args.stall,
+        "painted_frames": len(gaps) + 1,
+        "painted_max_gap_ms": round(max(gaps, default=0), 2),
+        "presented_frames": len(presented) + 1,
+        "presented_max_gap_ms": round(max(presented, default=0), 2)
+    }, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Replays recorded input (main.py --record-input FILE) against fake audio backend
+with offscreen rendering, and reports input and render throughput.
+
+Usage (from repository root):
+    python benchmarks/replay_input.py input.rmxi --speed 4
+    python benchmarks/replay_input.py spin.rmxi --synthetic-spin 2000 --speed 0
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# pylint: disable=wrong-import-position # Reason: Repository root is added to path first
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QApplication
+from core.audio_backend import FakeAudioBackend
+from core.drawing_window import DrawingWindow
+from core.input_queue import InputEvent
+from core.input_recorder import InputRecorder, InputReplayer
+from core.key_injector import FakeKeyInjector
+from core.settings import SettingsManager
+
+
+def write_synthetic_spin(path, turns, interval_ms):
+    """
+    Writes recording: open menu, focus first application, activate volume, spin knob.
+    """
+    recorder = InputRecorder(path)
+    timestamp = 0
+    kinds = ["press", "cw", "press"] + ["cw" if (i // 50) % 2 == 0 else "ccw" for i in range(turns)]
+    for kind in kinds:
+        timestamp += int(interval_ms * 1_000_000)
+        recorder.record(InputEvent(kind, timestamp, "synthetic"))
+    recorder.close()
+
+
+def timed(samples, function):
+    """ Wraps function to append its duration (ms) to samples """
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        result = function(*args, **kwargs)
+        samples.append((time.perf_counter() - started) * 1000)
+        return result
+    return wrapper
+
+
+def describe(samples):
+    """ Returns count, median and 95th percentile of samples """
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "median_ms": round(statistics.median(ordered), 4),
+        "p95_ms": round(ordered[int(len(ordered) * 0.95) - 1 if len(ordered) > 1 else 0], 4),
+        "max_ms": round(ordered[-1], 4)
+    }
+
+
+def main(): # pylint: disable=too-many-locals # Aknowledged
+    """ Runs replay and prints report as JSON """
+    parser = argparse.ArgumentParser(description="Replay recorded Remixer input")
+    parser.add_argument("recording", help="file written by main.py --record-input")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="replay speed multiplier, 0 pushes events without pauses")
+    parser.add_argument("--sessions", type=int, default=8, help="number of fake audio sessions")
+    parser.add_argument("--latency-ms", type=float, default=0.0,
+                        help="emulated duration of every audio backend call")
+    parser.add_argument("--synthetic-spin", type=int, metavar="TURNS",
+                        help="write synthetic fast spin recording to file before replay")
+    parser.add_argument("--interval-ms", type=float, default=5.0,
+                        help="turn interval of synthetic spin")
+    args = parser.parse_args()
+
+    if args.synthetic_spin:
+        write_synthetic_spin(args.recording, args.synthetic_spin, args.interval_ms)
+    replayer = InputReplayer(args.recording)
+
+    app = QApplication(sys.argv[:1])
+    settings = SettingsManager()
+    backend = FakeAudioBackend([f"App{i}.exe" for i in range(args.sessions)],
+                               args.latency_ms / 1000)
+    settings.audio_backend = backend
+
+    window = DrawingWindow(settings)
+    window.volume_writer.backend = backend
+    window.input.key_injector = FakeKeyInjector()
+    window.show()
+
+    input_samples = []
+    frame_samples = []
+    window.input.process_events = timed(input_samples, window.input.process_events)
+    window.renderer.draw = timed(frame_samples, window.renderer.draw)
+
+    stop = threading.Event()
+    thread = threading.Thread(target=replayer.replay,
+                              args=(window.input_queue, args.speed, stop), daemon=True)
+
+    def finish_when_done():
+        if not thread.is_alive():
+            window.process_input()
+            app.quit()
+
+    poll = QTimer()
+    poll.timeout.connect(finish_when_done)
+    poll.start(20)
+
+    started = time.perf_counter()
+    thread.start()
+    app.exec()
+    elapsed = time.perf_counter() - started
+    stop.set()
+    window.volume_writer.flush(5)
+
+    focused = window.menu_manager.get_focus_item() if window.menu_visible else None
+    print(json.dumps({
+        "events": len(replayer.events),
+        "recording_s": round(replayer.duration(), 3),
+        "replay_s": round(elapsed, 3),
+        "events_per_s": round(len(replayer.events) / elapsed, 1),
+        "process_input": describe(input_samples),
+        "frames": describe(frame_samples),
+        "fps": round(len(frame_samples) / elapsed, 1),
+        "backend_calls": backend.calls,
+        "keys_sent": len(window.input.key_injector.sent),
+        "final_state": {
+            "menu_visible": window.menu_visible,
+            "focused": focused.name if focused else None,
+            "volumes": {session.Process.name(): round(session.volume, 4)
+                        for session in backend.sessions}
+        }
+    }, indent=4))
+
+
+if __name__ == "__main__":
+    main()
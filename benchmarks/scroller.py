@@ -0,0 +1,70 @@
+"""
+Benchmark of AdaptiveTouchScroller physics with recording sink (runs on any OS).
+Feeds knob turns at several rates and reports emitted wheel delta, sink calls,
+scroll thread ticks, and ticks while idle (should be zero).
+
+Usage (from repository root):
+    python benchmarks/scroller.py --turns 200
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position # Reason: Repository root is added to path first
+from modules.scroller import AdaptiveTouchScroller, RecordingSink
+
+
+def run(rate_hz, turns, idle_s):
+    """
+    Scrolls `turns` times at `rate_hz`, then waits `idle_s` seconds.
+    """
+    sink = RecordingSink()
+    scroller = AdaptiveTouchScroller(AdaptiveTouchScroller.DEFAULT_SETTINGS, sink)
+
+    started = time.perf_counter()
+    compute = 0.0
+    for _ in range(turns):
+        before = time.perf_counter()
+        scroller.scroll_pixels(10)
+        compute += time.perf_counter() - before
+        time.sleep(1 / rate_hz)
+    while scroller.ticks and sink.events and time.perf_counter() - sink.events[-1][0] < 0.2:
+        time.sleep(0.01)
+    active = time.perf_counter() - started
+
+    ticks_before_idle = scroller.ticks
+    time.sleep(idle_s)
+    idle_ticks = scroller.ticks - ticks_before_idle
+    scroller.stop()
+
+    return {
+        "rate_hz": rate_hz,
+        "turns": turns,
+        "wheel_delta": sink.total("vertical"),
+        "wheel_events": len(sink.events),
+        "sink_calls": sink.calls,
+        "ticks": ticks_before_idle,
+        "active_s": round(active, 3),
+        "scroll_call_us": round(compute / turns * 1e6, 2),
+        "idle_ticks_per_s": round(idle_ticks / idle_s, 2)
+    }
+
+
+def main():
+    """ Runs benchmark for several turn rates """
+    parser = argparse.ArgumentParser(description="AdaptiveTouchScroller benchmark")
+    parser.add_argument("--turns", type=int, default=100, help="turns per rate")
+    parser.add_argument("--idle", type=float, default=1.0, help="idle seconds to count wakeups")
+    parser.add_argument("--rates", type=float, nargs="+", default=[5, 20, 60],
+                        help="turn rates in turns per second")
+    args = parser.parse_args()
+
+    print(json.dumps([run(rate, args.turns, args.idle) for rate in args.rates], indent=4))
+
+
+if __name__ == "__main__":
+    main()
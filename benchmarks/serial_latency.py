@@ -0,0 +1,130 @@
+"""
+Serial reader benchmark using Linux pseudo-terminal pair as stand-in device.
+Measures event-to-callback latency and maximum sustained events per second
+of SerialReader with one or several devices, with line or framed protocol.
+
+Usage (from repository root, Linux/macOS only):
+    python benchmarks/serial_latency.py --events 500 --rate 200 --protocol framed --devices 4
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import tty
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position # Reason: Repository root is added to path first
+from modules.serial_port import SerialDevice, SerialReader
+from modules.serial_protocol import FramedProtocol
+
+CLOCKWISE = SerialDevice.RotaryEncoder.EncoderEvents.CLOCKWISE.value
+MESSAGES = {
+    "line": (CLOCKWISE + "position: 1\n").encode(),
+    "framed": FramedProtocol.encode(SerialDevice.FRAME_CODES[CLOCKWISE])
+}
+
+
+class CallbackLog:
+    """ Stores callback times and lets writer wait for them """
+    def __init__(self):
+        self.times = []
+        self.condition = threading.Condition()
+
+    def __call__(self, _device_time=None):
+        now = time.perf_counter_ns()
+        with self.condition:
+            self.times.append(now)
+            self.condition.notify_all()
+
+    def wait_for(self, count, timeout):
+        """ Waits until `count` callbacks happened """
+        with self.condition:
+            return self.condition.wait_for(lambda: len(self.times) >= count, timeout)
+
+
+def measure_latency(masters, log, events, rate, message):
+    """
+    Writes events one by one at `rate` per second, devices take turns.
+    Returns latencies in microseconds.
+    """
+    latencies = []
+    for i in range(events):
+        expected = len(log.times) + 1
+        sent = time.perf_counter_ns()
+        os.write(masters[i % len(masters)], message)
+        if not log.wait_for(expected, 2):
+            raise RuntimeError("Event was not delivered")
+        latencies.append((log.times[expected - 1] - sent) / 1000)
+        time.sleep(1 / rate)
+    return latencies
+
+
+def measure_throughput(masters, log, events, message):
+    """
+    Writes events to all devices as fast as possible.
+    Returns delivered events per second (all devices together).
+    """
+    already = len(log.times)
+    data = message * (events // len(masters))
+    started = time.perf_counter_ns()
+    written = [0] * len(masters)
+    while any(count < len(data) for count in written):
+        for i, master in enumerate(masters):
+            if written[i] < len(data):
+                written[i] += os.write(master, data[written[i]:written[i] + 4096])
+    events = len(masters) * (events // len(masters))
+    if not log.wait_for(already + events, 30):
+        raise RuntimeError("Not all events were delivered")
+    return events * 1e9 / (log.times[-1] - started)
+
+
+def main():
+    """ Runs benchmark and prints report as JSON """
+    parser = argparse.ArgumentParser(description="SerialDevice latency benchmark")
+    parser.add_argument("--events", type=int, default=300, help="paced events for latency")
+    parser.add_argument("--rate", type=float, default=200, help="paced events per second")
+    parser.add_argument("--burst", type=int, default=20000, help="events for throughput")
+    parser.add_argument("--protocol", choices=sorted(MESSAGES), default="line")
+    parser.add_argument("--baud", type=int, default=115200,
+                        help="baud rate to report wire-limited events per second for")
+    parser.add_argument("--devices", type=int, default=1, help="number of emulated devices")
+    args = parser.parse_args()
+    message = MESSAGES[args.protocol]
+
+    log = CallbackLog()
+    reader = SerialReader()
+    masters = []
+    for _ in range(args.devices):
+        master, slave = os.openpty()
+        tty.setraw(master)
+        masters.append(master)
+        device = SerialDevice(os.ttyname(slave), SerialDevice.baud_from_int(args.baud),
+                              args.protocol)
+        device.add_event(SerialDevice.RotaryEncoder.EncoderEvents.CLOCKWISE, log)
+        reader.add_device(device)
+
+    reader_threads = threading.active_count() - 1
+    latencies = sorted(measure_latency(masters, log, args.events, args.rate, message))
+    throughput = measure_throughput(masters, log, args.burst, message)
+    reader.stop()
+
+    print(json.dumps({
+        "latency_us": {
+            "median": round(statistics.median(latencies), 1),
+            "p95": round(latencies[int(len(latencies) * 0.95) - 1], 1),
+            "max": round(latencies[-1], 1)
+        },
+        "devices": args.devices,
+        "reader_threads": reader_threads,
+        "max_events_per_s": round(throughput),
+        "message_bytes": len(message),
+        "wire_events_per_s": round(args.baud / 10 / len(message))
+    }, indent=4))
+
+
+if __name__ == "__main__":
+    main()
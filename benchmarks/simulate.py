@@ -0,0 +1,61 @@
+"""
+Headless simulation benchmark: runs input through menu, input handling and rendering
+on virtual clock as fast as possible and reports events and frames per second.
+Runs on any platform, no window, keyboard hooks or Windows audio are needed.
+
+Usage (from repository root):
+    python benchmarks/simulate.py --turns 5000 --interval-ms 5
+    python benchmarks/simulate.py --recording input.rmxi
+"""
+import argparse
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# pylint: disable=wrong-import-position # Reason: Repository root is added to path first
+from core.input_recorder import InputReplayer, RecordedEvent
+from core.simulation import Simulation
+
+
+def synthetic_spin(turns, interval_ms):
+    """
+    Returns events: open menu, focus first application, activate volume, spin knob
+    back and forth, leave it to fade out.
+    """
+    kinds = ["press", "cw", "press"] + ["cw" if (i // 50) % 2 == 0 else "ccw" for i in range(turns)]
+    return [RecordedEvent(kind, "synthetic", int((i + 1) * interval_ms * 1_000_000), None)
+            for i, kind in enumerate(kinds)]
+
+
+def main():
+    """ Runs simulation and prints report as JSON """
+    parser = argparse.ArgumentParser(description="Headless Remixer simulation")
+    parser.add_argument("--recording", help="file written by main.py --record-input")
+    parser.add_argument("--turns", type=int, default=2000, help="turns of synthetic spin")
+    parser.add_argument("--interval-ms", type=float, default=5.0,
+                        help="turn interval of synthetic spin")
+    parser.add_argument("--sessions", type=int, default=8, help="number of fake audio sessions")
+    parser.add_argument("--tail", type=float, default=5.0,
+                        help="simulated seconds after last event (menu fades out)")
+    args = parser.parse_args()
+
+    if args.recording:
+        events = InputReplayer(args.recording).events
+    else:
+        events = synthetic_spin(args.turns, args.interval_ms)
+
+    simulation = Simulation(session_names=[f"App{i}.exe" for i in range(args.sessions)])
+    report = simulation.run(events, args.tail)
+    simulation.stop()
+    report["volumes"] = {session.Process.name(): round(session.volume, 4)
+                         for session in simulation.backend.sessions}
+    print(json.dumps(report, indent=4))
+
+
+if __name__ == "__main__":
+    main()
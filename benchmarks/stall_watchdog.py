@@ -0,0 +1,135 @@
+"""
+Stall watchdog check: draws menu with spinning pointer, calls slow audio backend from UI
+thread periodically and reports stalls found by watchdog. Phase without slow calls shows
+false alarms of normal drawing, phase with hidden menu shows heartbeats sent while idle.
+Fake audio backend is used, no Windows audio is needed.
+
+Usage (from repository root):
+    python benchmarks/stall_watchdog.py --seconds 2 --stall-ms 60 --every-ms 300
+    python benchmarks/stall_watchdog.py --budget-frames 1
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# pylint: disable=wrong-import-position # Reason: Repository root is added to path first
+from PySide6.QtCore import QMetaObject, Qt, QTimer
+from PySide6.QtWidgets import QApplication
+from core.audio_backend import FakeAudioBackend
+from core.drawing_window import DrawingWindow
+from core.key_injector import FakeKeyInjector
+from core.settings import SettingsManager
+from core.ui_watchdog import UIWatchdog
+
+
+def run_phase(app, seconds, stall=None):
+    """ Runs event loop for given time, optional stall timer is running meanwhile """
+    if stall is not None:
+        stall.start()
+    QTimer.singleShot(int(seconds * 1000), app.quit)
+    app.exec()
+    if stall is not None:
+        stall.stop()
+
+
+def spinning_menu(settings):
+    """ Shows menu and starts timer turning pointer, returns (window, timer) """
+    window = DrawingWindow(settings)
+    window.volume_writer.backend = settings.audio_backend
+    window.input.key_injector = FakeKeyInjector()
+    spin = QTimer()
+    spin.setInterval(16)
+    spin.timeout.connect(lambda: window.input_queue.push("cw", "benchmark"))
+    window.show()
+    window.show_menu()
+    window.timers.stop_inactivity()
+    spin.start()
+    return window, spin
+
+
+def count_idle_heartbeats(app, watchdog, seconds):
+    """ Returns heartbeats sent during given time once heartbeats of last activity are over """
+    # Heartbeats are counted from other thread, Qt timer would wake event loop itself.
+    # Event loop is quit after the last count, so both counts exist when it returns
+    counts = []
+    def count(last):
+        counts.append(watchdog.heartbeats)
+        if last:
+            QMetaObject.invokeMethod(app, "quit", Qt.ConnectionType.QueuedConnection)
+    idle_start = 2 * UIWatchdog.LINGER
+    timers = [threading.Timer(delay, count, (last,))
+              for delay, last in ((idle_start, False), (idle_start + seconds, True))]
+    for timer in timers:
+        timer.start()
+    app.exec()
+    for timer in timers:
+        timer.join()
+    return counts[1] - counts[0]
+
+
+def main():
+    """ Runs check and prints report as JSON """
+    parser = argparse.ArgumentParser(description="UI stall watchdog detection")
+    parser.add_argument("--seconds", type=float, default=2.0, help="length of each phase")
+    parser.add_argument("--stall-ms", type=float, default=60.0, help="slow audio call length")
+    parser.add_argument("--every-ms", type=int, default=300, help="slow audio call period")
+    parser.add_argument("--budget-frames", type=float, default=2, help="watchdog budget")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    settings = SettingsManager()
+    settings.audio_backend = FakeAudioBackend()
+    settings.stall_watchdog = {"BudgetFrames": args.budget_frames,
+                               "LogFile": os.path.join(tempfile.mkdtemp(), "stalls.log")}
+    watchdog = UIWatchdog.from_settings(settings)
+    watchdog.install()
+    window, spin = spinning_menu(settings)
+
+    # Menu building and icon warm-up stall first frames, they are not counted
+    run_phase(app, 0.5)
+    startup_stalls = watchdog.stalls
+    run_phase(app, args.seconds)
+    false_alarms = watchdog.stalls - startup_stalls
+
+    # Synchronous session enumeration in UI thread, as done on cache miss
+    def slow_call():
+        settings.audio_backend.call_latency = args.stall_ms / 1000
+        settings.audio_backend.get_sessions()
+        settings.audio_backend.call_latency = 0.0
+    stall = QTimer()
+    stall.setInterval(args.every_ms)
+    stall.timeout.connect(slow_call)
+    run_phase(app, args.seconds, stall)
+    detected = watchdog.stalls - startup_stalls - false_alarms
+
+    spin.stop()
+    window.hide_menu()
+    idle_heartbeats = count_idle_heartbeats(app, watchdog, args.seconds)
+
+    watchdog.stop()
+    window.volume_writer.stop()
+    with open(watchdog.log_path, encoding="utf-8") as file:
+        log = file.read()
+    print(json.dumps({
+        "refresh_rate": settings.refresh_rate,
+        "budget_ms": round(watchdog.budget * 1000, 2),
+        "startup_stalls": startup_stalls,
+        "false_alarms": false_alarms,
+        "injected_stalls": int(args.seconds * 1000 / args.every_ms),
+        "detected_stalls": detected,
+        "idle_heartbeats": idle_heartbeats,
+        "stacks_with_get_sessions": log.count("in get_sessions"),
+        "log": watchdog.log_path
+    }, indent=4))
+
+
+if __name__ == "__main__":
+    main()
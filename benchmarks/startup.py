@@ -0,0 +1,68 @@
+"""
+Startup benchmark of Remixer.
+Runs main.py with --startup-benchmark several times and reports import time,
+time to tray icon and time to first menu frame (milliseconds since start).
+
+Usage (from repository root):
+    python benchmarks/startup.py --runs 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MARKS = ("imports", "window", "tray_icon", "first_menu_frame")
+
+
+def run_once(timeout):
+    """
+    Starts Remixer once and returns its startup marks.
+    "process" mark is measured outside, including interpreter start.
+    """
+    started = time.perf_counter()
+    result = subprocess.run(
+                            [sys.executable, "main.py", "--startup-benchmark"],
+                            cwd=ROOT,
+                            capture_output=True,
+                            text=True,
+                            timeout=timeout,
+                            check=False
+    )
+    elapsed = (time.perf_counter() - started) * 1000
+    lines = [line for line in result.stdout.splitlines() if line.startswith("{")]
+    if result.returncode != 0 or not lines:
+        raise RuntimeError(f"Remixer exited with code {result.returncode}:\n{result.stderr}")
+    marks = json.loads(lines[-1])
+    marks["process"] = elapsed
+    return marks
+
+
+def main():
+    """ Runs benchmark and prints results """
+    parser = argparse.ArgumentParser(description="Remixer startup benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="number of application starts")
+    parser.add_argument("--timeout", type=float, default=30, help="seconds to wait for one start")
+    parser.add_argument("--json", action="store_true", help="print raw results as JSON")
+    args = parser.parse_args()
+
+    runs = [run_once(args.timeout) for _ in range(args.runs)]
+
+    if args.json:
+        print(json.dumps(runs, indent=4))
+        return
+
+    print(f"{'mark':<18}{'median':>10}{'min':>10}{'max':>10}  (ms, {args.runs} runs)")
+    for mark in MARKS + ("process",):
+        values = [run[mark] for run in runs if mark in run]
+        if not values:
+            continue
+        print(f"{mark:<18}{statistics.median(values):>10.1f}"
+              f"{min(values):>10.1f}{max(values):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+Audio backend performs calls to system audio sessions
+"""
+import math
+import threading
+import time
+
+# pylint: disable=import-outside-toplevel # Reason: pycaw and comtypes are imported on first use to keep startup fast
+
+
+class EndpointVolume: # pylint: disable=invalid-name # Reason: Mimics pycaw ISimpleAudioVolume methods
+    """
+    Default output device volume (IAudioEndpointVolume) with session volume interface
+    """
+    def __init__(self, endpoint):
+        self._endpoint = endpoint
+
+    def GetMasterVolume(self):
+        """ Returns device volume in range 0..1 """
+        return self._endpoint.GetMasterVolumeLevelScalar()
+
+    def SetMasterVolume(self, volume, context):
+        """ Sets device volume in range 0..1 """
+        self._endpoint.SetMasterVolumeLevelScalar(volume, context)
+
+    def GetMute(self):
+        """ Returns device mute state """
+        return self._endpoint.GetMute()
+
+    def SetMute(self, mute, context):
+        """ Mutes or unmutes device """
+        self._endpoint.SetMute(mute, context)
+
+
+class MasterSession: # pylint: disable=invalid-name,too-few-public-methods # Reason: Mimics pycaw AudioSession attributes
+    """
+    Default output device presented as audio session, so it can be used wherever sessions are
+    """
+    Process = None
+    ProcessId = 0
+    InstanceIdentifier = "master"
+
+    def __init__(self, endpoint):
+        self.SimpleAudioVolume = EndpointVolume(endpoint)
+
+
+class AudioBackend:
+    """
+    Windows audio sessions (pycaw).
+    Every call goes to Windows audio service, so calls are rather expensive.
+    """
+    def __init__(self):
+        self._master = None
+        self._thread_meters = threading.local()
+
+    def get_master(self):
+        """
+        Returns default output device as session (master volume)
+        """
+        if self._master is None:
+            from ctypes import POINTER, cast
+            from comtypes import CLSCTX_ALL
+            from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
+
+            # pylint: disable-next=protected-access # Reason: _iid_ is public interface id in comtypes
+            iid = IAudioEndpointVolume._iid_
+            interface = AudioUtilities.GetSpeakers().Activate(iid, CLSCTX_ALL, None)
+            self._master = MasterSession(cast(interface, POINTER(IAudioEndpointVolume)))
+        return self._master
+
+    def get_sessions(self):
+        """
+        Returns all audio sessions
+        """
+        from pycaw.pycaw import AudioUtilities
+
+        return AudioUtilities.GetAllSessions()
+
+    def init_thread(self):
+        """
+        Prepares calling thread to use audio sessions (COM initialization).
+        Must be called in every thread except UI thread before using backend.
+        """
+        import comtypes
+
+        comtypes.CoInitialize()
+
+    @staticmethod
+    def session_key(session):
+        """
+        Returns value that identifies session between menu reloads
+        """
+        return getattr(session, "InstanceIdentifier", None) or session.ProcessId
+
+    def get_volume(self, session):
+        """
+        Returns session volume in range 0..1
+        """
+        return session.SimpleAudioVolume.GetMasterVolume()
+
+    def get_peaks(self, sessions):
+        """
+        Returns current peak level (0..1) of every session, 0 for sessions without meter.
+        Meter interfaces are kept for every calling thread (COM interfaces belong to thread),
+        so repeated sampling costs one call per session. Meters of sessions that are not
+        sampled any more (closed, or not shown) are released.
+        """
+        from pycaw.pycaw import IAudioMeterInformation
+
+        meters = getattr(self._thread_meters, "meters", None)
+        if meters is None:
+            meters = self._thread_meters.meters = {}
+        peaks = []
+        for session in sessions:
+            key = self.session_key(session)
+            try:
+                meter = meters.get(key)
+                if meter is None:
+                    # pylint: disable-next=protected-access # Reason: pycaw keeps session control in _ctl
+                    meter = session._ctl.QueryInterface(IAudioMeterInformation)
+                    meters[key] = meter
+                peaks.append(meter.GetPeakValue())
+            except Exception: # pylint: disable=broad-exception-caught # Reason: Session may be closed or have no meter
+                meters.pop(key, None)
+                peaks.append(0.0)
+        if len(meters) > len(sessions):
+            sampled = {self.session_key(session) for session in sessions}
+            for key in [key for key in meters if key not in sampled]:
+                del meters[key]
+        return peaks
+
+    def set_volume(self, session, volume):
+        """
+        Sets session volume in range 0..1
+        """
+        session.SimpleAudioVolume.SetMasterVolume(volume, None)
+
+    def get_mute(self, session):
+        """
+        Returns True if session is muted
+        """
+        return bool(session.SimpleAudioVolume.GetMute())
+
+    def set_mute(self, session, mute):
+        """
+        Mutes or unmutes session
+        """
+        session.SimpleAudioVolume.SetMute(int(bool(mute)), None)
+
+
+class FakeProcess: # pylint: disable=too-few-public-methods # Aknowledged
+    """
+    Process of fake audio session (psutil.Process lookalike)
+    """
+    def __init__(self, name, pid):
+        self._name = name
+        self.pid = pid
+
+    def name(self):
+        """
+        Returns executable name
+        """
+        return self._name
+
+
+class FakeSession: # pylint: disable=invalid-name,too-few-public-methods # Reason: Mimics pycaw AudioSession attributes
+    """
+    Fake audio session with pycaw AudioSession attributes used by Remixer
+    """
+    def __init__(self, name, pid, volume=1.0):
+        self.Process = FakeProcess(name, pid)
+        self.ProcessId = pid
+        self.InstanceIdentifier = f"{name}|{pid}"
+        self.volume = volume
+        self.mute = False
+
+
+class FakeAudioBackend(AudioBackend):
+    """
+    Audio backend without system calls, used for benchmarks and replays.
+    Counts calls and can emulate audio service latency.
+    """
+    FIRST_PID = 4_000_000   # Above real PIDs, so no icons are extracted for fake sessions
+
+    def __init__(self, session_names=("Music.exe", "Browser.exe", "Game.exe"), call_latency=0.0):
+        """
+        Parameters:
+            session_names (iterable): Executable names of fake sessions.
+            call_latency (float): Seconds every volume call takes.
+        """
+        super().__init__()
+        self.sessions = [FakeSession(name, self.FIRST_PID + i)
+                         for i, name in enumerate(session_names)]
+        self.master = FakeSession("master", 0)
+        self.master.Process = None
+        self.call_latency = call_latency
+        self.clock = time.monotonic   # Time of synthetic peak levels
+        self.calls = {"get_sessions": 0, "get_volume": 0, "set_volume": 0,
+                      "get_mute": 0, "set_mute": 0, "get_peaks": 0}
+
+    def _call(self, name):
+        """ Counts call and waits for emulated latency """
+        self.calls[name] += 1
+        if self.call_latency:
+            time.sleep(self.call_latency)
+
+    def get_master(self):
+        return self.master
+
+    def get_sessions(self):
+        self._call("get_sessions")
+        return list(self.sessions)
+
+    def init_thread(self):
+        return
+
+    def get_volume(self, session):
+        self._call("get_volume")
+        return session.volume
+
+    def set_volume(self, session, volume):
+        self._call("set_volume")
+        session.volume = volume
+
+    def get_peaks(self, sessions):
+        """
+        Synthetic levels: every session pulses at own frequency, scaled by its volume
+        """
+        self._call("get_peaks")
+        now = self.clock()
+        return [0.0 if session.mute else
+                session.volume * abs(math.sin(now * (1 + session.ProcessId % 7) * 0.9))
+                for session in sessions]
+
+    def get_mute(self, session):
+        self._call("get_mute")
+        return session.mute
+
+    def set_mute(self, session, mute):
+        self._call("set_mute")
+        session.mute = bool(mute)
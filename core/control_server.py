@@ -0,0 +1,310 @@
+"""
+Local control server (settings "ControlServer"): scripts and stream-deck buttons change
+volume through local socket (named pipe on Windows) instead of faked media keys.
+
+Protocol: one JSON object per line in both directions. Request "id" is returned in response.
+    {"cmd": "list"}
+    {"cmd": "get", "app": "Music.exe"}
+    {"cmd": "set", "app": "Music.exe", "volume": 0.5}           (also "delta", "mute")
+    {"cmd": "batch", "changes": [{"app": "Game.exe", "volume": 0.2, "mute": false}, ...]}
+    {"cmd": "ramp", "app": "Music.exe", "volume": 0.0, "ms": 2000}
+    {"cmd": "crossfade", "from": "Music.exe", "to": "Game.exe", "ms": 1000, "volume": 0.8}
+    {"cmd": "subscribe"} / {"cmd": "unsubscribe"}
+"app" is executable name, alias or "master", optional "pid" selects one session.
+Responses are {"ok": true, ...} or {"ok": false, "error": "..."}, subscribers also get
+{"event": "volume", "app": ..., "pid": ..., "volume": ..., "mute": ...} lines.
+Client sending request line longer than MAX_LINE_BYTES gets error and is disconnected.
+Volume changes go through VolumeWriter like knob input: shadow volume changes at once,
+backend writes are coalesced in writer thread.
+"""
+import json
+
+from PySide6.QtCore import QObject, QTimer, Signal
+from PySide6.QtNetwork import QLocalServer, QLocalSocket
+
+from core.tracer import Tracer
+
+
+class CommandError(Exception):
+    """ Raised when control command can not be performed """
+
+
+class ControlServer(QObject): # pylint: disable=too-many-instance-attributes # Aknowledged
+    """
+    Listens on local socket and performs commands in UI thread
+    """
+    EVENT_INTERVAL_MS = 16   # Volume events are coalesced, subscriber gets latest value
+    PROBE_TIMEOUT_MS = 200   # Wait for running server to accept probe connection
+    MAX_LINE_BYTES = 65536   # Client sending longer request line is disconnected
+
+    volume_changed_signal = Signal(object, object, object)
+
+    def __init__(self, window, name):
+        """
+        Parameters:
+            window (DrawingWindow): Window with volume writer and input handler.
+            name (str): Server name (socket name, pipe name on Windows).
+        """
+        super().__init__(window)
+        self.window = window
+        self.name = name
+        self.commands = {
+            "list": self.command_list,
+            "get": self.command_get,
+            "set": self.command_set,
+            "batch": self.command_batch,
+            "ramp": self.command_ramp,
+            "crossfade": self.command_crossfade,
+            "subscribe": self.command_subscribe,
+            "unsubscribe": self.command_unsubscribe
+        }
+
+        self._buffers = {}
+        self._subscribers = set()
+        self._events = {}
+        self._event_timer = QTimer(self)
+        self._event_timer.setSingleShot(True)
+        self._event_timer.setInterval(self.EVENT_INTERVAL_MS)
+        self._event_timer.timeout.connect(self._send_events)
+        self._listener_added = False
+
+        # Writer listener may be called from writer thread, signal moves it to UI thread
+        self.volume_changed_signal.connect(self._on_volume_changed)
+
+        self.server = QLocalServer(self)
+        self.server.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+        self.server.newConnection.connect(self._on_connection)
+
+    def listen(self):
+        """
+        Starts listening and adds volume writer listener.
+        Socket of running Remixer is left alone, stale socket of crashed one is removed first.
+        Returns True on success.
+        """
+        if self.is_running(self.name):
+            print(f"Control server {self.name}: already running")
+            return False
+        QLocalServer.removeServer(self.name)
+        if not self.server.listen(self.name):
+            print(f"Control server {self.name}: {self.server.errorString()}")
+            return False
+        if not self._listener_added:
+            self._listener_added = True
+            self.window.volume_writer.add_listener(self.volume_changed_signal.emit)
+        return True
+
+    @classmethod
+    def is_running(cls, name):
+        """
+        Returns True if server with given name accepts connections
+        """
+        probe = QLocalSocket()
+        probe.connectToServer(name)
+        running = probe.waitForConnected(cls.PROBE_TIMEOUT_MS)
+        probe.abort()
+        return running
+
+    def close(self):
+        """
+        Stops listening and closes client connections
+        """
+        self.server.close()
+        for client in list(self._buffers):
+            client.disconnectFromServer()
+
+    def _on_connection(self):
+        """ Accepts pending clients """
+        while self.server.hasPendingConnections():
+            client = self.server.nextPendingConnection()
+            self._buffers[client] = b""
+            client.readyRead.connect(lambda client=client: self._on_ready_read(client))
+            client.disconnected.connect(lambda client=client: self._on_disconnected(client))
+            client.disconnected.connect(client.deleteLater)
+
+    def _on_disconnected(self, client):
+        """ Forgets client """
+        self._buffers.pop(client, None)
+        self._subscribers.discard(client)
+
+    def _on_ready_read(self, client):
+        """ Performs every complete request line, responses are sent in one write """
+        data = self._buffers.get(client, b"") + bytes(client.readAll())
+        *lines, rest = data.split(b"\n")
+        responses = [self.handle(line, client) for line in lines if line.strip()]
+        if len(rest) > self.MAX_LINE_BYTES:
+            responses.append({"ok": False, "error": "request line too long"})
+            rest = None
+        if responses:
+            client.write("".join(json.dumps(response) + "\n"
+                                 for response in responses).encode())
+        if rest is None:
+            self._buffers.pop(client, None)
+            client.disconnectFromServer()
+        else:
+            self._buffers[client] = rest
+
+    def handle(self, line, client=None):
+        """
+        Performs one request line and returns response.
+
+        Parameters:
+            line (bytes): JSON request.
+            client (QLocalSocket): Requesting client, used by subscribe.
+        """
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise CommandError("request must be JSON object")
+            request_id = request.get("id")
+            command = self.commands.get(request.get("cmd"))
+            if command is None:
+                raise CommandError(f"unknown command {request.get('cmd')!r}")
+            with Tracer.span("control " + request["cmd"], "control"):
+                response = command(request, client)
+            response["ok"] = True
+        except (CommandError, ValueError, TypeError) as e:
+            response = {"ok": False, "error": str(e)}
+        except Exception as e: # pylint: disable=broad-exception-caught # Reason: Audio backend (COM) errors are reported to client
+            response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        if request_id is not None:
+            response["id"] = request_id
+        return response
+
+    def _sessions(self, request):
+        """ Returns sessions selected by request "app" and "pid" """
+        app = request.get("app")
+        if not isinstance(app, str):
+            raise CommandError("\"app\" is required")
+        sessions = self.window.input.find_target_sessions(app)
+        if "pid" in request:
+            sessions = [session for session in sessions if session.ProcessId == request["pid"]]
+        if not sessions:
+            raise CommandError(f"{app} has no audio sessions")
+        return sessions
+
+    @staticmethod
+    def _volume(value):
+        """ Checks requested volume """
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise CommandError("volume must be number 0..1")
+        return float(value)
+
+    def _describe(self, session):
+        """ Returns session as JSON object """
+        writer = self.window.volume_writer
+        return {
+            "app": session.Process.name() if session.Process else "master",
+            "pid": session.ProcessId,
+            "volume": round(writer.get_volume(session), 4),
+            "mute": writer.get_mute(session)
+        }
+
+    def command_list(self, _request, _client):
+        """ Lists master and every application session """
+        backend = self.window.settings.audio_backend
+        aliases = self.window.settings.aliases
+        sessions = [self._describe(backend.get_master())]
+        with Tracer.span("get_sessions", "audio"):
+            all_sessions = backend.get_sessions()
+        for session in all_sessions:
+            if session.Process:
+                description = self._describe(session)
+                if description["app"] in aliases:
+                    description["alias"] = aliases[description["app"]]
+                sessions.append(description)
+        return {"sessions": sessions}
+
+    def command_get(self, request, _client):
+        """ Returns volume (loudest session) and mute (all sessions muted) of application """
+        sessions = [self._describe(session) for session in self._sessions(request)]
+        return {
+            "volume": max(session["volume"] for session in sessions),
+            "mute": all(session["mute"] for session in sessions)
+        }
+
+    def command_set(self, request, _client):
+        """ Sets absolute volume, shifts volume by "delta" and/or sets mute """
+        sessions = self._sessions(request)
+        writer = self.window.volume_writer
+        if "volume" in request:
+            writer.scale_volumes(sessions, self._volume(request["volume"]))
+        elif "delta" in request:
+            writer.scale_volumes(sessions, writer.get_group_volume(sessions)
+                                           + self._volume(request["delta"]))
+        if "mute" in request:
+            writer.apply((session, None, bool(request["mute"])) for session in sessions)
+        return {"volume": round(writer.get_group_volume(sessions), 4)}
+
+    def command_batch(self, request, _client):
+        """ Sets volume and mute of several applications in one writer pass """
+        changes = request.get("changes")
+        if not isinstance(changes, list):
+            raise CommandError("\"changes\" must be list")
+        batch = []
+        for change in changes:
+            if not isinstance(change, dict):
+                raise CommandError("change must be JSON object")
+            volume = self._volume(change["volume"]) if "volume" in change else None
+            mute = bool(change["mute"]) if "mute" in change else None
+            batch.extend((session, volume, mute) for session in self._sessions(change))
+        self.window.volume_writer.apply(batch)
+        return {"sessions": len(batch)}
+
+    def _duration(self, request):
+        """ Checks requested ramp length """
+        duration = request.get("ms", 0)
+        if isinstance(duration, bool) or not isinstance(duration, (int, float)) or duration < 0:
+            raise CommandError("\"ms\" must be positive number")
+        return duration
+
+    def command_ramp(self, request, _client):
+        """ Changes volume over "ms" milliseconds in ramp scheduler """
+        sessions = self._sessions(request)
+        self.window.ramps.ramp(sessions, self._volume(request.get("volume")),
+                               self._duration(request))
+        return {"sessions": len(sessions)}
+
+    def command_crossfade(self, request, _client):
+        """ Fades out "from" application and fades in "to" application """
+        out_sessions = self._sessions({"app": request.get("from")})
+        in_sessions = self._sessions({"app": request.get("to")})
+        self.window.ramps.crossfade(out_sessions, in_sessions, self._duration(request),
+                                    self._volume(request.get("volume", 1.0)))
+        return {}
+
+    def command_subscribe(self, _request, client):
+        """ Starts sending volume events to client """
+        if client is None:
+            raise CommandError("subscribe needs connection")
+        self._subscribers.add(client)
+        return {}
+
+    def command_unsubscribe(self, _request, client):
+        """ Stops sending volume events to client """
+        self._subscribers.discard(client)
+        return {}
+
+    def _on_volume_changed(self, session, volume, mute):
+        """ Remembers latest change of session until events are sent """
+        if not self._subscribers:
+            return
+        key = self.window.settings.audio_backend.session_key(session)
+        event = self._events.setdefault(key, {
+            "event": "volume",
+            "app": session.Process.name() if session.Process else "master",
+            "pid": session.ProcessId
+        })
+        if volume is not None:
+            event["volume"] = round(volume, 4)
+        if mute is not None:
+            event["mute"] = mute
+        if not self._event_timer.isActive():
+            self._event_timer.start()
+
+    def _send_events(self):
+        """ Sends coalesced volume events to subscribers """
+        events, self._events = self._events, {}
+        data = "".join(json.dumps(event) + "\n" for event in events.values()).encode()
+        for client in self._subscribers:
+            client.write(data)
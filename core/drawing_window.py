@@ -4,18 +4,26 @@ Drawing Window of PySide6 ... speaks for itself
 import sys
 
 from PySide6.QtWidgets import QMainWindow
-from PySide6.QtGui import QPainter
+from PySide6.QtGui import QImage, QPainter
 from PySide6.QtCore import Qt, QSize, Signal
 
 from core.renderer import Renderer
+from core.render_thread import RenderThread
 from core.menu import AppVolume
 from core.ui_timers import UITimers
 from core.menu_manager import MenuManager
 from core.tray_controller import TrayController
 from core.input_handler import InputHandler
+from core.input_queue import InputQueue
+from core.volume_writer import VolumeWriter
+from core.peak_meter import PeakMeterSampler
+from core.volume_profiles import VolumeProfiles, VolumeProfilesModule
+from core.volume_ramps import VolumeRamps
+from core.startup_profiler import StartupProfiler
+from core.tracer import Tracer
 
 
-class DrawingWindow(QMainWindow):
+class DrawingWindow(QMainWindow): # pylint: disable=too-many-instance-attributes # Aknowledged
     """
     Drawing Window of PySide6 ... speaks for itself
     """
@@ -24,6 +32,8 @@ class DrawingWindow(QMainWindow):
     start_fade_signal = Signal()
     stop_fade_signal = Signal()
     close_application_signal = Signal()
+    input_pending_signal = Signal()
+    frame_ready_signal = Signal()
 
     def __init__(self, settings):
         super().__init__()
@@ -39,16 +49,39 @@ class DrawingWindow(QMainWindow):
 
         screen = self._init_ui()
 
-        self.menu_manager = MenuManager(self.settings, callbacks=callbacks)
+        self.volume_writer = VolumeWriter(self.settings.audio_backend,
+                                          self.settings.volume_write_rate)
+        self.ramps = VolumeRamps.from_settings(self.settings, self.volume_writer)
+        self.profiles = VolumeProfiles(self.settings, self.volume_writer, self.ramps)
+        callbacks["profiles"] = self.profiles
+        callbacks["ramps"] = self.ramps
+
         self.tray = TrayController(self, callbacks)
-        self.renderer = Renderer(screen, self.settings)
+        StartupProfiler.mark("tray_icon")
+
+        self.menu_manager = MenuManager(self.settings, callbacks=callbacks)
+        self.menu_manager.modules.register("VolumeProfiles",
+                                           lambda: VolumeProfilesModule(self.profiles))
+        self.peak_meter = PeakMeterSampler.from_settings(self.settings)
+        self.renderer = Renderer(screen, self.settings, self.volume_writer, self.peak_meter)
+        self.render_thread = None
+        if self.settings.render_thread:
+            # Frame is finished in render thread, signal repaints window in UI thread
+            self.render_thread = RenderThread(self.renderer, screen, self.settings.refresh_rate,
+                                              self.frame_ready_signal.emit)
+            self.frame_ready_signal.connect(self.update)
         self.input = InputHandler(self)
+        # Input sources push events from their threads, signal wakes UI thread if it is idle
+        self.input_queue = InputQueue(self.input_pending_signal.emit)
+        self.input_pending_signal.connect(self._on_input_pending)
 
         self.menu_manager.add_observer(self.renderer)
 
         self._init_timers()
 
         self.menu_visible = False
+        self.fade_frame = None
+        self.control_server = None
 
     def _init_ui(self):
         """ Initialize UI. """
@@ -72,10 +105,19 @@ class DrawingWindow(QMainWindow):
         self.stop_fade_signal.connect(self.timers.stop_fade)
 
     def _fade_step(self):
-        """ Counts opacity for smooth menu disappearing. """
+        """
+        Counts opacity for smooth menu disappearing.
+        Last frame is captured once, then only this frame is drawn with decreasing opacity.
+        """
+        if self.fade_frame is None and self.menu_visible:
+            self._capture_fade_frame()
+        # Frame timer is stopped, input turned during fade is still performed
+        self.process_input()
+
         self.renderer.render_state.opacity_multiplier -= self.settings.theme.fade_out_speed
         if self.renderer.render_state.opacity_multiplier <= 0:
             self.timers.stop_fade()
+            self.fade_frame = None
             self.menu_visible = False
             self.renderer.set_active_option(None)
             self.renderer.render_state.opacity_multiplier = 1
@@ -86,30 +128,105 @@ class DrawingWindow(QMainWindow):
 
         self.update()
 
+    def _capture_fade_frame(self):
+        """
+        Keeps last frame for fade and freezes animations: frame timer, render thread
+        and peak meter are stopped
+        """
+        with Tracer.span("capture fade frame", "paint"):
+            self.timers.stop_drawing()
+            if self.render_thread is not None:
+                self.fade_frame = self.render_thread.capture()
+                self.render_thread.pause()
+            if self.fade_frame is None:
+                self.fade_frame = self.renderer.paint_frame(
+                                            QImage(self.renderer.screen_size,
+                                                   QImage.Format.Format_ARGB32_Premultiplied),
+                                            self.settings.get_showing_theme()
+                )
+            if self.peak_meter is not None:
+                self.peak_meter.pause()
+
+    def _paint_fade_frame(self, painter):
+        """ Draws captured frame with fade opacity """
+        painter.setOpacity(max(self.renderer.render_state.opacity_multiplier, 0))
+        painter.drawImage(0, 0, self.fade_frame)
+
     def _updatescreen(self):
-        """ Forces UI refresh """
+        """ Performs queued input and forces UI refresh """
         if self.menu_visible:
+            self.process_input()
+            self._request_frame()
+
+    def _request_frame(self):
+        """ Repaints window, or publishes menu state to render thread that repaints it """
+        if self.render_thread is None:
             self.update()
+        elif self.menu_visible:
+            self.render_thread.publish(self.settings.get_showing_theme())
+
+    def _on_input_pending(self):
+        """ Performs queued input right away if frames are not being drawn """
+        if not self.menu_visible:
+            with Tracer.span("wake", "input"):
+                self.process_input()
+
+    def process_input(self):
+        """ Drains input queue and performs its events """
+        events = self.input_queue.drain()
+        if events:
+            with Tracer.span("process input", "input", events=len(events)):
+                self.input.process_events(events)
 
     def paintEvent(self, _):
         """ Method handling drawing operation by PySide. """
         if not self.menu_visible:
             return
 
-        theme = self.settings.get_showing_theme()
+        with Tracer.span("paintEvent", "paint"):
+            theme = self.settings.get_showing_theme()
 
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+            with Tracer.span("begin", "paint"):
+                painter = QPainter(self)
+                painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
 
-        if self.menu_visible:
-            self.renderer.draw(painter, theme)
+            if self.fade_frame is not None:
+                self._paint_fade_frame(painter)
+            elif self.render_thread is None:
+                self.renderer.draw(painter, theme)
+            elif not self.render_thread.present(painter):
+                painter.end()
+                return
+
+            with Tracer.span("end", "paint"):
+                painter.end()
+        Tracer.instant("frame presented", "paint")
+        StartupProfiler.mark("first_menu_frame")
 
     def show_menu(self):
         """ Shows circular menu (application). """
-        self.menu_manager.reload_menu()
-        self.settings.icon_manager.load_icons(AppVolume.get_pid_dict())
-        self.menu_visible = True
-        self.menu_manager.return_top_level_menu()
+        if self.fade_frame is not None:
+            # Shown again while fading out: fade is cancelled
+            self.timers.stop_fade()
+            self.fade_frame = None
+            self.renderer.render_state.opacity_multiplier = 1
+        with Tracer.span("show_menu", "menu"):
+            with self.menu_manager.transaction():
+                self.menu_manager.reload_menu()
+                self.menu_manager.return_top_level_menu()
+            with Tracer.span("icons warm_up", "menu"):
+                self.settings.icon_manager.warm_up()
+            with Tracer.span("load_icons", "menu"):
+                self.settings.icon_manager.load_icons(AppVolume.get_pid_dict())
+            if self.peak_meter is not None:
+                self.peak_meter.watch(session for item in self.menu_manager.current_menu.items
+                                      if isinstance(item, AppVolume) and item.session.Process
+                                      for session in item.sessions)
+            self.menu_visible = True
+        self.timers.start_drawing()
+        if self.render_thread is not None:
+            self.render_thread.publish(self.settings.get_showing_theme())
+            self.render_thread.resume()
         self.start_inactivity_signal.emit()
 
     def hide_menu(self):
@@ -2,22 +2,32 @@
 Used for loading images and paint available icons to theme accent color
 """
 import os
-import psutil
-import win32gui
-import win32ui
-from PIL import Image
 from PySide6.QtGui import QPixmap
 from core.resource_loader import Loader
 
+# pylint: disable=import-outside-toplevel # Reason: psutil, PIL and win32 modules are imported on first use to keep startup fast
+
 class IconManager:
     """
-    Used for loading images and paint available icons to theme accent color
+    Used for loading images and paint available icons to theme accent color.
+    Icons are loaded on first use (see warm_up), not when manager is created.
     """
     icons = {}
     colored_icons = {}
     def __init__(self, settings, pids):
         self.settings = settings
-        self.load_icons(pids)
+        self.pids = pids
+        self.loaded = False
+
+    def warm_up(self):
+        """
+        Loads all icons if they were not loaded yet.
+        Called after application start and before menu is shown.
+        """
+        if self.loaded:
+            return
+        self.loaded = True
+        self.load_icons(self.pids)
         self.load_colored_icons()
         self.load_colored_theme_icons()
 
@@ -39,132 +49,89 @@ class IconManager:
             if name not in self.icons:
                 self.icons[name] = QPixmap(f"./icons/{file}")
 
-        if os.path.exists("./icons/internal"):
-            for file in os.listdir("./icons/internal"):
+        for directory in self.internal_icon_dirs():
+            for file in os.listdir(directory):
                 name = file.replace(".png", "")
                 if name not in self.icons:
-                    self.icons[name] = QPixmap(f"./icons/internal/{file}")
+                    self.icons[name] = QPixmap(os.path.join(directory, file))
 
-        for file in os.listdir(Loader.resource_path("./icons/internal")):
-            name = file.replace(".png", "")
-            if name not in self.icons:
-                self.icons[name] = QPixmap(Loader.resource_path(f"./icons/internal/{file}"))
+    @staticmethod
+    def internal_icon_dirs():
+        """
+        Returns directories with internal icons, user directory goes first.
+        """
+        directories = []
+        if os.path.exists("./icons/internal"):
+            directories.append(os.path.abspath("./icons/internal"))
+        resource_dir = Loader.resource_path("./icons/internal")
+        if os.path.exists(resource_dir) and resource_dir not in directories:
+            directories.append(resource_dir)
+        return directories
 
     def extract_with_replacement(self, proc, pid):
         """
         Checks if image replacement application available.
         If not loads standard icon.
         """
-        if proc in self.settings.image_replacements:
-            for procutil in psutil.process_iter():
-                if procutil.name() == self.settings.image_replacements[proc]:
-                    self.extract_icon(psutil.Process(procutil.pid).exe(), proc)
-        else:
-            self.extract_icon(psutil.Process(pid).exe(), proc)
+        import psutil
+
+        try:
+            if proc in self.settings.image_replacements:
+                for procutil in psutil.process_iter():
+                    if procutil.name() == self.settings.image_replacements[proc]:
+                        self.extract_icon(psutil.Process(procutil.pid).exe(), proc)
+            else:
+                self.extract_icon(psutil.Process(pid).exe(), proc)
+        except psutil.Error:
+            # Process exited or is not accessible, "Unknown" icon is shown
+            pass
+
+    @staticmethod
+    def tint(path, color):
+        """
+        Paints image with color keeping only its alpha channel.
+
+        Parameters:
+            path (str): Path to image.
+            color (Color): Color to paint with.
+        """
+        from PIL import Image
+
+        with Image.open(path) as image:
+            alpha = image.convert("RGBA").getchannel("A")
+        image_colored = Image.new("RGBA", alpha.size, (color.r, color.g, color.b, 0))
+        image_colored.putalpha(alpha)
+        pixmap = image_colored.toqpixmap()
+        image_colored.close()
+        return pixmap
 
     def load_colored_icons(self):
         """
         Loads available (usually, only internal) icons with specified in theme color.
         """
         theme = self.settings.get_showing_theme()
-        for file in os.listdir(Loader.resource_path("./icons/internal")):
-            name = file.replace(".png", "")
-            if name.endswith("_Colorable"):
-                image = Image.open(Loader.resource_path(f"./icons/internal/{file}"))
-                image_pixels = image.load()
-
-                image_colored = Image.new(image.mode, image.size)
-                colored_pixels = image_colored.load()
-
-                for i in range(image_colored.size[0]):
-                    for j in range(image_colored.size[1]):
-                        colored_pixels[i,j] = (
-                                                theme.preferred_icon_color.r,
-                                                theme.preferred_icon_color.g,
-                                                theme.preferred_icon_color.b,
-                                                image_pixels[i,j][3]
-                        )
-
-                self.colored_icons[name.replace("_Colorable", "")] = image_colored.toqpixmap()
-                image.close()
-                image_colored.close()
-
-        if os.path.exists("./icons/internal"):
-            for file in os.listdir("./icons/internal"):
+        # Resource directory goes last, so user icons are painted over it as before
+        for directory in reversed(self.internal_icon_dirs()):
+            for file in os.listdir(directory):
                 name = file.replace(".png", "")
                 if name.endswith("_Colorable"):
-                    image = Image.open(f"./icons/internal/{file}")
-                    image_pixels = image.load()
-
-                    image_colored = Image.new(image.mode, image.size)
-                    colored_pixels = image_colored.load()
-
-                    for i in range(image_colored.size[0]):
-                        for j in range(image_colored.size[1]):
-                            colored_pixels[i,j] = (
-                                                theme.preferred_icon_color.r,
-                                                theme.preferred_icon_color.g,
-                                                theme.preferred_icon_color.b,
-                                                image_pixels[i,j][3]
-                            )
-
-                    self.colored_icons[name.replace("_Colorable", "")] = image_colored.toqpixmap()
-                    image.close()
-                    image_colored.close()
+                    self.colored_icons[name.replace("_Colorable", "")] = self.tint(
+                                                        os.path.join(directory, file),
+                                                        theme.preferred_icon_color
+                    )
 
     def load_colored_theme_icons(self):
         """
         Loads and paint images for theme preview.
         """
-        themes = self.settings.themes
         icon_name = "Theme_Colorable.png"
-        if icon_name in os.listdir(Loader.resource_path("./icons/internal")):
-            image = Image.open(Loader.resource_path(f"./icons/internal/{icon_name}"))
-            image_pixels = image.load()
-
-            for theme in themes:
-                image_colored = Image.new(image.mode, image.size)
-                colored_pixels = image_colored.load()
-
-                for i in range(image_colored.size[0]):
-                    for j in range(image_colored.size[1]):
-                        colored_pixels[i,j] = (
-                                                theme.preferred_icon_color.r,
-                                                theme.preferred_icon_color.g,
-                                                theme.preferred_icon_color.b,
-                                                image_pixels[i,j][3]
-                        )
-
-                self.colored_icons[f"{theme.name}Theme"] = image_colored.toqpixmap()
-                image_colored.close()
-
-            image.close()
-
-        if os.path.exists("./icons/internal"):
-            if icon_name in os.listdir("./icons/internal"):
-                image = Image.open(f"./icons/internal/{icon_name}")
-                image_pixels = image.load()
-
-                image_colored = Image.new(image.mode, image.size)
-                colored_pixels = image_colored.load()
-
-                for theme in themes:
-                    image_colored = Image.new(image.mode, image.size)
-                    colored_pixels = image_colored.load()
-
-                    for i in range(image_colored.size[0]):
-                        for j in range(image_colored.size[1]):
-                            colored_pixels[i,j] = (
-                                                    theme.preferred_icon_color.r,
-                                                    theme.preferred_icon_color.g,
-                                                    theme.preferred_icon_color.b,
-                                                    image_pixels[i,j][3]
-                            )
-
-                    self.colored_icons[f"{theme.name}Theme"] = image_colored.toqpixmap()
-                    image_colored.close()
-
-                image.close()
+        for directory in reversed(self.internal_icon_dirs()):
+            if icon_name in os.listdir(directory):
+                for theme in self.settings.themes:
+                    self.colored_icons[f"{theme.name}Theme"] = self.tint(
+                                                        os.path.join(directory, icon_name),
+                                                        theme.preferred_icon_color
+                    )
 
     def extract_icon(self, path, name):
         """
@@ -173,6 +140,10 @@ class IconManager:
             path (str): Path to application directory.
             name (str): Windows Executable name.
         """
+        import win32gui
+        import win32ui
+        from PIL import Image
+
         path = path.replace("\\", "/")
 
         large, small = win32gui.ExtractIconEx(path, 0)
@@ -1,12 +1,19 @@
 """ Handles input commands from user """
+import threading
 import time
 
-import keyboard
 from core.menu import ThemeItem, AppVolume, Button, Menu
-from modules.scroller import AdaptiveTouchScroller as Scroller
+from core.volume_acceleration import VolumeAccelerator
+from core.key_injector import KeyInjector, VOLUME_UP, VOLUME_DOWN
+from core.tracer import Tracer
 
-class InputHandler():
+# pylint: disable=import-outside-toplevel # Reason: Scroller is imported on first use to keep startup fast
+
+class InputHandler(): # pylint: disable=too-many-instance-attributes # Aknowledged
     """ Handles input commands from user """
+    APP_RETRY_INTERVAL = 2.0    # Seconds between lookups of application that is not running
+    APP_REFRESH_INTERVAL = 5.0  # Seconds found sessions are used before they are looked up again
+
     def __init__(self, parent):
         self.window = parent
         self.renderer = self.window.renderer
@@ -14,20 +21,37 @@ class InputHandler():
 
         self.scroll_direction = None
 
-        self.last_volume_adjust_time = 0
-        self.volume_adjust_rate = 1
-
-        scroller_settings = {
-            "step_pixels": 300,
-            "tick_rate_hz": self.window.settings.refresh_rate,
-            "base_decay_rate": 0.5,
-            "speed_min": 1.0,
-            "speed_max": 50.0,
-            "fps_min": 7.5,
-            "fps_max": 50.0
-        }
+        self.accelerator = VolumeAccelerator.from_settings(
+                                                    self.window.settings.volume_acceleration
+        )
+        self.app_accelerators = {}
+        self.app_sessions = {}
+        # Found sessions are looked up again in background thread, simulation does it at once
+        self.clock = time.monotonic
+        self.background_refresh = True
+        self._sessions_stale = False
+        self._refreshing = False
+        self.window.volume_writer.add_failure_listener(self._on_session_failed)
+
+        self.key_injector = KeyInjector()
+
+        self._scroller = None
 
-        self.scroller = Scroller(scroller_settings)
+    @property
+    def scroller(self):
+        """
+        Scroller created on first scroll command
+        """
+        if self._scroller is None:
+            from modules.scroller import AdaptiveTouchScroller as Scroller
+
+            scroller_settings = dict(
+                                    Scroller.DEFAULT_SETTINGS,
+                                    tick_rate_hz=self.window.settings.refresh_rate
+            )
+
+            self._scroller = Scroller(scroller_settings)
+        return self._scroller
 
     def control_click(self):
         """
@@ -36,7 +60,8 @@ class InputHandler():
             changes "vertical" to "horizontal" and vice versa
         Typical action in default mode:
             shows menu if hidden,
-            performs Menu Items' actions if menu shown
+            performs Menu Items' actions if menu shown,
+            application with several sessions opens their submenu (same as double click)
         """
         if self.scroll_direction == "horizontal":
             self.scroll_direction = "vertical"
@@ -59,19 +84,23 @@ class InputHandler():
 
         if isinstance(focused, Button):
             focused.action()
+        elif isinstance(focused, AppVolume) and focused.is_group():
+            self.menu_manager.menu_enter(focused.expand(self.menu_manager.menu_back))
         elif isinstance(focused, AppVolume):
             self.renderer.set_active_option(focused)
             if self.renderer.active_option.session.Process:
-                sav = self.renderer.active_option.session.SimpleAudioVolume
-                self.renderer.current_volume = sav.GetMasterVolume()
+                self.renderer.current_volume = self.window.volume_writer.get_group_volume(
+                                                    self.renderer.active_option.sessions
+                )
             self.renderer.volume_animated = 1
         elif isinstance(focused, Menu):
-            self.menu_manager.menu_enter(focused)
-            current_theme = self.window.settings.get_showing_theme().name
-            self.menu_manager.set_focus_by_condition(
-                lambda item:
-                    isinstance(item, ThemeItem) and item.name == current_theme
-            )
+            with self.menu_manager.transaction():
+                self.menu_manager.menu_enter(focused)
+                current_theme = self.window.settings.get_showing_theme().name
+                self.menu_manager.set_focus_by_condition(
+                    lambda item:
+                        isinstance(item, ThemeItem) and item.name == current_theme
+                )
 
     def control_up(self):
         """
@@ -79,18 +108,7 @@ class InputHandler():
         Typical action in scroll mode: scrolls "clockwise"
         Typical action in default mode: controls user pointer, moving it clockwise
         """
-        if self.scroll_direction is not None:
-            self.scroll(self.scroll_direction, "clockwise")
-            return
-        if not self.window.menu_visible:
-            keyboard.send(-175)
-            return
-
-        self.window.start_inactivity_signal.emit()
-        if self.renderer.active_option is None:
-            self.menu_manager.rotate(1)
-        else:
-            self.adjust_volume(self.renderer.active_option, self.get_volume_delta(0.01))
+        self.control_rotate(1)
 
     def control_down(self):
         """
@@ -98,25 +116,198 @@ class InputHandler():
         Typical action in scroll mode: scrolls "anticlockwise"
         Typical action in default mode: controls user pointer, moving it counterclockwise
         """
+        self.control_rotate(-1)
+
+    def control_rotate(self, delta, timestamps=None, device_times=None):
+        """
+        Handles several turns at once.
+
+        Parameters:
+            delta (int): Number of turns, positive is clockwise.
+            timestamps (list): perf_counter_ns() timestamps of turns, used for volume acceleration.
+            device_times (list): Device timestamps of turns (nanoseconds or None).
+        """
+        if delta == 0:
+            return
+        direction = 1 if delta > 0 else -1
+
         if self.scroll_direction is not None:
-            self.scroll(self.scroll_direction, "anticlockwise")
+            self.scroll(self.scroll_direction, "clockwise" if delta > 0 else "anticlockwise",
+                        abs(delta))
             return
         if not self.window.menu_visible:
-            keyboard.send(-174)
+            for _ in range(abs(delta)):
+                self.key_injector.send(VOLUME_UP if delta > 0 else VOLUME_DOWN)
             return
 
         self.window.start_inactivity_signal.emit()
         if self.renderer.active_option is None:
-            self.menu_manager.rotate(-1)
+            self.menu_manager.rotate(delta)
+        else:
+            if not timestamps:
+                timestamps = [time.perf_counter_ns()] * abs(delta)
+            volume_delta = self.accelerator.volume_delta(
+                                                    direction,
+                                                    timestamps[-abs(delta):],
+                                                    (device_times or [])[-abs(delta):]
+            )
+            self.adjust_volume(self.renderer.active_option, volume_delta)
+
+    def control_app(self, app, delta, timestamps, device_times=None):
+        """
+        Handles turns of knob bound to application: changes volume of all its sessions.
+
+        Parameters:
+            app (str): Executable name or alias of application.
+            delta (int): Number of turns, positive is clockwise.
+            timestamps (list): perf_counter_ns() timestamps of turns.
+            device_times (list): Device timestamps of turns (nanoseconds or None).
+        """
+        if delta == 0:
+            return
+        accelerator = self.app_accelerators.get(app)
+        if accelerator is None:
+            accelerator = VolumeAccelerator.from_settings(self.window.settings.volume_acceleration)
+            self.app_accelerators[app] = accelerator
+
+        volume_delta = accelerator.volume_delta(
+                                                1 if delta > 0 else -1,
+                                                timestamps[-abs(delta):],
+                                                (device_times or [])[-abs(delta):]
+        )
+        writer = self.window.volume_writer
+        for session in self.find_app_sessions(app):
+            writer.set_volume(
+                            session,
+                            accelerator.snap(writer.get_volume(session) + volume_delta)
+            )
+
+    def control_slider(self, target, value):
+        """
+        Handles absolute slider: sets volume of its applications.
+        Slider values are already filtered, VolumeWriter limits rate of backend writes.
+
+        Parameters:
+            target (str or tuple): Executable name, alias, tuple of them or "master".
+            value (float): Volume in range 0..1.
+        """
+        writer = self.window.volume_writer
+        for app in target if isinstance(target, tuple) else (target,):
+            for session in self.find_target_sessions(app):
+                writer.set_volume(session, value)
+
+    def find_target_sessions(self, app):
+        """
+        Returns audio sessions of application by executable name or alias,
+        master volume session for "master".
+        """
+        if app == "master":
+            return [self.window.settings.audio_backend.get_master()]
+        return self.find_app_sessions(app)
+
+    def find_app_sessions(self, app):
+        """
+        Returns audio sessions of application by executable name or alias.
+        Sessions are asked from audio backend at once only when application was not found
+        before, missing application is looked for again not more often than APP_RETRY_INTERVAL.
+        Found sessions are looked up again in background after APP_REFRESH_INTERVAL
+        or when writing to one of them failed (application restarted or opened new session).
+        """
+        sessions, found_time = self.app_sessions.get(app, ([], None))
+        now = self.clock()
+        if sessions:
+            if self._sessions_stale or now - found_time >= self.APP_REFRESH_INTERVAL:
+                self._refresh_sessions()
+            return sessions
+        if found_time is not None and now - found_time < self.APP_RETRY_INTERVAL:
+            return sessions
+
+        with Tracer.span("get_sessions", "audio", app=app):
+            all_sessions = self.window.settings.audio_backend.get_sessions()
+        sessions = self._match_sessions(app, all_sessions)
+        self.app_sessions[app] = (sessions, now)
+        return sessions
+
+    def _match_sessions(self, app, all_sessions):
+        """ Returns sessions of application by executable name or alias """
+        aliases = self.window.settings.aliases
+        return [
+            session for session in all_sessions
+            if session.Process and app in (session.Process.name(),
+                                           aliases.get(session.Process.name()))
+        ]
+
+    def _on_session_failed(self, _session):
+        """ Audio backend call failed (writer thread), found sessions are looked up again """
+        self._sessions_stale = True
+
+    def _refresh_sessions(self):
+        """ Looks up sessions of every found application again, cached ones are used meanwhile """
+        if self._refreshing:
+            return
+        self._refreshing = True
+        self._sessions_stale = False
+        apps = [app for app, (sessions, _) in self.app_sessions.items() if sessions]
+        backend = self.window.settings.audio_backend
+
+        def work():
+            try:
+                backend.init_thread()
+                with Tracer.span("get_sessions", "audio", apps=len(apps)):
+                    all_sessions = backend.get_sessions()
+                found_time = self.clock()
+                for app in apps:
+                    # Application closed for good is looked up again as missing one
+                    self.app_sessions[app] = (self._match_sessions(app, all_sessions), found_time)
+            finally:
+                self._refreshing = False
+
+        if self.background_refresh:
+            threading.Thread(target=work, name="SessionRefresh", daemon=True).start()
         else:
-            self.adjust_volume(self.renderer.active_option, -self.get_volume_delta(0.01))
+            work()
+
+    def process_events(self, events):
+        """
+        Performs drained input events on UI thread.
+
+        Parameters:
+            events (list): Coalesced InputEvent objects from InputQueue.
+        """
+        handlers = {
+            "cw": self.control_up,
+            "ccw": self.control_down,
+            "press": self.control_click,
+            "double": self.control_double_click,
+            "hold": self.control_hold
+        }
+        for event in events:
+            with Tracer.span("dispatch " + event.kind, "input", source=event.source):
+                self._dispatch(event, handlers)
+
+    def _dispatch(self, event, handlers):
+        """ Performs one input event """
+        if event.kind == "rotate" and event.target is not None:
+            self.control_app(event.target, event.delta, event.timestamps, event.device_times)
+        elif event.kind == "rotate":
+            self.control_rotate(event.delta, event.timestamps, event.device_times)
+        elif event.kind == "slider":
+            self.control_slider(event.target, event.value)
+        elif event.kind in handlers:
+            handlers[event.kind]()
 
     def control_double_click(self):
         """
         Custom control double click handler.
-        Still unused.
+        Expands focused application with several sessions for per-session control.
         """
-        return
+        if not self.window.menu_visible or self.scroll_direction is not None:
+            return
+        focused = self.menu_manager.get_focus_item()
+        if isinstance(focused, AppVolume) and focused.is_group():
+            self.window.start_inactivity_signal.emit()
+            self.renderer.set_active_option(None)
+            self.menu_manager.menu_enter(focused.expand(self.menu_manager.menu_back))
 
     def control_hold(self):
         """
@@ -131,46 +322,46 @@ class InputHandler():
     def adjust_volume(self, option, delta):
         """
         Main function to change application volume.
+        Volume is written by VolumeWriter in background, arc follows requested volume.
 
         Parameters:
             option (AppVolume): AppVolume(MenuItem) element in menu.
             delta (float): 0 < delta < 1 parameter to shift volume.
         """
         if option.session.Process:
-            volume = option.session.SimpleAudioVolume
-            new_volume = max(0, min(1, volume.GetMasterVolume() + delta))
-            volume.SetMasterVolume(new_volume, None)
-            self.renderer.current_volume = new_volume
+            writer = self.window.volume_writer
+            self.renderer.current_volume = writer.scale_volumes(
+                                                    option.sessions,
+                                                    self.accelerator.snap(
+                                                        writer.get_group_volume(option.sessions)
+                                                        + delta
+                                                    )
+            )
 
-    def get_volume_delta(self, base_delta):
+    def get_volume_delta(self, base_delta, timestamp=None, device_time=None):
         """
-        Calculates progressive delta to shift volume in relation to user commands frequency.
+        Calculates progressive delta to shift volume in relation to knob velocity.
 
         Parameters:
             base_delta (float): Default delta (like if user pressed volume button one time only).
+            timestamp (int): Time of user command, perf_counter nanoseconds, now if not given.
+            device_time (int): Device time of user command in nanoseconds, if known.
         """
-        now = time.time()
-        dt = now - self.last_volume_adjust_time
-
-        if dt > 0.28:
-            self.volume_adjust_rate = 1
-        if dt < 0.12:
-            self.volume_adjust_rate = min(10, self.volume_adjust_rate + 0.5)
-        else:
-            self.volume_adjust_rate = max(1, self.volume_adjust_rate - 0.5)
-
-        self.last_volume_adjust_time = now
-        return base_delta * self.volume_adjust_rate
+        if timestamp is None:
+            timestamp = time.perf_counter_ns()
+        return base_delta * self.accelerator.add(timestamp, device_time)
 
-    def scroll(self, scroll_direction, _direction):
+    def scroll(self, scroll_direction, _direction, steps=1):
         """
         Handles scroll action (only with custom controls).
 
         Parameters:
             scroll_direction (str): "horizontal" or "vertical" scrolling.
             _direction (str): "clockwise" or "anticlockwise".
+            steps (int): Number of turns.
         """
+        pixels = 10 * steps if _direction == "clockwise" else -10 * steps
         if scroll_direction == "horizontal":
-            self.scroller.scroll_pixels_horizontal(10 if _direction == "clockwise" else -10)
+            self.scroller.scroll_pixels_horizontal(pixels)
         elif scroll_direction == "vertical":
-            self.scroller.scroll_pixels(10 if _direction == "clockwise" else -10)
+            self.scroller.scroll_pixels(pixels)
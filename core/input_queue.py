@@ -0,0 +1,143 @@
+"""
+Thread-safe queue of user input events.
+Keyboard hooks and serial devices push events from their own threads,
+UI thread drains queue once per frame.
+"""
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+from core.tracer import Tracer
+
+ROTATION_STEPS = {"cw": 1, "ccw": -1}
+
+
+@dataclass
+class InputEvent: # pylint: disable=too-many-instance-attributes # Aknowledged
+    """
+    Input event.
+
+    Attributes:
+        kind (str): "cw", "ccw", "press", "double", "hold", "slider"
+                    or "rotate" for coalesced turns.
+        timestamp (int): time.perf_counter_ns() when event was received.
+        source (str): Input source name ("keyboard", serial port name).
+        device_time (int): Device time in nanoseconds if input device provides it.
+        target (str): Application controlled directly by input source, None for menu control.
+                      Slider target may be tuple of applications or "master".
+        delta (int): Summary rotation of coalesced turns, positive is clockwise.
+        value (float): Absolute slider value in range 0..1.
+        timestamps (list): Timestamps of every coalesced turn.
+        device_times (list): Device times of every coalesced turn (None if unknown).
+    """
+    kind: str
+    timestamp: int
+    source: str = ""
+    device_time: int = None
+    target: str = None
+    delta: int = 0
+    value: float = None
+    timestamps: list = field(default_factory=list)
+    device_times: list = field(default_factory=list)
+
+
+class InputQueue:
+    """
+    Collects input events from any thread.
+    """
+    def __init__(self, wake=None):
+        """
+        Parameters:
+            wake (callable): Called (from pushing thread) when queue stops being empty.
+        """
+        self._events = deque()
+        self._lock = threading.Lock()
+        self.wake = wake
+        self.recorder = None
+
+    def push(self, kind, source="", timestamp=None, device_time=None, target=None, # pylint: disable=too-many-arguments,too-many-positional-arguments # Aknowledged
+             value=None):
+        """
+        Adds event to queue. Returns immediately, so it is safe to call from hooks.
+
+        Parameters:
+            kind (str): Event kind.
+            source (str): Input source name.
+            timestamp (int): Event time in perf_counter nanoseconds, now if not given.
+            device_time (int): Device time in nanoseconds if input device provides it.
+            target (str): Application controlled directly by input source.
+            value (float): Absolute slider value.
+        """
+        event = InputEvent(kind, timestamp or time.perf_counter_ns(), source, device_time, target,
+                           value=value)
+        if self.recorder is not None:
+            self.recorder.record(event)
+        Tracer.instant("input received", "input", event.timestamp, kind=kind, source=source)
+        with self._lock:
+            was_empty = not self._events
+            self._events.append(event)
+        if was_empty and self.wake is not None:
+            self.wake()
+
+    def callback(self, kind, source="", target=None):
+        """
+        Returns callback pushing event of given kind.
+        Callback optionally takes device time in nanoseconds.
+        """
+        return lambda device_time=None: self.push(kind, source, device_time=device_time,
+                                                  target=target)
+
+    def slider_callback(self, source, target):
+        """
+        Returns callback pushing slider event, callback takes slider value (0..1)
+        """
+        return lambda value: self.push("slider", source, target=target, value=value)
+
+    def drain(self):
+        """
+        Takes all queued events and returns them coalesced.
+        """
+        with self._lock:
+            if not self._events:
+                return []
+            events, self._events = self._events, deque()
+        return self.coalesce(events)
+
+    @staticmethod
+    def coalesce(events):
+        """
+        Collapses every run of turns ("cw"/"ccw") from same source into one "rotate" event.
+        Only latest value of every slider is kept. Other events keep their order.
+
+        Parameters:
+            events (iterable): InputEvent objects in arrival order.
+        """
+        result = []
+        sliders = {}
+        for event in events:
+            if event.kind == "slider":
+                key = (event.source, event.target)
+                if key in sliders:
+                    sliders[key].value = event.value
+                    sliders[key].timestamp = event.timestamp
+                else:
+                    sliders[key] = event
+                    result.append(event)
+                continue
+
+            step = ROTATION_STEPS.get(event.kind)
+            if step is None:
+                result.append(event)
+                continue
+
+            last = result[-1] if result else None
+            if last is None or last.kind != "rotate" or last.source != event.source:
+                last = InputEvent("rotate", event.timestamp, event.source, target=event.target)
+                result.append(last)
+
+            last.delta += step
+            last.timestamp = event.timestamp
+            last.timestamps.append(event.timestamp)
+            last.device_times.append(event.device_time)
+        return [event for event in result if event.kind != "rotate" or event.delta != 0]
@@ -0,0 +1,193 @@
+"""
+Input recorder writes every input event to compact binary file,
+input replayer feeds recorded file back into input queue.
+
+File format: b"RMXI" and version byte, then records.
+    Event record: kind code (1 byte), source index (1 byte),
+                  time since first event in ns (8 bytes), device time in ns or -1 (8 bytes),
+                  target index or NO_TARGET (2 bytes).
+                  Slider event record is followed by value (8-byte float).
+    Source record: SOURCE_RECORD (1 byte), name length (1 byte), UTF-8 name.
+    Target record: TARGET_RECORD (1 byte), length (2 bytes), target as UTF-8 JSON.
+Version 1 files (without sliders), version 2 files (targets of sliders only)
+and version 3 files (1-byte target length) are still read.
+"""
+import json
+import struct
+import threading
+import time
+
+MAGIC = b"RMXI"
+VERSION = 4
+SOURCE_RECORD = 0xFF
+TARGET_RECORD = 0xFE
+NO_TARGET = 0xFFFF
+KINDS = ("cw", "ccw", "press", "double", "hold", "slider")
+EVENT = struct.Struct("<BBqq")
+TARGET = struct.Struct("<H")
+TARGET_LENGTH = struct.Struct("<BH")   # Target record header
+VALUE = struct.Struct("<d")
+SLIDER_V2 = struct.Struct("<dB")   # Slider value and target index of version 2
+
+
+class InputRecorder:
+    """
+    Writes input events to file. Attach to InputQueue with InputQueue.recorder.
+    """
+    def __init__(self, path):
+        self._file = open(path, "wb") # pylint: disable=consider-using-with # Reason: File stays open until recorder is closed
+        self._file.write(MAGIC + bytes([VERSION]))
+        self._lock = threading.Lock()
+        self._sources = {}
+        self._targets = {}
+        self._start = None
+
+    def record(self, event):
+        """
+        Writes event. Safe to call from any thread.
+
+        Parameters:
+            event (InputEvent): Event pushed to input queue.
+        """
+        if event.kind not in KINDS:
+            return
+        with self._lock:
+            if self._file.closed:
+                return
+            if self._start is None:
+                self._start = event.timestamp
+            source = self._sources.get(event.source)
+            if source is None:
+                source = self._sources[event.source] = len(self._sources)
+                name = event.source.encode("utf-8")[:255]
+                self._file.write(bytes([SOURCE_RECORD, len(name)]) + name)
+            target = NO_TARGET if event.target is None else self._target_index(event.target)
+            self._file.write(EVENT.pack(
+                                        KINDS.index(event.kind),
+                                        source,
+                                        event.timestamp - self._start,
+                                        -1 if event.device_time is None else event.device_time
+            ) + TARGET.pack(target))
+            if event.kind == "slider":
+                self._file.write(VALUE.pack(event.value))
+
+    def _target_index(self, target):
+        """ Returns index of target, writes target record on first use, lock must be held """
+        name = json.dumps(list(target) if isinstance(target, tuple) else target).encode("utf-8")
+        index = self._targets.get(name)
+        if index is None:
+            index = self._targets[name] = len(self._targets)
+            self._file.write(TARGET_LENGTH.pack(TARGET_RECORD, len(name)) + name)
+        return index
+
+    def close(self):
+        """
+        Flushes and closes file
+        """
+        with self._lock:
+            self._file.close()
+
+
+class RecordedEvent: # pylint: disable=too-few-public-methods # Aknowledged
+    """
+    Event read from recorded file
+    """
+    __slots__ = ("kind", "source", "offset", "device_time", "target", "value")
+
+    def __init__(self, kind, source, offset, device_time, target=None, value=None): # pylint: disable=too-many-arguments,too-many-positional-arguments # Aknowledged
+        self.kind = kind
+        self.source = source
+        self.offset = offset
+        self.device_time = device_time
+        self.target = target
+        self.value = value
+
+
+class InputReplayer:
+    """
+    Feeds recorded events back into input queue
+    """
+    def __init__(self, path):
+        self.events = self.load(path)
+
+    @staticmethod
+    def load(path):
+        """
+        Reads recorded file and returns list of RecordedEvent
+        """
+        with open(path, "rb") as file:
+            data = file.read()
+        if data[:len(MAGIC)] != MAGIC or data[len(MAGIC)] not in (1, 2, 3, VERSION):
+            raise ValueError(f"{path} is not Remixer input recording")
+        version = data[len(MAGIC)]
+
+        events = []
+        sources = []
+        targets = []
+        position = len(MAGIC) + 1
+        while position < len(data):
+            if data[position] == TARGET_RECORD and version >= 4:
+                _, length = TARGET_LENGTH.unpack_from(data, position)
+                position += TARGET_LENGTH.size
+                target = json.loads(data[position:position + length].decode("utf-8"))
+                targets.append(tuple(target) if isinstance(target, list) else target)
+                position += length
+                continue
+            if data[position] in (SOURCE_RECORD, TARGET_RECORD):
+                length = data[position + 1]
+                text = data[position + 2:position + 2 + length].decode("utf-8")
+                if data[position] == SOURCE_RECORD:
+                    sources.append(text)
+                else:
+                    target = json.loads(text)
+                    targets.append(tuple(target) if isinstance(target, list) else target)
+                position += 2 + length
+                continue
+            kind, source, offset, device_time = EVENT.unpack_from(data, position)
+            position += EVENT.size
+            event = RecordedEvent(
+                                KINDS[kind],
+                                sources[source],
+                                offset,
+                                None if device_time < 0 else device_time
+            )
+            if version >= 3:
+                target, = TARGET.unpack_from(data, position)
+                position += TARGET.size
+                event.target = None if target == NO_TARGET else targets[target]
+                if event.kind == "slider":
+                    event.value, = VALUE.unpack_from(data, position)
+                    position += VALUE.size
+            elif event.kind == "slider":
+                event.value, target = SLIDER_V2.unpack_from(data, position)
+                event.target = targets[target]
+                position += SLIDER_V2.size
+            events.append(event)
+        return events
+
+    def duration(self):
+        """
+        Returns recording length in seconds
+        """
+        return self.events[-1].offset / 1e9 if self.events else 0.0
+
+    def replay(self, queue, speed=1.0, stop=None):
+        """
+        Pushes events to input queue. Event timestamps keep original spacing,
+        so acceleration behaves the same at any replay speed.
+
+        Parameters:
+            queue (InputQueue): Queue to push events to.
+            speed (float): Replay speed multiplier, 0 to push events without pauses.
+            stop (threading.Event): Stops replay when set.
+        """
+        start = time.perf_counter_ns()
+        for event in self.events:
+            if stop is not None and stop.is_set():
+                return
+            if speed > 0:
+                pause = event.offset / speed - (time.perf_counter_ns() - start)
+                if pause > 0:
+                    time.sleep(pause / 1e9)
+            queue.push(event.kind, event.source, start + event.offset, event.device_time,
+                       event.target, event.value)
@@ -0,0 +1,34 @@
+"""
+Key injector sends media keys to system when menu is hidden
+"""
+# pylint: disable=import-outside-toplevel # Reason: keyboard is imported on first use to keep startup fast
+
+VOLUME_UP = -175
+VOLUME_DOWN = -174
+
+
+class KeyInjector: # pylint: disable=too-few-public-methods # Aknowledged
+    """
+    Sends keys through keyboard module
+    """
+    def send(self, key):
+        """
+        Sends key press to system.
+
+        Parameters:
+            key (int): Virtual key code (negative for keyboard module scan codes).
+        """
+        import keyboard
+
+        keyboard.send(key)
+
+
+class FakeKeyInjector(KeyInjector): # pylint: disable=too-few-public-methods # Aknowledged
+    """
+    Remembers keys instead of sending them, used for benchmarks and replays
+    """
+    def __init__(self):
+        self.sent = []
+
+    def send(self, key):
+        self.sent.append(key)
@@ -94,17 +94,45 @@ class Button(MenuItem):
 class AppVolume(MenuItem):
     """
     MenuItem representing AppVolume object.
-    Contains information about session to control volume.
+    Contains information about sessions of one application to control their volume together.
     """
     pids = defaultdict(list)
 
-    def __init__(self, name_, icon_ = None, session_ = None):
+    def __init__(self, name_, icon_ = None, session_ = None, sessions_ = None):
+        """
+        Parameters:
+            name_ (str): Shown name (alias).
+            icon_ (str): Icon name, executable name of application.
+            session_ (AudioSession): Main session, first of sessions if not given.
+            sessions_ (list): All sessions of application, only main session if not given.
+        """
         super().__init__(name_, icon_)
-        self.session = session_
-        if session_ is not None and session_.Process:
-            self.filename = session_.Process.name()
-            self.pid = session_.Process.pid
-            self.pids[icon_] = session_.Process.pid
+        self.sessions = list(sessions_) if sessions_ else [session_]
+        self.session = session_ if session_ is not None else self.sessions[0]
+        if self.session is not None and self.session.Process:
+            self.filename = self.session.Process.name()
+            self.pid = self.session.Process.pid
+            self.pids[icon_] = self.session.Process.pid
+
+    def is_group(self):
+        """
+        Returns True if item controls several sessions
+        """
+        return len(self.sessions) > 1
+
+    def expand(self, back_action):
+        """
+        Returns submenu with item of whole group, one item per session and Back button,
+        for per-session control.
+
+        Parameters:
+            back_action (callable): Back button action.
+        """
+        items = [AppVolume(f"{self.name} all", self.icon, self.session, self.sessions)]
+        items.extend(AppVolume(f"{self.name} {i + 1}", self.icon, session)
+                     for i, session in enumerate(self.sessions))
+        items.append(Button("Back", "Back", back_action))
+        return Menu(self.name, self.icon, items)
 
     @classmethod
     def get_pid_dict(cls):
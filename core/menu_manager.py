@@ -2,8 +2,10 @@
 Menu manager contains menu structure description and performs user commands.
 Also implements information observer
 """
-from pycaw.pycaw import AudioUtilities
+from contextlib import contextmanager
 from core.menu import Menu, Placeholder, Button, AppVolume, ThemeItem
+from core.menu_plugins import MenuModuleLoader
+from core.tracer import Tracer
 
 class MenuObserver:
     """
@@ -19,11 +21,27 @@ class MenuObserver:
         Runs when active menu changes
         """
 
-class MenuManager:
+    def on_state_changed(self, menu, index, last_turn, menu_changed):
+        """
+        Runs once after menu transaction with final menu state.
+        Default implementation calls on_menu_changed (if menu changed), then on_focus_changed.
+
+        Parameters:
+            menu (list): Items of active menu.
+            index (int): Focused item index.
+            last_turn (str): "left", "right" or None.
+            menu_changed (bool): Active menu changed during transaction.
+        """
+        if menu_changed:
+            self.on_menu_changed(menu)
+        self.on_focus_changed(index, last_turn)
+
+class MenuManager: # pylint: disable=too-many-instance-attributes # Aknowledged
     """
     Menu manager contains menu structure description and performs user commands.
+    State changes are made in transactions, observers get one notification
+    with final state when outermost transaction ends.
     """
-    dynamic_modules = []
     def __init__(self, settings, callbacks: dict):
         self.current_menu = {}
         self.menu_stack = []
@@ -32,8 +50,11 @@ class MenuManager:
         self.focused_index = 0
         self.callbacks = callbacks
         self.last_turn = None
-
-        self.reload_menu()
+        self.modules = MenuModuleLoader(settings, settings.menu_module_budget,
+                                        settings.plugins_dir)
+        self._transaction_depth = 0
+        self._focus_changed = False
+        self._menu_changed = False
 
     def add_observer(self, observer: MenuObserver):
         """
@@ -41,19 +62,45 @@ class MenuManager:
         """
         self.observers.append(observer)
 
-    def notify_focus(self):
+    @contextmanager
+    def transaction(self):
         """
-        Notifies observers with changed focus index.
+        Groups menu state changes: observers are notified once, after outermost transaction.
         """
+        self._transaction_depth += 1
+        try:
+            yield self
+        finally:
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                self._commit()
+
+    def _commit(self):
+        """
+        Delivers one change notification with final state
+        """
+        if not (self._focus_changed or self._menu_changed):
+            return
+        menu_changed = self._menu_changed
+        self._focus_changed = False
+        self._menu_changed = False
         for obs in self.observers:
-            obs.on_focus_changed(self.focused_index, self.last_turn)
+            obs.on_state_changed(self.current_menu.items, self.focused_index,
+                                 self.last_turn, menu_changed)
+
+    def notify_focus(self):
+        """
+        Notifies observers with changed focus index (when transaction ends).
+        """
+        with self.transaction():
+            self._focus_changed = True
 
     def notify_menu(self):
         """
-        Notifies observers about active menu change.
+        Notifies observers about active menu change (when transaction ends).
         """
-        for obs in self.observers:
-            obs.on_menu_changed(self.current_menu.items)
+        with self.transaction():
+            self._menu_changed = True
 
     def get_focus_item(self):
         """
@@ -69,13 +116,15 @@ class MenuManager:
         """
         for idx, item in enumerate(self.current_menu.items):
             if predicate(item):
-                self.focused_index = idx
-                self.notify_focus()
+                with self.transaction():
+                    self.focused_index = idx
+                    self.notify_focus()
                 break
 
     def build_menu(self):
         """
         Loads menu with available applications producing sound.
+        Menu is built on first show, not when manager is created.
         """
 
         menu = Menu("Main", None, None)
@@ -115,9 +164,9 @@ class MenuManager:
         )
         menu.add_item(Button("Hide", "Close", self.callbacks["hide_menu"]))
 
-        for module in self.dynamic_modules:
-            if module.is_enabled(self.settings):
-                menu.index("Menu").add_item(module.get_menu_item(self))
+        with Tracer.span("menu modules", "menu"):
+            for item in self.modules.menu_items(self):
+                menu.index("Menu").add_item(item)
 
         for theme in self.settings.themes:
             menu.index("Menu").index("Themes").add_item(
@@ -128,47 +177,76 @@ class MenuManager:
                                                     )
             )
 
-        sessions = AudioUtilities.GetAllSessions()
+        with Tracer.span("get_sessions", "audio"):
+            sessions = self.settings.audio_backend.get_sessions()
 
+        # Sessions of one application (same executable or alias) share one menu item
+        groups = {}
         for session in sessions:
             if session.Process:
                 name = session.Process.name()
                 if name in self.settings.ignored_apps:
                     continue
                 alias = self.settings.aliases.get(name, name.replace(".exe", ""))
-                menu.add_item(
-                            AppVolume(
-                                    alias,
-                                    name,
-                                    session
-                            )
-                )
+                groups.setdefault(alias, (name, []))[1].append(session)
+
+        for alias, (name, group) in groups.items():
+            menu.add_item(
+                        AppVolume(
+                                alias,
+                                name,
+                                sessions_=group
+                        )
+            )
         return menu
 
     def reload_menu(self):
         """
         Fully reloads and activates menu
         """
-        self.current_menu = self.build_menu()
-        self.menu_stack = []
-        self.focused_index = 0
-        self.last_turn = None
+        with Tracer.span("reload_menu", "menu"), self.transaction():
+            self.current_menu = self.build_menu()
+            self.menu_stack = []
+            self.focused_index = 0
+            self.last_turn = None
+
+            self.notify_menu()
+            self.notify_focus()
+
+    def rebuild_menu(self):
+        """
+        Builds menu again and returns to the same submenu (found by names) and focus
+        """
+        levels = [menu for menu, _ in self.menu_stack] + [self.current_menu]
+        focus = [index for _, index in self.menu_stack] + [self.focused_index]
+        with Tracer.span("rebuild_menu", "menu"), self.transaction():
+            self.current_menu = self.build_menu()
+            self.menu_stack = []
+            for level in levels[1:]:
+                submenu = next((item for item in self.current_menu.items
+                                if isinstance(item, Menu) and item.name == level.name), None)
+                if submenu is None:
+                    break
+                self.menu_stack.append((self.current_menu, focus[len(self.menu_stack)]))
+                self.current_menu = submenu
+            self.focused_index = min(focus[len(self.menu_stack)],
+                                     max(len(self.current_menu.items) - 1, 0))
 
-        self.notify_menu()
-        self.notify_focus()
+            self.notify_menu()
+            self.notify_focus()
 
     def return_top_level_menu(self):
         """
         Switches to the top level of active menu
         """
         self.last_turn = None
-        if len(self.menu_stack) > 0:
-            self.menu_stack.reverse()
-            self.current_menu, self.focused_index = self.menu_stack.pop()
-            self.menu_stack.clear()
+        if self.menu_stack:
+            with self.transaction():
+                self.current_menu, self.focused_index = self.menu_stack[0]
+                self.menu_stack.clear()
 
-            self.notify_focus()
-            self.notify_menu()
+                self.notify_menu()
+                self.notify_focus()
 
     def menu_back(self):
         """
@@ -177,9 +255,10 @@ class MenuManager:
         self.last_turn = None
         if not self.menu_stack:
             return
-        self.current_menu, self.focused_index = self.menu_stack.pop()
-        self.notify_focus()
-        self.notify_menu()
+        with self.transaction():
+            self.current_menu, self.focused_index = self.menu_stack.pop()
+            self.notify_menu()
+            self.notify_focus()
 
     def rotate(self, delta):
         """
@@ -193,21 +272,23 @@ class MenuManager:
         else:
             self.last_turn = None
 
-        self.focused_index = (self.focused_index - delta) % len(self.current_menu.items)
-        focused = self.get_focus_item()
-        if hasattr(focused, 'on_focus'):
-            focused.on_focus()
+        with Tracer.span("rotate", "menu", delta=delta), self.transaction():
+            self.focused_index = (self.focused_index - delta) % len(self.current_menu.items)
+            focused = self.get_focus_item()
+            if hasattr(focused, 'on_focus'):
+                focused.on_focus()
 
-        self.notify_focus()
+            self.notify_focus()
 
     def menu_enter(self, menu):
         """
         Activates menu under focused by cursor position
         """
         self.last_turn = None
-        self.menu_stack.append((self.current_menu, self.focused_index))
-        self.current_menu = menu
-        self.focused_index = 0
+        with self.transaction():
+            self.menu_stack.append((self.current_menu, self.focused_index))
+            self.current_menu = menu
+            self.focused_index = 0
 
-        self.notify_focus()
-        self.notify_menu()
+            self.notify_menu()
+            self.notify_focus()
@@ -0,0 +1,296 @@
+"""
+Menu module loader: finds menu modules in settings ("MenuModules") and plugins directory,
+imports them when their menu item is first opened and calls them with time budget,
+so one slow module can not delay menu opening.
+"""
+import importlib
+import importlib.util
+import inspect
+import json
+import os
+import threading
+import time
+from collections import deque
+
+from core.menu import Button, Menu, MenuModule, Placeholder
+from core.tracer import Tracer
+
+
+class LazyModuleItem(Button):
+    """
+    Menu item of module that is not imported yet. Opening it imports module.
+    """
+    def __init__(self, name_, loader, menu_manager):
+        super().__init__(name_, name_, lambda: loader.open(name_, menu_manager))
+
+
+class _Call: # pylint: disable=too-few-public-methods # Reason: Result container
+    """ Module call running in module worker thread """
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _ModuleWorker: # pylint: disable=too-few-public-methods # Reason: Thread wrapper
+    """ Thread performing calls of one module in order, sleeps while there are none """
+    def __init__(self, name, run):
+        """
+        Parameters:
+            name (str): Module entry name, used in thread name.
+            run (callable): Called in worker thread with arguments of every submitted call.
+        """
+        self.name = name
+        self._run = run
+        self._condition = threading.Condition()
+        self._calls = deque()
+        self._thread = None
+
+    def submit(self, *args):
+        """ Queues call, worker thread is started on first call """
+        with self._condition:
+            self._calls.append(args)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name=f"MenuModule {self.name}",
+                                                daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def _loop(self):
+        """ Worker thread loop """
+        while True:
+            with self._condition:
+                while not self._calls:
+                    self._condition.wait()
+                args = self._calls.popleft()
+            self._run(*args)
+
+
+class MenuModuleLoader: # pylint: disable=too-many-instance-attributes # Aknowledged
+    """
+    Keeps menu module entries and loaded modules.
+
+    Module entry in settings "MenuModules" is one of:
+        "VolumeProfiles"             - built-in module registered with register()
+        "package.module:ClassName"   - module class imported from package
+        "my_plugin.py"               - file in plugins directory
+    Every *.py file in plugins directory is an entry too. Plugin file defines one
+    MenuModule subclass.
+
+    Every module call (import, is_enabled, get_menu_item) runs in worker thread of module.
+    Call that exceeds budget returns last result of this call (or default),
+    its result is used when menu is built next time. Module call that is still running
+    is not started again, call that exceeded budget last time is not waited for.
+    Overruns and failures are counted in stats and recorded by Tracer.
+    """
+    def __init__(self, settings, budget_ms=20, plugins_dir=None):
+        """
+        Parameters:
+            settings (SettingsManager): Settings with "MenuModules".
+            budget_ms (float): Time to wait for one module call.
+            plugins_dir (str): Directory with plugin files.
+        """
+        self.settings = settings
+        self.budget = budget_ms / 1000
+        self.plugins_dir = plugins_dir
+        self.stats = {}
+
+        self._factories = {}
+        self._modules = {}
+        self._workers = {}
+        self._opened = {}    # name: module item built by open(), used by next menu build
+        self._cache = {}
+        self._pending = {}
+        self._slow = set()
+        self._lock = threading.Lock()   # Guards pending and slow calls and stats
+
+    def register(self, name, factory):
+        """
+        Registers built-in module.
+
+        Parameters:
+            name (str): Entry name used in settings "MenuModules".
+            factory (callable): Returns MenuModule, called when module is first opened.
+        """
+        self._factories[name] = factory
+
+    def entries(self):
+        """
+        Returns module entry names: settings entries, then plugin files not listed in settings
+        """
+        names = [self._entry_name(entry) for entry in self.settings.menu_modules]
+        if self.plugins_dir and os.path.isdir(self.plugins_dir):
+            for filename in sorted(os.listdir(self.plugins_dir)):
+                if filename.endswith(".py") and not filename.startswith("_"):
+                    name = filename[:-3]
+                    if name not in names:
+                        names.append(name)
+        return names
+
+    @staticmethod
+    def _entry_name(entry):
+        """ Returns shown name of settings entry """
+        if ":" in entry:
+            return entry.rsplit(":", 1)[1]
+        if entry.endswith(".py"):
+            return os.path.basename(entry)[:-3]
+        return entry
+
+    def menu_items(self, menu_manager):
+        """
+        Returns menu items of all modules. Module that is not imported yet gets LazyModuleItem,
+        module without result in budget gets its previous item or "Loading" placeholder.
+        """
+        items = []
+        for name in self.entries():
+            module = self._modules.get(name)
+            if module is None:
+                items.append(LazyModuleItem(name, self, menu_manager))
+                continue
+            if name in self._opened:
+                item = self._opened.pop(name)
+            else:
+                item = self._module_item(name, module, menu_manager)
+            if item is not None:
+                items.append(item)
+        return items
+
+    def _module_item(self, name, module, menu_manager, placeholder=True):
+        """
+        Returns menu item of loaded module, None if module is disabled.
+        Item that is not ready is "Loading" placeholder, or None without placeholder.
+        """
+        if not self.call(name, "is_enabled", module.is_enabled, self.settings, default=False):
+            return None
+        item = self.call(name, "get_menu_item", module.get_menu_item, menu_manager)
+        if item is None and placeholder:
+            return Placeholder(name, name, f"{name}\nLoading...")
+        return item
+
+    def open(self, name, menu_manager):
+        """
+        Imports module of LazyModuleItem, rebuilds menu with module item and opens it.
+        Module that is not ready in budget is opened with next click.
+        """
+        if name not in self._modules:
+            module = self.call(name, "import", self._load, name)
+            if module is None:
+                return
+            self._modules[name] = module
+
+        module = self._modules[name]
+        item = self._module_item(name, module, menu_manager, placeholder=False)
+        with self._lock:
+            pending = (name, "is_enabled") in self._pending \
+                      or (name, "get_menu_item") in self._pending
+        if item is None and pending:
+            return
+        # Rebuilt menu gets this item (or no item for disabled module) instead of lazy one
+        self._opened[name] = item
+        with menu_manager.transaction():
+            menu_manager.rebuild_menu()
+            if isinstance(item, Menu):
+                menu_manager.menu_enter(item)
+            elif isinstance(item, Button):
+                item.action()
+
+    def _load(self, name):
+        """ Imports module of entry and returns its instance """
+        if name in self._factories:
+            return self._factories[name]()
+
+        entry = next((entry for entry in self.settings.menu_modules
+                      if self._entry_name(entry) == name), f"{name}.py")
+        if ":" in entry:
+            module_path, class_name = entry.rsplit(":", 1)
+            return getattr(importlib.import_module(module_path), class_name)()
+
+        path = os.path.join(self.plugins_dir or "", entry)
+        spec = importlib.util.spec_from_file_location(f"remixer_plugin_{name}", path)
+        plugin = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(plugin)
+        for _, cls in inspect.getmembers(plugin, inspect.isclass):
+            if issubclass(cls, MenuModule) and cls is not MenuModule \
+                    and cls.__module__ == plugin.__name__:
+                return cls()
+        raise ImportError(f"{path} has no MenuModule class")
+
+    def call(self, name, call, function, *args, default=None):
+        """
+        Runs module call in background thread and waits for it at most budget.
+
+        Parameters:
+            name (str): Module entry name.
+            call (str): Call name for cache, statistics and trace.
+            function (callable): Module function.
+            *args: Function arguments.
+            default: Returned when call fails, or exceeds budget without previous result.
+        """
+        key = (name, call)
+        budget = 0
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = self._pending[key] = _Call()
+                # Call that exceeded budget last time gets cached result at once
+                budget = 0 if key in self._slow else self.budget
+                start = True
+            else:
+                start = False
+        if start:
+            worker = self._workers.get(name)
+            if worker is None:
+                worker = self._workers[name] = _ModuleWorker(name, self._run)
+            worker.submit(pending, name, call, function, args)
+
+        # Call still running since previous menu build is not waited for again
+        if not pending.done.wait(budget):
+            with self._lock:
+                self._stats(name)["overruns"] += 1
+            Tracer.instant("menu module overrun", "menu", module=name, call=call,
+                           budget_ms=self.budget * 1000)
+            return self._cache.get(key, default)
+
+        with self._lock:
+            del self._pending[key]
+        if pending.error is not None:
+            with self._lock:
+                self._stats(name)["errors"] += 1
+            Tracer.instant("menu module error", "menu", module=name, call=call,
+                           error=repr(pending.error))
+            return self._cache.get(key, default)
+        self._cache[key] = pending.result
+        return pending.result
+
+    def _run(self, pending, name, call, function, args):
+        """ Module call thread """
+        start = time.perf_counter()
+        try:
+            with Tracer.span(f"{name} {call}", "menu"):
+                pending.result = function(*args)
+        except Exception as e: # pylint: disable=broad-exception-caught # Reason: Third-party module must not break menu
+            pending.error = e
+        elapsed = (time.perf_counter() - start) * 1000
+        with self._lock:
+            if elapsed > self.budget * 1000:
+                self._slow.add((name, call))
+            else:
+                self._slow.discard((name, call))
+            stats = self._stats(name)
+            stats["calls"] += 1
+            stats["total_ms"] += elapsed
+            stats["max_ms"] = max(stats["max_ms"], elapsed)
+        pending.done.set()
+
+    def _stats(self, name):
+        """ Returns statistics of module, lock must be held """
+        return self.stats.setdefault(name, {"calls": 0, "total_ms": 0.0, "max_ms": 0.0,
+                                            "overruns": 0, "errors": 0})
+
+    def report(self):
+        """
+        Returns per-module call statistics as JSON string
+        """
+        with self._lock:
+            return json.dumps({name: {key: round(value, 3) for key, value in stats.items()}
+                               for name, stats in self.stats.items()})
@@ -0,0 +1,165 @@
+"""
+Peak meter sampler reads audio levels of all shown sessions in one background thread.
+Renderer only reads latest levels, it never calls audio backend.
+Simulation samples without thread on virtual time with pump().
+"""
+import threading
+import time
+from array import array
+
+from core.tracer import Tracer
+
+
+class PeakMeterSampler: # pylint: disable=too-many-instance-attributes # Aknowledged
+    """
+    Samples peak levels of watched sessions at fixed rate.
+    Smoothed levels (fast attack, exponential decay) are computed for all sessions at once
+    into preallocated array.
+    Sampler thread sleeps while paused (menu hidden).
+    """
+    def __init__(self, backend, rate_hz=30, max_sessions=64, attack=0.6, decay=0.85):
+        """
+        Parameters:
+            backend (AudioBackend): Audio backend to read peaks from.
+            rate_hz (int): Samples per second.
+            max_sessions (int): Sessions sampled at most.
+            attack (float): Part of rise applied per sample (1 - instant).
+            decay (float): Level multiplier per sample while level falls.
+        """
+        self.backend = backend
+        self.interval = 1.0 / rate_hz
+        self.max_sessions = max_sessions
+        self.attack = attack
+        self.decay = decay
+        self.clock = time.monotonic
+        self.threaded = True
+
+        self._levels = array("f", bytes(4 * max_sessions))
+
+        self._condition = threading.Condition()
+        self._slots = {}
+        self._sessions = []
+        self._active = False
+        self._running = False
+        self._thread = None
+        self._next_sample = None
+        self._generation = 0     # Changed by watch, sample of previous sessions is dropped
+        self.samples = 0
+
+    @classmethod
+    def from_settings(cls, settings):
+        """
+        Returns sampler for settings "PeakMeterRate", None if meters are disabled (rate 0)
+        """
+        if not settings.peak_meter_rate:
+            return None
+        return cls(settings.audio_backend, settings.peak_meter_rate)
+
+    def watch(self, sessions):
+        """
+        Starts sampling given sessions, previous sessions and levels are dropped
+        """
+        sessions = list(sessions)[:self.max_sessions]
+        with self._condition:
+            self._sessions = sessions
+            self._slots = {self.backend.session_key(session): slot
+                           for slot, session in enumerate(sessions)}
+            self._levels[:] = array("f", bytes(4 * self.max_sessions))
+            self._active = bool(sessions)
+            self._generation += 1
+            self._next_sample = self.clock()
+            if self._thread is None and self.threaded:
+                self._running = True
+                self._thread = threading.Thread(target=self._sample_loop, name="PeakMeter",
+                                                daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def pause(self):
+        """
+        Stops sampling until next watch
+        """
+        with self._condition:
+            self._active = False
+
+    def level(self, sessions):
+        """
+        Returns latest smoothed level (0..1) of session group: the loudest session
+        """
+        slots = self._slots
+        level = 0.0
+        for session in sessions:
+            slot = slots.get(self.backend.session_key(session))
+            if slot is not None and self._levels[slot] > level:
+                level = self._levels[slot]
+        return level
+
+    def pump(self):
+        """
+        Takes samples due at current clock time,
+        used instead of sampler thread when threaded is False (simulation)
+        """
+        with self._condition:
+            if not self._active:
+                return
+            sessions, generation = self._sessions, self._generation
+            now = self.clock()
+            due = now >= self._next_sample
+            if due:
+                # Late sample is not made up for, like in sampler thread
+                self._next_sample = max(self._next_sample + self.interval, now)
+        if due:
+            with Tracer.span("sample peaks", "audio", sessions=len(sessions)):
+                self._store(self.backend.get_peaks(sessions), generation)
+
+    def _sample_loop(self):
+        """ Sampler thread loop """
+        self.backend.init_thread()
+        next_sample = self.clock()
+        while True:
+            with self._condition:
+                while self._running and not self._active:
+                    self._condition.wait()
+                    next_sample = self.clock()
+                if not self._running:
+                    return
+                sessions, generation = self._sessions, self._generation
+
+            with Tracer.span("sample peaks", "audio", sessions=len(sessions)):
+                self._store(self.backend.get_peaks(sessions), generation)
+
+            next_sample += self.interval
+            with self._condition:
+                pause = next_sample - self.clock()
+                if pause > 0 and self._running:
+                    self._condition.wait(pause)
+                else:
+                    next_sample = self.clock()
+
+    def _store(self, peaks, generation):
+        """
+        Updates smoothed levels of all sessions with one sample.
+        Sample taken before sessions changed (other generation) would land in other slots,
+        it is dropped.
+        """
+        count = len(peaks)
+        attack, decay = self.attack, self.decay
+        with self._condition:
+            if generation != self._generation:
+                return
+            self._levels[:count] = array("f", [
+                level + (peak - level) * attack if peak > level else max(peak, level * decay)
+                for peak, level in zip(peaks, self._levels)
+            ])
+            self.samples += 1
+
+    def stop(self):
+        """
+        Stops sampler thread
+        """
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join()
@@ -0,0 +1,243 @@
+"""
+Render thread paints menu frames off UI thread (settings "RenderThread").
+UI thread publishes immutable snapshot of menu state, render thread steps animations,
+paints into one of two offscreen images and paintEvent only draws latest finished image.
+Snapshot holds detached copies of menu items, render thread never reads live menu.
+"""
+from dataclasses import dataclass
+import threading
+import time
+
+from PySide6.QtGui import QImage
+
+from core.renderer import Renderer, RenderState
+from core.tracer import Tracer
+
+
+RENDERED_FIELDS = ("name", "icon", "text", "session", "sessions")  # Item fields renderer reads
+
+
+def copy_item(item):
+    """
+    Returns detached copy of menu item with fields renderer reads.
+    Class is kept, renderer draws items by their type, constructor is not called
+    (it registers items in class indexes).
+    """
+    if item is None:
+        return None
+    copy = object.__new__(type(item))
+    for field in RENDERED_FIELDS:
+        if hasattr(item, field):
+            value = getattr(item, field)
+            setattr(copy, field, tuple(value) if field == "sessions" else value)
+    return copy
+
+
+@dataclass(frozen=True)
+class RenderSnapshot: # pylint: disable=too-many-instance-attributes # Aknowledged
+    """ Menu state render thread paints from """
+    menu: tuple
+    focused_index: int
+    last_turn: str
+    active_option: object
+    current_volume: float
+    opacity: float
+    theme: object
+    icons: dict
+
+
+class ThreadedRenderer(Renderer):
+    """
+    Renderer of render thread. Owns its animation state, menu state and icons come from snapshot.
+    """
+    def __init__(self, renderer):
+        """
+        Parameters:
+            renderer (Renderer): UI thread renderer to copy parameters from.
+        """
+        super().__init__(renderer.screen_size, renderer.settings, renderer.volume_writer,
+                         renderer.peak_meter)
+        self.render_state = RenderState()
+        self.icons = {}
+
+    def apply(self, snapshot):
+        """
+        Takes menu state from snapshot, pointer target is recomputed when menu or focus changed
+        """
+        moved = snapshot.menu != self.menu or snapshot.focused_index != self.focused_index
+        self.menu = snapshot.menu
+        self.focused_index = snapshot.focused_index
+        self.last_turn = snapshot.last_turn
+        self.active_option = snapshot.active_option
+        self.current_volume = snapshot.current_volume
+        self.render_state.opacity_multiplier = snapshot.opacity
+        self.icons = snapshot.icons
+        if moved and self.menu:
+            self.set_angles()
+
+    def find_icon(self, label):
+        return self.icons.get(label.icon)
+
+
+class RenderThread: # pylint: disable=too-many-instance-attributes # Aknowledged
+    """
+    Paints frames at refresh rate into two images: one is painted, other is latest finished.
+    Thread sleeps while paused (menu hidden).
+    """
+    def __init__(self, renderer, size, refresh_rate, on_frame):
+        """
+        Parameters:
+            renderer (Renderer): UI thread renderer, source of published state.
+            size (QSize): Frame size.
+            refresh_rate (int): Frames per second.
+            on_frame (callable): Called from render thread when new frame is finished.
+        """
+        self.source = renderer
+        self.renderer = ThreadedRenderer(renderer)
+        self.interval = 1.0 / refresh_rate
+        self.on_frame = on_frame
+        self.frames = 0
+
+        self._buffers = [QImage(size, QImage.Format.Format_ARGB32_Premultiplied)
+                         for _ in range(2)]
+        self._front = None
+        self._icon_images = {}
+        # Copies are made again only when menu items change, so unchanged menu stays equal
+        self._published_items = ()
+        self._published_menu = ()
+
+        self._condition = threading.Condition()
+        self._snapshot = None
+        self._active = False
+        self._running = False
+        self._thread = None
+
+    def publish(self, theme):
+        """
+        Publishes current menu state of UI renderer, called from UI thread.
+        Icons are converted to images here, pixmaps are not used outside UI thread.
+
+        Parameters:
+            theme (RemixerTheme): Theme to paint with.
+        """
+        source = self.source
+        items = tuple(source.menu or ())
+        if len(items) != len(self._published_items) \
+                or any(a is not b for a, b in zip(items, self._published_items)):
+            self._published_items = items
+            self._published_menu = tuple(copy_item(item) for item in items)
+        menu = self._published_menu
+        # Active option is one of menu items, its copy is shared
+        active_option = next((copy for item, copy in zip(items, menu)
+                              if item is source.active_option), None)
+        if active_option is None:
+            active_option = copy_item(source.active_option)
+
+        icons = {}
+        for item in items:
+            pixmap = source.find_icon(item)
+            if pixmap:
+                image = self._icon_images.get(pixmap.cacheKey())
+                if image is None:
+                    image = pixmap.toImage()
+                    self._icon_images[pixmap.cacheKey()] = image
+                icons[item.icon] = image
+
+        snapshot = RenderSnapshot(menu, source.focused_index, source.last_turn,
+                                  active_option, source.current_volume,
+                                  source.render_state.opacity_multiplier, theme, icons)
+        with self._condition:
+            self._snapshot = snapshot
+            self._condition.notify()
+
+    def resume(self):
+        """
+        Starts painting frames
+        """
+        with self._condition:
+            self._active = True
+            self._condition.notify()
+            if self._thread is not None:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._render_loop, name="Render", daemon=True)
+        self._thread.start()
+
+    def pause(self):
+        """
+        Stops painting frames until resume, finished frame is dropped
+        """
+        with self._condition:
+            self._front = None
+            self._active = False
+
+    def present(self, painter):
+        """
+        Draws latest finished frame, called from paintEvent.
+        Returns True if there was frame to draw.
+        """
+        with self._condition:
+            if self._front is None:
+                return False
+            painter.drawImage(0, 0, self._buffers[self._front])
+            return True
+
+    def capture(self):
+        """
+        Returns copy of latest finished frame, None if there is no frame
+        """
+        with self._condition:
+            if self._front is None:
+                return None
+            return self._buffers[self._front].copy()
+
+    def _render_loop(self):
+        """ Render thread loop """
+        self.renderer.settings.audio_backend.init_thread()
+        next_frame = time.monotonic()
+        while True:
+            with self._condition:
+                while self._running and not (self._active and self._snapshot):
+                    self._condition.wait()
+                    next_frame = time.monotonic()
+                if not self._running:
+                    return
+                snapshot = self._snapshot
+                # Buffer that is not front is never drawn by UI thread
+                back = 1 if self._front == 0 else 0
+
+            with Tracer.span("render frame", "paint"):
+                self._render(self._buffers[back], snapshot)
+
+            with self._condition:
+                if self._active:
+                    self._front = back
+            self.frames += 1
+            self.on_frame()
+
+            # Published snapshots do not wake thread before next frame time
+            next_frame += self.interval
+            with self._condition:
+                pause = next_frame - time.monotonic()
+                if pause <= 0:
+                    next_frame = time.monotonic()
+                while pause > 0 and self._running:
+                    self._condition.wait(pause)
+                    pause = next_frame - time.monotonic()
+
+    def _render(self, image, snapshot):
+        """ Paints one frame of snapshot into image """
+        self.renderer.apply(snapshot)
+        self.renderer.paint_frame(image, snapshot.theme)
+
+    def stop(self):
+        """
+        Stops render thread
+        """
+        with self._condition:
+            self._active = self._running = False
+            self._condition.notify_all()
+        thread = self._thread
+        self._thread = None
+        if thread is not None:
+            thread.join()
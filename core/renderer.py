@@ -1,13 +1,14 @@
-# pylint: disable=too-many-locals,too-many-arguments,too-many-positional-arguments,too-many-branches # WIP
+# pylint: disable=too-many-locals,too-many-arguments,too-many-positional-arguments,too-many-branches,too-many-instance-attributes,too-many-statements # WIP
 """
 Application renderer
 """
 from dataclasses import dataclass
 import math
-from PySide6.QtCore import Qt, QPoint, QRectF
-from PySide6.QtGui import QPen, QFont, QFontMetrics
+from PySide6.QtCore import Qt, QPoint, QRect, QRectF
+from PySide6.QtGui import QPen, QFont, QFontMetrics, QImage, QPainter
 from core.menu import AppVolume, Placeholder
 from core.menu_manager import MenuObserver
+from core.tracer import Tracer
 
 @dataclass
 class RenderState:
@@ -30,9 +31,11 @@ class Renderer(MenuObserver):
     active_option = None
     current_volume = 1
 
-    def __init__(self, screen_size, settings):
+    def __init__(self, screen_size, settings, volume_writer, peak_meter=None):
         self.screen_size = screen_size
         self.settings = settings
+        self.volume_writer = volume_writer
+        self.peak_meter = peak_meter
 
     def on_focus_changed(self, index, last_turn):
         """
@@ -49,6 +52,16 @@ class Renderer(MenuObserver):
         self.menu = menu
         self.set_angles()
 
+    def on_state_changed(self, menu, index, last_turn, _menu_changed):
+        """
+        Implemented by MenuObserver. Called once after menu transaction,
+        pointer angles are computed once for final menu and focus
+        """
+        self.menu = menu
+        self.focused_index = index
+        self.last_turn = last_turn
+        self.set_angles()
+
     def set_angles(self, set_current = False):
         """
         Sets user pointer target angle(for animated shifting)
@@ -79,6 +92,21 @@ class Renderer(MenuObserver):
         self.settings.icon_manager.load_icons(AppVolume.get_pid_dict())
         self.settings.icon_manager.load_colored_icons()
 
+    def paint_frame(self, image, theme):
+        """
+        Clears image and draws frame into it. Returns image.
+
+        Parameters:
+            image (QImage): Image of screen size.
+            theme (RemixerTheme): Theme to draw with.
+        """
+        image.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+        self.draw(painter, theme)
+        painter.end()
+        return image
+
     def draw(self, painter, theme):
         """
         Main draw function. Processes menu parameters and calls elements' drawing functions
@@ -145,18 +173,22 @@ class Renderer(MenuObserver):
         elif self.render_state.focus_pie_span > self.render_state.focus_pie_target_span:
             self.render_state.focus_pie_span -= span_changing_speed
 
-        for i, label in enumerate(self.menu):
-            self.draw_sector(painter, theme, center, radius, sectors, i)
+        with Tracer.span("draw sectors", "paint"):
+            for i, label in enumerate(self.menu):
+                self.draw_sector(painter, theme, center, radius, sectors, i)
 
-        self.draw_focus(
-                    painter, theme, center, radius, sectors,
-                    self.render_state.focus_pie_angle, speed
-        )
+        with Tracer.span("draw focus", "paint"):
+            self.draw_focus(
+                        painter, theme, center, radius, sectors,
+                        self.render_state.focus_pie_angle, speed
+            )
 
-        for i, label in enumerate(self.menu):
-            self.draw_all_icons(painter, theme, center, radius, sectors, i, label)
+        with Tracer.span("draw icons", "paint"):
+            for i, label in enumerate(self.menu):
+                self.draw_all_icons(painter, theme, center, radius, sectors, i, label)
 
-        self.draw_center_label(painter, theme, center)
+        with Tracer.span("draw center label", "paint"):
+            self.draw_center_label(painter, theme, center)
 
 
     def draw_sector(self, painter, theme, center, radius, sectors, i):
@@ -190,6 +222,32 @@ class Renderer(MenuObserver):
                         int(span_angle)
                         )
 
+        label = self.menu[i]
+        if self.peak_meter is not None and isinstance(label, AppVolume):
+            self.draw_level_meter(painter, theme, center, radius * 0.92, radius * 0.04,
+                                  start_angle, span_angle, self.peak_meter.level(label.sessions))
+
+    def draw_level_meter(self, painter, theme, center, meter_radius, thickness,
+                         start_angle, span_angle, level):
+        """
+        Draws live audio level as arc, level share of given span is filled.
+
+        Parameters:
+            painter (QPainter): Used PyQt painter.
+            center (QPoint): Position of center of application window.
+            meter_radius (float): Radius of meter arc in pixels.
+            thickness (float): Meter thickness in pixels.
+            start_angle (int): Start angle of span (1/16 degree).
+            span_angle (int): Span at full level (1/16 degree).
+            level (float): Level in range 0..1.
+        """
+        if level < 0.01:
+            return
+        rect = QRectF(center.x() - meter_radius, center.y() - meter_radius,
+                      meter_radius * 2, meter_radius * 2)
+        self.draw_arc(painter, rect, theme.volume_arc.foreground, thickness,
+                      int(start_angle), int(span_angle * level))
+
     def draw_focus(self, painter, theme, center, radius, sectors, f_angle, speed = 0):
         """
         Draws user pointer sector (pie).
@@ -283,20 +341,35 @@ class Renderer(MenuObserver):
             sectors (int): Count of items in current menu.
             size_multiplier (float): Image size multiplier.
         """
-        icon = self.settings.icon_manager.icons.get(label.icon)
-        #if f"{label.icon}_Colorable" in self.icon_manager.icons:
-        if label.icon in self.settings.icon_manager.colored_icons:
-            icon = self.settings.icon_manager.colored_icons.get(label.icon)
-
+        icon = self.find_icon(label)
         if not icon:
-            icon = self.settings.icon_manager.colored_icons.get("Unknown")
+            return
 
         icon_size = int(size_multiplier*32)
         angle_rad = math.radians(i * 360 / sectors - 90 + (360 / sectors) / 2)
         x = center.x() + math.cos(angle_rad) * (radius * 0.7) - icon_size // 2
         y = center.y() - math.sin(angle_rad) * (radius * 0.7) - icon_size // 2
         painter.setOpacity(self.render_state.opacity_multiplier)
-        painter.drawPixmap(int(x), int(y), icon_size, icon_size, icon)
+        if isinstance(icon, QImage):
+            painter.drawImage(QRect(int(x), int(y), icon_size, icon_size), icon)
+        else:
+            painter.drawPixmap(int(x), int(y), icon_size, icon_size, icon)
+
+    def find_icon(self, label):
+        """
+        Returns icon of menu item: colored icon, plain icon or "Unknown" icon.
+
+        Parameters:
+            label (MenuItem): Menu Item with icon name.
+        """
+        icon = self.settings.icon_manager.icons.get(label.icon)
+        #if f"{label.icon}_Colorable" in self.icon_manager.icons:
+        if label.icon in self.settings.icon_manager.colored_icons:
+            icon = self.settings.icon_manager.colored_icons.get(label.icon)
+
+        if not icon:
+            icon = self.settings.icon_manager.colored_icons.get("Unknown")
+        return icon
 
     def draw_volume_arc(self, painter, theme, center, radius,
                         start_angle, span_angle, sectors, label):
@@ -347,6 +420,15 @@ class Renderer(MenuObserver):
             int(animated_span * 16 - span_diff)
         )
 
+        if self.peak_meter is not None and isinstance(label, AppVolume):
+            # Level is shown inside volume arc, full level reaches current volume
+            self.draw_level_meter(
+                painter, theme, center, radius * 0.98, radius * 0.03,
+                start_angle + self.render_state.focus_pie_span + (full_angle - animated_span) * 16,
+                animated_span * 16 - span_diff,
+                self.peak_meter.level(label.sessions)
+            )
+
     def draw_center_label(self, painter, theme, center):
         """
         Draws circle with information in the center of application menu
@@ -364,7 +446,7 @@ class Renderer(MenuObserver):
 
         if isinstance(label, AppVolume):
             if label.session.Process:
-                volume = label.session.SimpleAudioVolume.GetMasterVolume()
+                volume = self.volume_writer.get_group_volume(label.sessions)
 
         font = QFont('Helvetica', 10, QFont.Weight.Bold)
         fm = QFontMetrics(font)
@@ -439,7 +521,7 @@ class Renderer(MenuObserver):
         Sets target volume arc position
         """
         if self.active_option and isinstance(item, AppVolume) and item.session.Process:
-            self.current_volume = item.session.SimpleAudioVolume.GetMasterVolume()
+            self.current_volume = self.volume_writer.get_group_volume(item.sessions)
         elif not self.active_option:
             self.current_volume = 1
 
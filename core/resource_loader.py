@@ -23,6 +23,6 @@ class Loader: # pylint: disable=too-few-public-methods # Aknowledged
             base_path = sys._MEIPASS   # pylint: disable=protected-access,no-member   # Reason: Used to load resources in pre-built version of Remixer
         except Exception:              # pylint: disable=broad-exception-caught               # Reason: Intercepts any errors, no action required
             base_path = os.path.abspath(".")
-        relative_path = relative_path.replace("./", "").replace("/","\\")
+        relative_path = relative_path.replace("./", "").replace("/", os.sep)
 
         return os.path.join(base_path, relative_path)
@@ -5,6 +5,7 @@ import json
 from core.remixer_theme import RemixerTheme as Theme
 from core.icon_manager import IconManager
 from core.menu import AppVolume
+from core.audio_backend import AudioBackend
 
 class SettingsManager: # pylint: disable=too-many-instance-attributes # Aknowledged
     """
@@ -18,6 +19,8 @@ class SettingsManager: # pylint: disable=too-many-instance-attributes # Aknowled
         self.themes_path = themes_path or self.DEFAULT_THEMES_PATH
 
         self.refresh_rate = 60
+        self.render_thread = False
+        self.stall_watchdog = None
         self.aliases = {}
         self.ignored_apps = {}
         self.themes = []
@@ -25,40 +28,90 @@ class SettingsManager: # pylint: disable=too-many-instance-attributes # Aknowled
         self.selected_theme = None
         self.theme = None
 
-        self.serial_com = ""
-        self.serial_baud = 0
+        self.serial_devices = []
+        self.control_server = None
 
         self.menu_modules = []
+        self.menu_module_budget = 20
+        self.plugins_dir = "./plugins"
+
+        self.volume_write_rate = 60
+        self.volume_acceleration = {}
+        self.peak_meter_rate = 30
+        self.volume_profiles = {}
+        self.profile_fade_ms = 0
+        self.ducking = None
 
         self._load_settings()
 
+        self.audio_backend = AudioBackend()
         self.icon_manager = IconManager(self, AppVolume.get_pid_dict())
 
-    def _load_settings(self):
+    def _load_settings(self): # pylint: disable=too-many-branches # Reason: One branch per optional setting
         """
         Loads and processes settings.
         """
         try:
             theme = ""
-            with open('./settings.json', 'r', encoding='utf-8') as file:
+            with open(self.settings_path, 'r', encoding='utf-8') as file:
                 settings = json.load(file)
                 self.aliases = settings["Aliases"]
                 self.ignored_apps = settings["IgnoreProcesses"]
                 self.image_replacements = settings["ImageReplacements"]
                 self.refresh_rate = settings["RefreshRate"]
+                self.render_thread = settings.get("RenderThread", False)
                 self.menu_modules = settings["MenuModules"]
 
-                if "SerialCOM" in settings and "SerialBaud" in settings:
-                    self.serial_com = settings["SerialCOM"]
-                    self.serial_baud = settings["SerialBaud"]
+                if "SerialDevices" in settings:
+                    self.serial_devices = settings["SerialDevices"]
+                # Legacy single device, empty port or zero baud means no device
+                if settings.get("SerialCOM") and settings.get("SerialBaud"):
+                    self.serial_devices.append({
+                        "Port": settings["SerialCOM"],
+                        "Baud": settings["SerialBaud"],
+                        "Protocol": settings.get("SerialProtocol", "line")
+                    })
+
+                if "StallWatchdog" in settings:
+                    self.stall_watchdog = settings["StallWatchdog"]
+
+                if "MenuModuleBudget" in settings:
+                    self.menu_module_budget = settings["MenuModuleBudget"]
+
+                if "PluginsDirectory" in settings:
+                    self.plugins_dir = settings["PluginsDirectory"]
+
+                if "ControlServer" in settings:
+                    self.control_server = settings["ControlServer"]
+
+                if "VolumeWriteRate" in settings:
+                    self.volume_write_rate = settings["VolumeWriteRate"]
+
+                if "VolumeAcceleration" in settings:
+                    self.volume_acceleration = settings["VolumeAcceleration"]
+
+                if "PeakMeterRate" in settings:
+                    self.peak_meter_rate = settings["PeakMeterRate"]
+
+                if "VolumeProfiles" in settings:
+                    self.volume_profiles = settings["VolumeProfiles"]
+
+                if "ProfileFadeMs" in settings:
+                    self.profile_fade_ms = settings["ProfileFadeMs"]
+
+                if "Ducking" in settings:
+                    self.ducking = settings["Ducking"]
 
                 theme = settings["SelectedTheme"]
-            with open('./themes.json', 'r', encoding='utf-8') as file:
+            with open(self.themes_path, 'r', encoding='utf-8') as file:
                 themes_json = json.load(file)
                 themes = []
                 for theme_config in themes_json:
                     if Theme.exists(theme_config):
-                        Theme.find_by_name(theme_config).reset_config(themes_json.get(theme))
+                        # Settings loaded again: loaded theme gets its own new parameters
+                        loaded = Theme.find_by_name(theme_config)
+                        loaded.reset_config(themes_json[theme_config], self.refresh_rate)
+                        themes.append(loaded)
                     else:
                         themes.append(Theme(themes_json.get(theme_config), self.refresh_rate))
                 self.themes = themes
@@ -79,10 +132,28 @@ class SettingsManager: # pylint: disable=too-many-instance-attributes # Aknowled
         self.icon_manager.load_colored_icons()
 
         settings = {}
-        with open('settings.json', 'r', encoding='utf-8') as file:
+        with open(self.settings_path, 'r', encoding='utf-8') as file:
             settings = json.load(file)
             settings["SelectedTheme"] = theme.name
-        with open('settings.json', 'w', encoding='utf-8') as file:
+        with open(self.settings_path, 'w', encoding='utf-8') as file:
+            json.dump(settings, file, ensure_ascii=False, indent=4)
+
+    def save_volume_profile(self, name, profile):
+        """
+        Stores volume profile and writes it in config.
+
+        Parameters:
+            name (str): Profile name.
+            profile (dict): Executable name: {"Volume": float, "Mute": bool}.
+        """
+        profiles = dict(self.volume_profiles)
+        profiles[name] = profile
+        self.volume_profiles = profiles
+
+        with open(self.settings_path, 'r', encoding='utf-8') as file:
+            settings = json.load(file)
+            settings["VolumeProfiles"] = profiles
+        with open(self.settings_path, 'w', encoding='utf-8') as file:
             json.dump(settings, file, ensure_ascii=False, indent=4)
 
     def get_selected_theme(self):
@@ -0,0 +1,336 @@
+"""
+Headless simulation of Remixer: input queue, menu, input handling and rendering
+run without window, keyboard hooks and Windows audio.
+Time is virtual: frames and timers advance by exact intervals, so runs are repeatable
+and take only as long as processing itself. Volume writer, ramp scheduler and peak meter
+sampler run without threads, they are pumped once per frame on virtual time,
+so the same input always makes the same audio backend calls.
+"""
+import math
+import time
+
+from PySide6.QtCore import QSize
+from PySide6.QtGui import QGuiApplication, QImage, QPainter, QColor
+
+from core.audio_backend import FakeAudioBackend
+from core.drawing_window import DrawingWindow
+from core.input_handler import InputHandler
+from core.input_queue import InputQueue
+from core.key_injector import FakeKeyInjector
+from core.menu_manager import MenuManager
+from core.peak_meter import PeakMeterSampler
+from core.renderer import Renderer
+from core.settings import SettingsManager
+from core.volume_writer import VolumeWriter
+from core.volume_profiles import VolumeProfiles, VolumeProfilesModule
+from core.volume_ramps import VolumeRamps
+
+
+class VirtualClock: # pylint: disable=too-few-public-methods # Aknowledged
+    """
+    Simulation time in nanoseconds.
+    Starts at one second, so timestamps are never zero.
+    """
+    START = 1_000_000_000
+
+    def __init__(self):
+        self.now = self.START
+
+    def elapsed(self):
+        """
+        Returns simulated seconds
+        """
+        return (self.now - self.START) / 1e9
+
+
+class SimulatedSignal:
+    """
+    Qt signal stand-in, calls connected slots at once
+    """
+    def __init__(self):
+        self._slots = []
+
+    def connect(self, slot):
+        """
+        Connects slot
+        """
+        self._slots.append(slot)
+
+    def emit(self):
+        """
+        Calls connected slots
+        """
+        for slot in self._slots:
+            slot()
+
+
+class VirtualTimers:
+    """
+    UITimers driven by virtual clock
+    """
+    def __init__(self, window, settings, clock):
+        self.window = window
+        self.clock = clock
+        self.frame_interval = math.floor(1000/settings.refresh_rate) * 1_000_000
+        self.inactivity_interval = int(settings.get_selected_theme().fade_out_timeout * 1_000_000)
+        self.inactivity_deadline = None
+        self.fading = False
+        self.drawing = False
+
+    def start_drawing(self):
+        """ Starts frame timer """
+        self.drawing = True
+
+    def stop_drawing(self):
+        """ Stops frame timer """
+        self.drawing = False
+
+    def start_inactivity(self):
+        """ Starts inactivity timer """
+        self.inactivity_deadline = self.clock.now + self.inactivity_interval
+
+    def stop_inactivity(self):
+        """ Stops inactivity timer """
+        self.inactivity_deadline = None
+
+    def start_fade(self):
+        """ Starts fade timer """
+        self.fading = True
+
+    def stop_fade(self):
+        """ Stops fade timer """
+        self.fading = False
+
+    def tick(self):
+        """
+        Fires timers due at current virtual time, called once per frame interval
+        """
+        if self.inactivity_deadline is not None and self.clock.now >= self.inactivity_deadline:
+            self.inactivity_deadline = None
+            self.window.hide_menu()
+        if self.fading:
+            self.window._fade_step() # pylint: disable=protected-access # Reason: Timer slot of window
+        if self.drawing:
+            self.window._updatescreen() # pylint: disable=protected-access # Reason: Timer slot of window
+
+
+class HeadlessWindow: # pylint: disable=too-many-instance-attributes # Aknowledged
+    """
+    DrawingWindow stand-in without Qt window and tray icon.
+    Menu showing, hiding, fading and input processing are DrawingWindow's own methods,
+    frames are painted into offscreen image.
+    """
+    show_menu = DrawingWindow.show_menu
+    hide_menu = DrawingWindow.hide_menu
+    process_input = DrawingWindow.process_input
+    _fade_step = DrawingWindow._fade_step # pylint: disable=protected-access # Reason: Same behaviour as real window
+    _updatescreen = DrawingWindow._updatescreen # pylint: disable=protected-access # Reason: Same behaviour as real window
+    _on_input_pending = DrawingWindow._on_input_pending # pylint: disable=protected-access # Reason: Same behaviour as real window
+    _request_frame = DrawingWindow._request_frame # pylint: disable=protected-access # Reason: Same behaviour as real window
+    _capture_fade_frame = DrawingWindow._capture_fade_frame # pylint: disable=protected-access # Reason: Same behaviour as real window
+    _paint_fade_frame = DrawingWindow._paint_fade_frame # pylint: disable=protected-access # Reason: Same behaviour as real window
+
+    def __init__(self, settings, clock, screen_size=QSize(330, 330)):
+        """
+        Parameters:
+            settings (SettingsManager): Settings with fake audio backend.
+            clock (VirtualClock): Simulation clock.
+            screen_size (QSize): Size of painted frames.
+        """
+        self.settings = settings
+        self.clock = clock
+        self.closed = False
+        callbacks = {
+                "hide_menu": self.hide_menu,
+                "close_app": self.close
+        }
+
+        self.start_inactivity_signal = SimulatedSignal()
+        self.stop_inactivity_signal = SimulatedSignal()
+        self.start_fade_signal = SimulatedSignal()
+        self.stop_fade_signal = SimulatedSignal()
+
+        self.volume_writer = VolumeWriter(self.settings.audio_backend,
+                                          self.settings.volume_write_rate)
+        self.volume_writer.clock = self.clock.elapsed
+        self.volume_writer.threaded = False
+        self.ramps = VolumeRamps(self.volume_writer, self.settings.volume_write_rate,
+                                 self.settings.ducking)
+        self.ramps.clock = self.clock.elapsed
+        self.ramps.threaded = False
+        self.profiles = VolumeProfiles(self.settings, self.volume_writer, self.ramps)
+        self.menu_manager = MenuManager(self.settings, callbacks=callbacks)
+        self.menu_manager.modules.register("VolumeProfiles",
+                                           lambda: VolumeProfilesModule(self.profiles))
+        self.peak_meter = PeakMeterSampler.from_settings(self.settings)
+        if self.peak_meter is not None:
+            self.peak_meter.clock = self.clock.elapsed
+            self.peak_meter.threaded = False
+        self.renderer = Renderer(screen_size, self.settings, self.volume_writer, self.peak_meter)
+        # Frames are painted in simulation thread, like without "RenderThread"
+        self.render_thread = None
+        self.input = InputHandler(self)
+        self.input.key_injector = FakeKeyInjector()
+        self.input.clock = self.clock.elapsed
+        self.input.background_refresh = False
+        self.input_queue = InputQueue(self._on_input_pending)
+        self.menu_manager.add_observer(self.renderer)
+
+        self.timers = VirtualTimers(self, self.settings, self.clock)
+        self.start_inactivity_signal.connect(self.timers.start_inactivity)
+        self.stop_inactivity_signal.connect(self.timers.stop_inactivity)
+        self.start_fade_signal.connect(self.timers.start_fade)
+        self.stop_fade_signal.connect(self.timers.stop_fade)
+
+        self.image = QImage(screen_size, QImage.Format.Format_ARGB32_Premultiplied)
+        self.menu_visible = False
+        self.fade_frame = None
+        self._dirty = False
+
+    def pump(self):
+        """
+        Performs background work due at current virtual time:
+        ramps and ducking, volume writes, peak samples
+        """
+        self.ramps.pump()
+        self.volume_writer.pump()
+        if self.peak_meter is not None:
+            self.peak_meter.pump()
+
+    def close(self):
+        """ Exit button handler """
+        self.closed = True
+
+    def update(self):
+        """ Requests frame, like QWidget.update """
+        self._dirty = True
+
+    def paint(self):
+        """
+        Paints requested frame into image, like DrawingWindow.paintEvent.
+        Returns True if frame was painted.
+        """
+        if not self._dirty:
+            return False
+        self._dirty = False
+        if not self.menu_visible:
+            return False
+
+        if self.fade_frame is None:
+            self.renderer.paint_frame(self.image, self.settings.get_showing_theme())
+            return True
+        self.image.fill(QColor(0, 0, 0, 0))
+        painter = QPainter(self.image)
+        self._paint_fade_frame(painter)
+        painter.end()
+        return True
+
+
+class Simulation:
+    """
+    Runs input events through headless Remixer as fast as possible.
+    """
+    def __init__(self, settings=None, session_names=None, call_latency=0.0):
+        """
+        Parameters:
+            settings (SettingsManager): Settings, loaded from working directory if not given.
+            session_names (iterable): Executable names of fake audio sessions.
+            call_latency (float): Seconds every fake audio backend call takes.
+        """
+        self._app = QGuiApplication.instance() or QGuiApplication(["remixer-simulation"])
+        self.settings = settings or SettingsManager()
+        if session_names is None:
+            self.backend = FakeAudioBackend(call_latency=call_latency)
+        else:
+            self.backend = FakeAudioBackend(session_names, call_latency)
+        self.settings.audio_backend = self.backend
+
+        self.clock = VirtualClock()
+        self.backend.clock = self.clock.elapsed
+        self.window = HeadlessWindow(self.settings, self.clock)
+        self.input_times = []
+        self.frame_times = []
+
+    def push(self, event):
+        """
+        Pushes event to input queue at current virtual time
+        """
+        self.window.input_queue.push(
+                                    event.kind,
+                                    event.source,
+                                    self.clock.now,
+                                    event.device_time,
+                                    getattr(event, "target", None),
+                                    getattr(event, "value", None)
+        )
+
+    def frame(self):
+        """
+        Advances one frame interval: fires timers, performs input, paints frame,
+        performs background work
+        """
+        started = time.perf_counter()
+        self.window.timers.tick()
+        processed = time.perf_counter()
+        if self.window.paint():
+            self.frame_times.append(time.perf_counter() - processed)
+        self.input_times.append(processed - started)
+        self.window.pump()
+
+    def run(self, events, tail=1.0):
+        """
+        Runs events and returns report.
+
+        Parameters:
+            events (iterable): Objects with kind, source, offset (nanoseconds from start)
+                               and device_time, optionally target and value
+                               (RecordedEvent, for example).
+            tail (float): Simulated seconds to keep running after last event.
+        """
+        events = sorted(events, key=lambda event: event.offset)
+        interval = self.window.timers.frame_interval
+        end = self.clock.START + (events[-1].offset if events else 0) + int(tail * 1e9)
+
+        started = time.perf_counter()
+        position = 0
+        while self.clock.now < end and not self.window.closed:
+            frame_end = self.clock.now + interval
+            while position < len(events) and self.clock.START + events[position].offset < frame_end:
+                self.clock.now = max(self.clock.now, self.clock.START + events[position].offset)
+                self.push(events[position])
+                position += 1
+            self.clock.now = frame_end
+            self.frame()
+        elapsed = time.perf_counter() - started
+        self.window.volume_writer.flush(5)
+
+        return self.report(position, elapsed)
+
+    def report(self, events, elapsed):
+        """
+        Returns run statistics
+        """
+        return {
+            "events": events,
+            "simulated_s": round(self.clock.elapsed(), 3),
+            "real_s": round(elapsed, 3),
+            "events_per_s": round(events / elapsed, 1) if elapsed else None,
+            "frames": len(self.frame_times),
+            "fps": round(len(self.frame_times) / elapsed, 1) if elapsed else None,
+            "frame_ms": round(sum(self.frame_times) / len(self.frame_times) * 1000, 4)
+                        if self.frame_times else None,
+            "tick_ms": round(sum(self.input_times) / len(self.input_times) * 1000, 4)
+                       if self.input_times else None,
+            "backend_calls": dict(self.backend.calls),
+            "keys_sent": len(self.window.input.key_injector.sent),
+            "menu_visible": self.window.menu_visible
+        }
+
+    def stop(self):
+        """
+        Stops ramp scheduler, volume writer and peak meter sampler
+        """
+        self.window.ramps.stop()
+        self.window.volume_writer.stop()
+        if self.window.peak_meter is not None:
+            self.window.peak_meter.stop()
@@ -0,0 +1,52 @@
+"""
+Records startup time marks (imports, tray icon, first menu frame).
+Imported first in main.py, so marks are counted from the start of Remixer.
+"""
+import json
+import time
+
+PROCESS_START = time.perf_counter()
+
+
+class StartupProfiler:
+    """
+    Records named time marks in milliseconds since Remixer start
+    """
+    marks = {}
+    expected_marks = ()
+    on_complete = []
+
+    @classmethod
+    def mark(cls, name):
+        """
+        Records time mark. Only the first mark with given name is kept.
+
+        Parameters:
+            name (str): Mark name.
+        """
+        if name in cls.marks:
+            return
+        cls.marks[name] = (time.perf_counter() - PROCESS_START) * 1000
+
+        if cls.on_complete and all(m in cls.marks for m in cls.expected_marks):
+            callback = cls.on_complete.pop()
+            callback()
+
+    @classmethod
+    def expect(cls, marks, callback):
+        """
+        Sets callback to run once all given marks are recorded.
+
+        Parameters:
+            marks (tuple): Mark names to wait for.
+            callback (callable): Called without arguments.
+        """
+        cls.expected_marks = tuple(marks)
+        cls.on_complete = [callback]
+
+    @classmethod
+    def report(cls):
+        """
+        Returns recorded marks as JSON string
+        """
+        return json.dumps({name: round(value, 3) for name, value in cls.marks.items()})
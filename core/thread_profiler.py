@@ -0,0 +1,176 @@
+"""
+Profiles Remixer in UI thread and every thread started later
+(keyboard hook, serial reader, scroller, volume writer ...) and saves results per thread.
+Started by main.py --profile before any thread exists.
+Threads with the same name (menu module calls, one per serial port) share one result.
+"""
+import cProfile
+import io
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+
+
+class _Snapshot: # pylint: disable=too-few-public-methods # Reason: Stats source for pstats
+    """ Current stats of profile, profile of running thread is not disabled """
+    def __init__(self, profile):
+        profile.snapshot_stats()
+        self.stats = profile.stats
+
+    def create_stats(self):
+        """ Stats are already taken """
+
+
+class _SampledProfile:
+    """
+    Stack samples of one thread in pstats format: times are sums of time between samples,
+    call counts are numbers of samples function was on stack
+    """
+    def __init__(self):
+        self.stats = {}
+        # function: [samples on stack, seconds on stack, seconds on top, {caller: samples}]
+        self._samples = {}
+
+    def add(self, frame, seconds):
+        """
+        Counts one sampled stack.
+
+        Parameters:
+            frame (frame): Innermost frame of sampled thread.
+            seconds (float): Time since previous sample, credited to the stack.
+        """
+        seen = set()
+        callee = None
+        while frame is not None:
+            code = frame.f_code
+            function = (code.co_filename, code.co_firstlineno, code.co_name)
+            entry = self._samples.setdefault(function, [0, 0.0, 0.0, {}])
+            if callee is None:
+                entry[2] += seconds
+            if function not in seen:
+                # Recursive function is counted once per sample
+                seen.add(function)
+                entry[0] += 1
+                entry[1] += seconds
+            if callee is not None and callee != function:
+                callers = self._samples[callee][3]
+                callers[function] = callers.get(function, 0) + 1
+            callee = function
+            frame = frame.f_back
+
+    def create_stats(self):
+        """ Converts samples to pstats entries (cc, nc, tt, ct, callers) """
+        self.stats = {
+            function: (samples, samples, on_top, on_stack, dict(callers))
+            for function, (samples, on_stack, on_top, callers) in self._samples.items()
+        }
+
+
+class ThreadProfiler: # pylint: disable=too-many-instance-attributes # Aknowledged
+    """
+    Keeps one profile per thread.
+    Before Python 3.12 every thread has its own cProfile profile.
+    Python 3.12+ allows only one active cProfile profiler for all threads,
+    there stacks of every thread are sampled instead.
+    """
+    SUMMARY_LIMIT = 25       # Functions listed per thread in summary
+    SAMPLE_INTERVAL = 0.001  # Seconds between stack samples on Python 3.12+
+
+    def __init__(self):
+        self.sampling = sys.version_info >= (3, 12)
+        self.profiles = {}   # thread name: [profile of every thread with that name]
+        self._own_profile = None
+        self._lock = threading.Lock()
+        self._sampled = {}   # threading.Thread: _SampledProfile
+        self._stop = threading.Event()
+        self._sampler = None
+
+    def start(self):
+        """
+        Starts profiling calling thread and threads started from now on
+        """
+        if self.sampling:
+            self._sampler = threading.Thread(target=self._sample, name="ThreadProfiler",
+                                             daemon=True)
+            self._sampler.start()
+            return
+        self._own_profile = self._start_thread_profile()
+        threading.setprofile(self._on_thread_start)
+
+    def _on_thread_start(self, *_):
+        """ First profile event of new thread, replaced by thread's own profile """
+        sys.setprofile(None)
+        self._start_thread_profile()
+
+    def _start_thread_profile(self):
+        """ Creates, enables and returns cProfile profile of calling thread """
+        profile = cProfile.Profile()
+        with self._lock:
+            self.profiles.setdefault(threading.current_thread().name, []).append(profile)
+        profile.enable()
+        return profile
+
+    def _sample(self):
+        """ Sampler thread loop, records stack of every other thread """
+        own_id = threading.get_ident()
+        previous = time.perf_counter()
+        while not self._stop.wait(self.SAMPLE_INTERVAL):
+            # Sampler waits for GIL, time between samples is longer than interval under load
+            now = time.perf_counter()
+            seconds, previous = now - previous, now
+            # pylint: disable-next=protected-access # Reason: Only way to read stacks of other threads
+            frames = sys._current_frames()
+            threads = {thread.ident: thread for thread in threading.enumerate()}
+            with self._lock:
+                for ident, frame in frames.items():
+                    thread = threads.get(ident)
+                    if ident == own_id or thread is None:
+                        continue
+                    # Thread objects are keys, identifiers of finished threads are reused
+                    profile = self._sampled.get(thread)
+                    if profile is None:
+                        profile = self._sampled[thread] = _SampledProfile()
+                        self.profiles.setdefault(thread.name, []).append(profile)
+                    profile.add(frame, seconds)
+
+    def save(self, directory):
+        """
+        Stops profiling and writes one .prof file (pstats, snakeviz) per thread
+        and summary.txt with the most expensive functions of every thread.
+        Must be called from the thread that called start().
+
+        Parameters:
+            directory (str): Output directory, created if missing.
+        """
+        if self.sampling:
+            self._stop.set()
+            self._sampler.join()
+            unit = "samples"
+        else:
+            threading.setprofile(None)
+            # Only own profile is disabled, profiles of running threads are read as they are
+            self._own_profile.disable()
+            unit = "calls"
+        with self._lock:
+            profiles = {name: list(group) for name, group in self.profiles.items()}
+        os.makedirs(directory, exist_ok=True)
+
+        summary = io.StringIO()
+        for index, (name, group) in enumerate(profiles.items()):
+            sources = [_Snapshot(profile) if isinstance(profile, cProfile.Profile) else profile
+                       for profile in group]
+            stats = pstats.Stats(*sources, stream=summary)
+            file_name = f"{index:02d}-{re.sub(r'[^A-Za-z0-9_.-]+', '_', name)}.prof"
+            stats.dump_stats(os.path.join(directory, file_name))
+
+            summary.write(f"=== {name}: {len(group)} thread(s), {stats.total_calls} {unit}, "
+                          f"{stats.total_tt:.3f} s ({file_name}) ===\n")
+            stats.sort_stats("cumulative").print_stats(self.SUMMARY_LIMIT)
+
+        with open(os.path.join(directory, "summary.txt"), "w", encoding="utf-8") as file:
+            file.write(summary.getvalue())
+        threads = sum(len(group) for group in profiles.values())
+        print(f"Profile of {threads} threads written to {directory}", flush=True)
@@ -0,0 +1,139 @@
+"""
+Records timeline of Remixer work (input, menu, audio calls, painting) with thread ids
+and saves it in Chrome trace-event format (open in chrome://tracing or ui.perfetto.dev).
+Tracing is off unless started, disabled spans cost one attribute check.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+
+
+class _Span:
+    """
+    Context manager recording one complete ("X") event
+    """
+    __slots__ = ("name", "category", "args", "start")
+
+    def __init__(self, name, category, args):
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *_):
+        Tracer.complete(self.name, self.start, time.perf_counter_ns(), self.category, self.args)
+
+
+class _NoSpan:
+    """
+    Context manager doing nothing, used while tracing is off
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        return None
+
+
+class Tracer:
+    """
+    Collects trace events from any thread
+    """
+    MAX_EVENTS = 1_000_000  # Oldest events are dropped when limit is reached
+
+    enabled = False
+    events = deque(maxlen=MAX_EVENTS)
+    thread_names = {}
+    _no_span = _NoSpan()
+
+    @classmethod
+    def start(cls):
+        """
+        Starts recording
+        """
+        cls.events.clear()
+        cls.enabled = True
+
+    @classmethod
+    def stop(cls):
+        """
+        Stops recording, recorded events are kept
+        """
+        cls.enabled = False
+
+    @classmethod
+    def _thread(cls):
+        """
+        Returns id of calling thread, remembers its name
+        """
+        tid = threading.get_native_id()
+        if tid not in cls.thread_names:
+            cls.thread_names[tid] = threading.current_thread().name
+        return tid
+
+    @classmethod
+    def span(cls, name, category="remixer", **args):
+        """
+        Returns context manager recording its duration.
+
+        Parameters:
+            name (str): Span name.
+            category (str): Category ("input", "menu", "audio", "paint" ...).
+            args: Values shown with span.
+        """
+        if not cls.enabled:
+            return cls._no_span
+        return _Span(name, category, args)
+
+    @classmethod
+    def complete(cls, name, start, end, category="remixer", args=None): # pylint: disable=too-many-arguments,too-many-positional-arguments # Aknowledged
+        """
+        Records span which start and end (perf_counter_ns) are already known
+        """
+        if not cls.enabled:
+            return
+        cls.events.append({
+            "name": name, "cat": category, "ph": "X",
+            "ts": start / 1000, "dur": (end - start) / 1000,
+            "pid": os.getpid(), "tid": cls._thread(), "args": args or {}
+        })
+
+    @classmethod
+    def instant(cls, name, category="remixer", timestamp=None, **args):
+        """
+        Records moment event.
+
+        Parameters:
+            name (str): Event name.
+            category (str): Category.
+            timestamp (int): perf_counter_ns() of event, now if not given.
+            args: Values shown with event.
+        """
+        if not cls.enabled:
+            return
+        cls.events.append({
+            "name": name, "cat": category, "ph": "i", "s": "t",
+            "ts": (timestamp or time.perf_counter_ns()) / 1000,
+            "pid": os.getpid(), "tid": cls._thread(), "args": args
+        })
+
+    @classmethod
+    def save(cls, path):
+        """
+        Writes recorded events to file in Chrome trace-event JSON format
+        """
+        pid = os.getpid()
+        metadata = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                     "args": {"name": name}} for tid, name in cls.thread_names.items()]
+        metadata.append({"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+                         "args": {"name": "Remixer"}})
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"traceEvents": metadata + list(cls.events), "displayTimeUnit": "ms"}, file)
@@ -1,7 +1,7 @@
 """ Loads Tray icon and initializes tray menu """
 import os
 
-from PySide6.QtWidgets import QMenu, QSystemTrayIcon
+from PySide6.QtWidgets import QMenu, QSystemTrayIcon, QInputDialog
 from PySide6.QtGui import QIcon, QAction
 from core.resource_loader import Loader
 
@@ -9,6 +9,7 @@ class TrayController:
     """ Loads Tray icon and initializes tray menu """
     def __init__(self, parent, callbacks):
         self.tray_icon = QSystemTrayIcon(parent)
+        self.profiles_menu = None
 
         self.load_tray_icon("./icons/internal/AppIcon.png")
 
@@ -25,7 +26,34 @@ class TrayController:
     def load_menu(self, parent, callbacks):
         """ Creates menu """
         menu = QMenu()
+
+        if "profiles" in callbacks:
+            self.profiles_menu = menu.addMenu("Profiles")
+            self.profiles_menu.aboutToShow.connect(
+                lambda: self.load_profiles_menu(parent, callbacks["profiles"])
+            )
+
         quit_action = QAction("Exit", parent)
         quit_action.triggered.connect(callbacks["close_app"])
         menu.addAction(quit_action)
         return menu
+
+    def load_profiles_menu(self, parent, profiles):
+        """ Fills Profiles submenu with current profiles, called every time it opens """
+        self.profiles_menu.clear()
+        for name in profiles.names():
+            action = QAction(name, parent)
+            action.triggered.connect(lambda _=False, profile=name: profiles.apply(profile))
+            self.profiles_menu.addAction(action)
+        self.profiles_menu.addSeparator()
+
+        save_action = QAction("Save current as...", parent)
+        save_action.triggered.connect(lambda: self.save_profile(parent, profiles))
+        self.profiles_menu.addAction(save_action)
+
+    @staticmethod
+    def save_profile(parent, profiles):
+        """ Asks profile name and saves current volumes to it """
+        name, accepted = QInputDialog.getText(parent, "Remixer", "Profile name:")
+        if accepted and name.strip():
+            profiles.snapshot(name.strip())
@@ -1,4 +1,7 @@
-""" Initializing timers for UI drawing """
+"""
+Initializing timers for UI drawing.
+No timer runs while menu is hidden, so hidden Remixer wakes up only on input.
+"""
 import math
 from PySide6.QtCore import QTimer
 
@@ -6,7 +9,7 @@ class UITimers():
     """ Initializing timers for UI drawing """
     def __init__(self, parent, settings):
         self.draw_timer = QTimer(parent)
-        self.draw_timer.start(math.floor(1000/settings.refresh_rate))
+        self.draw_timer.setInterval(math.floor(1000/settings.refresh_rate))
         self.draw_timer.timeout.connect(parent._updatescreen)
 
         self.fade_timer = QTimer(parent)
@@ -17,6 +20,14 @@ class UITimers():
         self.inactivity_timer.setInterval(settings.get_selected_theme().fade_out_timeout)
         self.inactivity_timer.timeout.connect(parent.hide_menu)
 
+    def start_drawing(self):
+        """ Starts frame timer """
+        self.draw_timer.start()
+
+    def stop_drawing(self):
+        """ Stops frame timer """
+        self.draw_timer.stop()
+
     def start_inactivity(self):
         """ Starts inactivity timer """
         self.inactivity_timer.start()
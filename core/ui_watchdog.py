@@ -0,0 +1,172 @@
+"""
+UI stall watchdog (settings "StallWatchdog"): background thread posts heartbeats to Qt event
+loop and logs main thread stack with timestamps when heartbeat is not processed within budget,
+so synchronous audio calls, icon work or file writes in UI thread become visible.
+Heartbeats are sent only for a while after event loop woke up for other work,
+so hidden Remixer keeps sleeping. Log file is moved to "<LogFile>.1" when it is full.
+"""
+import os
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime
+
+from PySide6.QtCore import QAbstractEventDispatcher, QObject, Signal
+
+from core.tracer import Tracer
+
+
+class UIWatchdog(QObject): # pylint: disable=too-many-instance-attributes # Aknowledged
+    """
+    Detects UI thread stalls and samples main thread stack while they last
+    """
+    LINGER = 1.0     # Seconds heartbeats continue after last event loop wakeup
+
+    heartbeat_signal = Signal()
+
+    def __init__(self, budget_ms, log_path=None, max_log_kb=1024):
+        """
+        Parameters:
+            budget_ms (float): Longest time heartbeat may wait in event loop.
+            log_path (str): File stalls are appended to, None prints them to stderr.
+            max_log_kb (int): Log file size that makes it rotate, older log is kept once.
+        """
+        super().__init__()
+        self.budget = budget_ms / 1000
+        self.log_path = log_path
+        self.max_log_bytes = max_log_kb * 1024
+        self.stalls = 0
+        self.heartbeats = 0
+
+        self._main_id = threading.main_thread().ident
+        self._condition = threading.Condition()
+        self._activity = None    # perf_counter of last wakeup not caused by heartbeat
+        self._pending = False
+        self._awake_during_ping = False
+        self._skip_awake = False
+        self._sleeping = False
+        self._running = False
+        self._thread = None
+
+        # Signal is emitted in watchdog thread, slot is queued to UI thread
+        self.heartbeat_signal.connect(self._heartbeat)
+
+    @classmethod
+    def from_settings(cls, settings):
+        """
+        Returns watchdog for settings "StallWatchdog", None if it is not configured.
+        Default budget is 2 frames at "RefreshRate", default log limit is 1 MB.
+        """
+        config = settings.stall_watchdog
+        if config is None:
+            return None
+        budget_ms = config.get("BudgetMs", config.get("BudgetFrames", 2) * 1000
+                               / settings.refresh_rate)
+        return cls(budget_ms, config.get("LogFile"), config.get("MaxLogKB", 1024))
+
+    def install(self):
+        """
+        Starts watching event loop of UI thread, must be called from UI thread
+        """
+        QAbstractEventDispatcher.instance().awake.connect(self._on_awake)
+        self._activity = time.perf_counter()
+        self._running = True
+        self._thread = threading.Thread(target=self._watch, name="UIWatchdog", daemon=True)
+        self._thread.start()
+
+    def _on_awake(self):
+        """ Event loop woke up (UI thread), starts heartbeats unless wakeup was heartbeat """
+        # Dispatcher reports wakeup before (Windows) or after (glib) heartbeat is performed
+        if self._pending:
+            self._awake_during_ping = True
+            return
+        if self._skip_awake:
+            self._skip_awake = False
+            return
+        self._activity = time.perf_counter()
+        if self._sleeping:
+            with self._condition:
+                self._sleeping = False
+                self._condition.notify()
+
+    def _heartbeat(self):
+        """ Heartbeat reached event loop (UI thread) """
+        self._skip_awake = not self._awake_during_ping
+        self._pending = False
+
+    def _wait_activity(self):
+        """ Sleeps while event loop has nothing to do, returns False when stopped """
+        with self._condition:
+            while self._running and (self._activity is None
+                                     or time.perf_counter() - self._activity > self.LINGER):
+                self._activity = None
+                self._sleeping = True
+                self._condition.wait()
+            self._sleeping = False
+            return self._running
+
+    def _sleep(self, seconds):
+        """ Waits given time unless watchdog is stopped """
+        with self._condition:
+            if self._running:
+                self._condition.wait(seconds)
+
+    def _watch(self):
+        """ Watchdog thread loop """
+        while self._wait_activity():
+            self._awake_during_ping = False
+            self._pending = True
+            sent = time.perf_counter()
+            self.heartbeats += 1
+            self.heartbeat_signal.emit()
+            self._sleep(self.budget)
+            if self._pending and self._running:
+                self._report_stall(sent)
+
+    def _report_stall(self, sent):
+        """ Logs main thread stack every budget until heartbeat is performed """
+        self.stalls += 1
+        previous = None
+        samples = 0
+        while self._pending and self._running:
+            # pylint: disable-next=protected-access # Reason: Only way to read stack of other thread
+            frame = sys._current_frames().get(self._main_id)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else ""
+            samples += 1
+            if stack != previous:
+                stalled_ms = (time.perf_counter() - sent) * 1000
+                self._log(f"UI thread stalled for {stalled_ms:.0f} ms, main thread stack:\n{stack}")
+                previous = stack
+            self._sleep(self.budget)
+        end = time.perf_counter()
+        self._log(f"UI stall ended after {(end - sent) * 1000:.0f} ms ({samples} samples)\n")
+        Tracer.complete("UI stall", int(sent * 1e9), int(end * 1e9), "watchdog",
+                        {"samples": samples})
+
+    def _log(self, text):
+        """ Writes timestamped text to log file or stderr """
+        line = f"[{datetime.now().isoformat(sep=' ', timespec='milliseconds')}] {text}"
+        if self.log_path is None:
+            print(line, end="", file=sys.stderr, flush=True)
+            return
+        try:
+            if os.path.exists(self.log_path) \
+                    and os.path.getsize(self.log_path) >= self.max_log_bytes:
+                os.replace(self.log_path, self.log_path + ".1")
+            with open(self.log_path, "a", encoding="utf-8") as file:
+                file.write(line)
+        except OSError as e:
+            print(f"Stall watchdog can not write {self.log_path}: {e}")
+
+    def stop(self):
+        """
+        Stops watchdog thread
+        """
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+            self._thread = None
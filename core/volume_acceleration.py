@@ -0,0 +1,121 @@
+"""
+Volume acceleration estimates knob velocity from input timestamps
+"""
+from collections import deque
+
+
+class VolumeAccelerator:
+    """
+    Calculates volume step multiplier from turn velocity.
+    Velocity is measured over a sliding window of turn timestamps. Device timestamps
+    are preferred over arrival time, because buffered events arrive in batches.
+    """
+    DEFAULT_CURVE = ((0, 1), (4, 1), (8, 2), (15, 4), (30, 8), (50, 10))
+
+    def __init__(self, curve=DEFAULT_CURVE, window_ms=250, base_step=0.01):
+        """
+        Parameters:
+            curve (list): [velocity (turns per second), multiplier] points, linearly interpolated.
+            window_ms (int): Sliding window length in milliseconds.
+            base_step (float): Volume change of one slow turn, volume snaps to it.
+        """
+        self.curve = sorted((float(velocity), float(mtp)) for velocity, mtp in curve)
+        self.window = window_ms * 1_000_000
+        self.base_step = base_step
+        self._times = deque()
+        self._device_clock = True
+        self._direction = 0
+
+    @classmethod
+    def from_settings(cls, config):
+        """
+        Creates accelerator from "VolumeAcceleration" settings entry.
+
+        Parameters:
+            config (dict): {"Curve": [[0, 1], [50, 10]], "WindowMs": 250, "BaseStep": 0.01}
+        """
+        return cls(
+                    config.get("Curve", cls.DEFAULT_CURVE),
+                    config.get("WindowMs", 250),
+                    config.get("BaseStep", 0.01)
+        )
+
+    def reset(self):
+        """
+        Forgets previous turns (e.g. when turn direction changes).
+        """
+        self._times.clear()
+
+    def add(self, timestamp, device_time=None):
+        """
+        Registers turn and returns volume step multiplier for it.
+
+        Parameters:
+            timestamp (int): Arrival time, perf_counter nanoseconds.
+            device_time (int): Device time in nanoseconds if input device provides it.
+        """
+        device_clock = device_time is not None
+        if device_clock != self._device_clock:
+            # Clocks can not be compared, start new window
+            self._times.clear()
+            self._device_clock = device_clock
+        now = device_time if device_clock else timestamp
+
+        if self._times and now < self._times[-1]:
+            self._times.clear()
+        self._times.append(now)
+        while now - self._times[0] > self.window:
+            self._times.popleft()
+
+        return self.multiplier(self.velocity())
+
+    def volume_delta(self, direction, timestamps, device_times=None):
+        """
+        Returns volume change for several turns in one direction.
+        Window restarts when direction changes, so reversing always starts precise.
+
+        Parameters:
+            direction (int): 1 for clockwise, -1 for anticlockwise.
+            timestamps (list): Arrival times of turns, perf_counter nanoseconds.
+            device_times (list): Device times of turns in nanoseconds (None if unknown).
+        """
+        if direction != self._direction:
+            self.reset()
+            self._direction = direction
+        if not device_times:
+            device_times = [None] * len(timestamps)
+        return direction * self.base_step * sum(
+            self.add(timestamp, device_time)
+            for timestamp, device_time in zip(timestamps, device_times)
+        )
+
+    def velocity(self):
+        """
+        Returns turns per second in current window.
+        Device times are exact, so velocity is measured between first and last turn.
+        Arrival times may be bunched by buffering, so turns are counted over whole window.
+        """
+        count = len(self._times)
+        if not self._device_clock:
+            return count * 1e9 / self.window
+        if count < 2:
+            return 0.0
+        span = self._times[-1] - self._times[0]
+        return (count - 1) * 1e9 / span if span > 0 else count * 1e9 / self.window
+
+    def multiplier(self, velocity):
+        """
+        Returns multiplier for velocity from curve
+        """
+        if velocity <= self.curve[0][0]:
+            return self.curve[0][1]
+        for (v_low, m_low), (v_high, m_high) in zip(self.curve, self.curve[1:]):
+            if velocity <= v_high:
+                return m_low + (m_high - m_low) * (velocity - v_low) / (v_high - v_low)
+        return self.curve[-1][1]
+
+    def snap(self, volume):
+        """
+        Rounds volume to base step, so fast turns still land on exact values
+        """
+        return round(round(volume / self.base_step) * self.base_step, 4)
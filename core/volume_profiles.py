@@ -0,0 +1,169 @@
+"""
+Volume profiles: named snapshots of every application's volume and mute state.
+Profiles are stored in settings.json ("VolumeProfiles") by executable name,
+snapshots and applies run in background thread, settings.json is written in UI thread.
+"""
+import threading
+
+from PySide6.QtCore import QObject, Signal
+
+from core.menu import Menu, Button, MenuModule
+from core.tracer import Tracer
+
+
+class VolumeProfiles(QObject):
+    """
+    Saves and applies volume profiles
+    """
+    save_signal = Signal(str, object)
+
+    def __init__(self, settings, volume_writer, ramps=None):
+        """
+        Parameters:
+            settings (SettingsManager): Settings with "VolumeProfiles" and "ProfileFadeMs".
+            volume_writer (VolumeWriter): Writer performing batched changes.
+            ramps (VolumeRamps): Scheduler fading volumes to profile, None to set them at once.
+        """
+        super().__init__()
+        self.settings = settings
+        self.volume_writer = volume_writer
+        self.ramps = ramps
+        self._lock = threading.Lock()
+
+        # Signal is emitted in background thread, slot is queued to UI thread
+        self.save_signal.connect(self._save)
+
+    def names(self):
+        """
+        Returns profile names
+        """
+        return list(self.settings.volume_profiles)
+
+    def snapshot(self, name, on_done=None):
+        """
+        Saves current volume and mute state of every application as profile.
+        State is read in background, profile is written to settings.json in UI thread.
+
+        Parameters:
+            name (str): Profile name, existing profile is replaced.
+            on_done (callable): Called from background thread with profile dict.
+        """
+        self._run(self._snapshot, name, on_done)
+
+    def apply(self, name, on_done=None):
+        """
+        Applies profile in one batched write (in background), volumes are faded
+        over settings "ProfileFadeMs" if it is set. Applications missing in profile are not changed.
+
+        Parameters:
+            name (str): Profile name.
+            on_done (callable): Called from background thread with list of profile
+                                applications that are not running.
+        """
+        self._run(self._apply, name, on_done)
+
+    def _run(self, target, name, on_done):
+        """ Runs profile operation in background thread """
+        def work():
+            self.settings.audio_backend.init_thread()
+            with self._lock:
+                result = target(name)
+            if on_done is not None:
+                on_done(result)
+        threading.Thread(target=work, name="VolumeProfiles", daemon=True).start()
+
+    def _snapshot(self, name):
+        """
+        Reads every session through volume writer, so volumes requested but not written yet
+        are saved. Failed sessions are skipped.
+        """
+        profile = {}
+        with Tracer.span("snapshot profile", "audio", profile=name):
+            for session in self.settings.audio_backend.get_sessions():
+                if not session.Process:
+                    continue
+                try:
+                    app = session.Process.name()
+                    volume = self.volume_writer.get_volume(session)
+                    mute = self.volume_writer.get_mute(session)
+                except Exception as e: # pylint: disable=broad-exception-caught # Reason: Session may be closed while reading
+                    print(f"Profile {name}: session skipped: {e}")
+                    continue
+                # Several sessions of one application are saved as one entry, like menu group
+                entry = profile.setdefault(app, {"Volume": volume, "Mute": mute})
+                entry["Volume"] = max(entry["Volume"], volume)
+                entry["Mute"] = entry["Mute"] and mute
+
+        self.save_signal.emit(name, profile)
+        return profile
+
+    def _save(self, name, profile):
+        """ Writes profile to settings.json (UI thread) """
+        self.settings.save_volume_profile(name, profile)
+
+    def _apply(self, name):
+        """ Sends every change of profile to volume writer at once """
+        profile = self.settings.volume_profiles.get(name)
+        if profile is None:
+            print(f"Profile {name} not found")
+            return []
+
+        changes = []
+        found = set()
+        with Tracer.span("apply profile", "audio", profile=name):
+            for session in self.settings.audio_backend.get_sessions():
+                if not session.Process:
+                    continue
+                try:
+                    app = session.Process.name()
+                except Exception: # pylint: disable=broad-exception-caught # Reason: Process may exit while reading
+                    continue
+                entry = profile.get(app)
+                if entry is not None:
+                    changes.append((session, entry.get("Volume"), entry.get("Mute")))
+                    found.add(app)
+            if self.ramps is not None and self.settings.profile_fade_ms:
+                self.volume_writer.apply((session, None, mute) for session, _, mute in changes)
+                self.ramps.start([(session, volume) for session, volume, _ in changes
+                                  if volume is not None], self.settings.profile_fade_ms / 1000)
+            else:
+                self.volume_writer.apply(changes)
+        return [app for app in profile if app not in found]
+
+
+class VolumeProfilesModule(MenuModule):
+    """
+    "Profiles" menu: apply profile, or save current state to profile.
+    Enabled with "VolumeProfiles" in settings "MenuModules".
+    """
+    NAME = "VolumeProfiles"
+
+    def __init__(self, profiles):
+        self.profiles = profiles
+
+    def is_enabled(self, settings):
+        """ Checks if module enabled in settings """
+        return self.NAME in settings.menu_modules
+
+    def get_menu_item(self, menu_manager):
+        """ Returns Profiles menu """
+        # Internal icons are reused: profiles are presets like themes, saving is a setting
+        apply_items = [Button(name, "Theme", self._action(self.profiles.apply, name,
+                                                              menu_manager))
+                       for name in self.profiles.names()]
+        save_items = [Button(name, "Settings", self._action(self.profiles.snapshot, name,
+                                                          menu_manager))
+                      for name in self.profiles.names()]
+        save_items.append(Button("Back", "Back", menu_manager.menu_back))
+        return Menu("Profiles", "Themes", apply_items + [
+                        Menu("Save", "Settings", save_items),
+                        Button("Back", "Back", menu_manager.menu_back)
+        ])
+
+    @staticmethod
+    def _action(operation, name, menu_manager):
+        """ Returns button action running profile operation and returning to parent menu """
+        def action():
+            operation(name)
+            menu_manager.menu_back()
+        return action
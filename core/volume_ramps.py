@@ -0,0 +1,351 @@
+"""
+Volume ramps (fades, crossfades) and ducking run in one scheduler thread.
+Every tick all active ramps are stepped and their volumes go to VolumeWriter in one batch,
+so ramps have no timers or threads of their own. Thread sleeps while there is nothing to do.
+Simulation ticks scheduler without thread on virtual time with pump().
+"""
+import threading
+import time
+
+from core.tracer import Tracer
+
+
+class _Ramp: # pylint: disable=too-few-public-methods # Reason: Ramp state container
+    """ Linear volume change of one session """
+    __slots__ = ("session", "start", "target", "begin", "duration", "on_done")
+
+    def __init__(self, session, start, target, begin, duration, on_done): # pylint: disable=too-many-arguments,too-many-positional-arguments # Aknowledged
+        self.session = session
+        self.start = start
+        self.target = target
+        self.begin = begin
+        self.duration = duration
+        self.on_done = on_done
+
+    def volume(self, now):
+        """ Returns volume at given time and True if ramp is finished """
+        if self.duration <= 0 or now - self.begin >= self.duration:
+            return self.target, True
+        progress = (now - self.begin) / self.duration
+        return self.start + (self.target - self.start) * progress, False
+
+
+class Ducker: # pylint: disable=too-many-instance-attributes,too-few-public-methods # Aknowledged
+    """
+    Lowers every other application while trigger application plays sound
+    (settings "Ducking"), restores their volumes when it is quiet for hold time.
+    Sessions whose volume user changed while ducked keep user's volume.
+    Session ducked again during restore keeps volume its restore was heading to.
+    """
+    TOLERANCE = 0.005        # Volume difference from ducked volume that counts as user change
+    POLL_INTERVAL = 0.1      # Seconds between trigger level checks
+    RETRY_INTERVAL = 2.0     # Seconds between lookups of trigger application that is not running
+
+    def __init__(self, backend, config):
+        """
+        Parameters:
+            backend (AudioBackend): Audio backend to read sessions and levels from.
+            config (dict): "App" (executable name), optional "Level" (volume multiplier),
+                           "Threshold" (peak level), "AttackMs", "ReleaseMs", "HoldMs".
+        """
+        self.backend = backend
+        self.app = config["App"]
+        self.level = config.get("Level", 0.3)
+        self.threshold = config.get("Threshold", 0.02)
+        self.attack = config.get("AttackMs", 150) / 1000
+        self.release = config.get("ReleaseMs", 800) / 1000
+        self.hold = config.get("HoldMs", 500) / 1000
+
+        self.active = False
+        self.originals = {}      # key: (session, volume before ducking)
+        self._ducked = {}        # key: volume session was ducked to
+        self._triggers = []
+        self._lookup_time = None
+        self._loud_time = 0.0
+
+    def _trigger_sessions(self, now):
+        """ Returns sessions of trigger application, looked up again while it is not running """
+        if not self._triggers and (self._lookup_time is None
+                                   or now - self._lookup_time >= self.RETRY_INTERVAL):
+            self._lookup_time = now
+            with Tracer.span("get_sessions", "audio", app=self.app):
+                self._triggers = [session for session in self.backend.get_sessions()
+                                  if session.Process and session.Process.name() == self.app]
+        return self._triggers
+
+    def poll(self, now, ramps):
+        """
+        Checks trigger level and starts duck or restore ramps.
+
+        Parameters:
+            now (float): Monotonic time.
+            ramps (VolumeRamps): Scheduler to start ramps in (its thread, lock not held).
+        """
+        triggers = self._trigger_sessions(now)
+        loud = bool(triggers) and max(self.backend.get_peaks(triggers)) >= self.threshold
+        if loud:
+            self._loud_time = now
+        if loud and not self.active:
+            self.active = True
+            trigger_keys = {self.backend.session_key(session) for session in triggers}
+            others = [session for session in self.backend.get_sessions()
+                      if session.Process and self.backend.session_key(session) not in trigger_keys]
+            for session in others:
+                key = self.backend.session_key(session)
+                if key not in self.originals:
+                    # Running restore ramp has not reached original volume yet
+                    original = ramps.target(session)
+                    if original is None:
+                        original = ramps.writer.get_volume(session)
+                    self.originals[key] = (session, original)
+            self._ducked = {key: volume * self.level
+                            for key, (_, volume) in self.originals.items()}
+            ramps.start([(session, self._ducked[key])
+                         for key, (session, _) in self.originals.items()], self.attack)
+        elif self.active and not loud and now - self._loud_time >= self.hold:
+            self.active = False
+            originals, self.originals = self.originals, {}
+            ramps.start([(session, volume) for key, (session, volume) in originals.items()
+                         if not self._changed_by_user(key, session, ramps)], self.release)
+        # Trigger application may be closed: look it up again
+        if triggers and not loud and now - self._loud_time >= self.RETRY_INTERVAL \
+                and now - self._lookup_time >= self.RETRY_INTERVAL:
+            self._triggers = []
+
+
+    def _changed_by_user(self, key, session, ramps):
+        """ Returns True if ducked session has other volume than it was ducked to """
+        if ramps.is_ramping(session):
+            return False
+        return abs(ramps.writer.get_volume(session) - self._ducked[key]) > self.TOLERANCE
+
+
+class VolumeRamps: # pylint: disable=too-many-instance-attributes # Aknowledged
+    """
+    Schedules volume ramps. New ramp of session replaces its running ramp,
+    replaced and cancelled ramps count as finished for on_done.
+    """
+    def __init__(self, volume_writer, rate_hz=60, ducking=None):
+        """
+        Parameters:
+            volume_writer (VolumeWriter): Writer performing batched changes.
+            rate_hz (int): Ticks per second while ramps are running.
+            ducking (dict): Settings "Ducking", None to disable ducking.
+        """
+        self.writer = volume_writer
+        self.interval = 1.0 / rate_hz
+        self.ducker = Ducker(self.backend, ducking) if ducking else None
+        self.ticks = 0
+        self.clock = time.monotonic
+        self.threaded = True
+
+        self._condition = threading.Condition()
+        self._ramps = {}
+        self._running = False
+        self._thread = None
+        self._next_poll = float("-inf")
+        self._next_tick = None
+
+    @property
+    def backend(self):
+        """
+        Audio backend of volume writer
+        """
+        return self.writer.backend
+
+    @classmethod
+    def from_settings(cls, settings, volume_writer):
+        """
+        Returns scheduler for settings "VolumeWriteRate" and "Ducking",
+        ducking starts right away
+        """
+        ramps = cls(volume_writer, settings.volume_write_rate, settings.ducking)
+        if ramps.ducker is not None:
+            ramps.wake()
+        return ramps
+
+    def start(self, targets, duration, on_done=None):
+        """
+        Starts ramps from current volumes.
+
+        Parameters:
+            targets (list): (session, target volume) tuples.
+            duration (float): Ramp length in seconds, 0 sets volume on next tick.
+            on_done (callable): Called when all these ramps are finished or replaced,
+                                from scheduler thread or thread replacing them.
+        """
+        targets = [(session, max(0.0, min(1.0, volume))) for session, volume in targets]
+        if not targets:
+            if on_done is not None:
+                on_done()
+            return
+        # Current volumes are read before lock, first read may call audio backend
+        starts = [self.writer.get_volume(session) for session, _ in targets]
+        done = _DoneCounter(len(targets), on_done) if on_done is not None else None
+        now = self.clock()
+        with self._condition:
+            replaced = []
+            for (session, target), start in zip(targets, starts):
+                key = self.backend.session_key(session)
+                replaced.append(self._ramps.get(key))
+                self._ramps[key] = _Ramp(session, start, target, now, duration, done)
+            self._start_thread()
+            self._condition.notify()
+        self._finish(replaced)
+
+    def ramp(self, sessions, volume, duration_ms, on_done=None):
+        """
+        Changes volume of sessions to given volume over duration_ms milliseconds
+        """
+        self.start([(session, volume) for session in sessions], duration_ms / 1000, on_done)
+
+    def fade_out(self, sessions, duration_ms, on_done=None):
+        """
+        Fades sessions to silence
+        """
+        self.ramp(sessions, 0.0, duration_ms, on_done)
+
+    def fade_in(self, sessions, duration_ms, volume=1.0, on_done=None):
+        """
+        Fades sessions from silence to given volume
+        """
+        self.writer.set_volumes(sessions, 0.0)
+        self.ramp(sessions, volume, duration_ms, on_done)
+
+    def crossfade(self, out_sessions, in_sessions, duration_ms, volume=1.0):
+        """
+        Fades out one application and fades in other one at the same time.
+        Sessions fading in start from their current volume.
+        """
+        self.start([(session, 0.0) for session in out_sessions]
+                   + [(session, volume) for session in in_sessions], duration_ms / 1000)
+
+    def cancel(self, sessions):
+        """
+        Stops ramps of sessions at their current volume
+        """
+        with self._condition:
+            cancelled = [self._ramps.pop(self.backend.session_key(session), None)
+                         for session in sessions]
+        self._finish(cancelled)
+
+    @staticmethod
+    def _finish(ramps):
+        """ Counts ramps (None entries skipped) as finished, lock must not be held """
+        for ramp in ramps:
+            if ramp is not None and ramp.on_done is not None:
+                ramp.on_done()
+
+    def is_ramping(self, session):
+        """
+        Returns True if session has running ramp
+        """
+        return self.backend.session_key(session) in self._ramps
+
+    def target(self, session):
+        """
+        Returns volume running ramp of session ends at, None if session has no ramp
+        """
+        with self._condition:
+            ramp = self._ramps.get(self.backend.session_key(session))
+            return None if ramp is None else ramp.target
+
+    def wake(self):
+        """
+        Starts scheduler thread (needed for ducking without ramps)
+        """
+        with self._condition:
+            self._start_thread()
+            self._condition.notify()
+
+    def _start_thread(self):
+        """ Starts scheduler thread on first use, lock must be held """
+        if self._thread is None and self.threaded:
+            self._running = True
+            self._thread = threading.Thread(target=self._loop, name="VolumeRamps", daemon=True)
+            self._thread.start()
+
+    def pump(self):
+        """
+        Polls ducking and steps ramps due at current clock time,
+        used instead of scheduler thread when threaded is False (simulation)
+        """
+        now = self.clock()
+        if self._next_tick is not None and now < self._next_tick:
+            return
+        self._step(now)
+        self._next_tick = now + self.interval if self._ramps else None
+
+    def _step(self, now):
+        """ Polls ducking trigger when it is due and steps every ramp """
+        if self.ducker is not None and now >= self._next_poll:
+            self._next_poll = now + Ducker.POLL_INTERVAL
+            with Tracer.span("ducking poll", "audio"):
+                self.ducker.poll(now, self)
+        self._tick(now)
+
+    def _loop(self):
+        """ Scheduler thread loop """
+        self.backend.init_thread()
+        while True:
+            with self._condition:
+                # Without ramps thread wakes only to check ducking trigger
+                while self._running and not self._ramps:
+                    if self.ducker is None:
+                        self._condition.wait()
+                        continue
+                    pause = self._next_poll - self.clock()
+                    if pause <= 0:
+                        break
+                    self._condition.wait(pause)
+                if not self._running:
+                    return
+
+            now = self.clock()
+            self._step(now)
+
+            with self._condition:
+                if self._ramps and self._running:
+                    self._condition.wait(max(0.0, now + self.interval - self.clock()))
+
+    def _tick(self, now):
+        """ Steps every ramp and sends all volumes to writer at once """
+        finished = []
+        changes = []
+        with self._condition:
+            for key, ramp in list(self._ramps.items()):
+                volume, done = ramp.volume(now)
+                changes.append((ramp.session, volume, None))
+                if done:
+                    del self._ramps[key]
+                    finished.append(ramp)
+        if not changes:
+            return
+        with Tracer.span("ramp tick", "audio", sessions=len(changes)):
+            self.writer.apply(changes)
+        self.ticks += 1
+        self._finish(finished)
+
+    def stop(self):
+        """
+        Stops scheduler thread, running ramps stay where they are
+        """
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+            self._ramps.clear()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+class _DoneCounter: # pylint: disable=too-few-public-methods # Reason: Callable counter
+    """ Calls callback when all ramps of one start are finished """
+    def __init__(self, count, callback):
+        self.count = count
+        self.callback = callback
+
+    def __call__(self):
+        self.count -= 1
+        if self.count == 0:
+            self.callback()
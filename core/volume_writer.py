@@ -0,0 +1,370 @@
+"""
+Volume writer applies volume changes in background thread.
+Only the latest requested volume of every session is written, at bounded rate.
+Simulation runs it without thread on virtual time: writes are performed by pump().
+"""
+import threading
+import time
+
+from core.tracer import Tracer
+
+
+class VolumeWriter: # pylint: disable=too-many-instance-attributes # Aknowledged
+    """
+    Keeps shadow volume of every session and writes latest target to audio backend.
+    UI thread only reads and changes shadow values, it never waits for audio backend.
+    """
+    def __init__(self, backend, max_rate_hz=60, settle_time=0.2, refresh_interval=1.0):
+        """
+        Parameters:
+            backend (AudioBackend): Audio backend to write volume to.
+            max_rate_hz (int): Maximum number of writes per second for one session.
+            settle_time (float): Seconds after last write before real volume is read back.
+            refresh_interval (float): Seconds after that shadow volume is read again.
+        """
+        self.backend = backend
+        self.write_interval = 1.0 / max_rate_hz
+        self.settle_time = settle_time
+        self.refresh_interval = refresh_interval
+        self.clock = time.monotonic
+        self.threaded = True
+
+        self._condition = threading.Condition()
+        self._sessions = {}      # key: session
+        self._shadow = {}        # key: volume shown to user
+        self._read_time = {}     # key: time shadow was confirmed by backend
+        self._targets = {}       # key: volume waiting to be written
+        self._mutes = {}         # key: mute state waiting to be written
+        self._written = {}       # key: time of last write, waiting for reconciliation
+        self._refresh = set()    # keys waiting to be read
+        self._listeners = []
+        self._failure_listeners = []
+        self._balance = {}       # group keys: volume ratios to loudest session of silent group
+        self._running = False
+        self._writing = False
+        self._thread = None
+        self._last_write = float("-inf")
+
+    def _start(self):
+        """ Starts writer thread on first use """
+        if self._thread is None and self.threaded:
+            self._running = True
+            self._thread = threading.Thread(target=self._write_loop, name="VolumeWriter",
+                                            daemon=True)
+            self._thread.start()
+
+    def add_listener(self, listener):
+        """
+        Adds listener of volume and mute changes: requested ones and ones read back
+        from audio backend (changed by other applications).
+
+        Parameters:
+            listener (callable): Called as listener(session, volume, mute) from thread that
+                                 made the change, volume or mute is None if not changed.
+        """
+        self._listeners.append(listener)
+
+    def add_failure_listener(self, listener):
+        """
+        Adds listener of failed audio backend calls (session closed, application restarted).
+
+        Parameters:
+            listener (callable): Called as listener(session) from writer thread.
+        """
+        self._failure_listeners.append(listener)
+
+    def _notify_failure(self, session):
+        """ Calls failure listeners, lock must not be held """
+        for listener in self._failure_listeners:
+            listener(session)
+
+    def _notify(self, changes):
+        """ Calls listeners with (session, volume, mute) changes, lock must not be held """
+        for listener in self._listeners:
+            for session, volume, mute in changes:
+                listener(session, volume, mute)
+
+    def get_volume(self, session):
+        """
+        Returns shadow volume of session.
+        Reads backend only the first time, later values are refreshed in background.
+        """
+        key = self.backend.session_key(session)
+        with self._condition:
+            volume = self._shadow.get(key)
+            if volume is not None:
+                stale = self.clock() - self._read_time.get(key, 0) > self.refresh_interval
+                if stale and key not in self._targets and key not in self._written:
+                    self._sessions[key] = session
+                    self._refresh.add(key)
+                    self._start()
+                    self._condition.notify()
+                return volume
+
+        with Tracer.span("get_volume", "audio"):
+            volume = self.backend.get_volume(session)
+        with self._condition:
+            self._sessions[key] = session
+            self._shadow.setdefault(key, volume)
+            self._read_time[key] = self.clock()
+            return self._shadow[key]
+
+    def get_mute(self, session):
+        """
+        Returns requested mute state of session if it is not written yet, real state otherwise
+        """
+        with self._condition:
+            mute = self._mutes.get(self.backend.session_key(session))
+        if mute is not None:
+            return mute
+        with Tracer.span("get_mute", "audio"):
+            return bool(self.backend.get_mute(session))
+
+    def set_volume(self, session, volume):
+        """
+        Requests session volume. Returns new shadow volume right away.
+
+        Parameters:
+            session (AudioSession): Session to change.
+            volume (float): New volume, clamped to 0..1.
+        """
+        volume = max(0.0, min(1.0, volume))
+        key = self.backend.session_key(session)
+        with self._condition:
+            self._sessions[key] = session
+            self._shadow[key] = volume
+            self._targets[key] = volume
+            self._refresh.discard(key)
+            self._start()
+            self._condition.notify()
+        if self._listeners:
+            self._notify([(session, volume, None)])
+        return volume
+
+    def set_volumes(self, sessions, volume):
+        """
+        Requests same volume for several sessions at once (one wakeup, one write pass).
+        Returns new shadow volume right away.
+
+        Parameters:
+            sessions (list): Sessions to change.
+            volume (float): New volume, clamped to 0..1.
+        """
+        volume = max(0.0, min(1.0, volume))
+        with self._condition:
+            for session in sessions:
+                key = self.backend.session_key(session)
+                self._sessions[key] = session
+                self._shadow[key] = volume
+                self._targets[key] = volume
+                self._refresh.discard(key)
+            self._start()
+            self._condition.notify()
+        if self._listeners:
+            self._notify([(session, volume, None) for session in sessions])
+        return volume
+
+    def apply(self, changes):
+        """
+        Requests volume and mute changes of many sessions at once,
+        all of them are written in one pass of writer thread.
+
+        Parameters:
+            changes (iterable): (session, volume, mute) tuples, None volume or mute is kept.
+        """
+        applied = []
+        with self._condition:
+            for session, volume, mute in changes:
+                key = self.backend.session_key(session)
+                self._sessions[key] = session
+                if volume is not None:
+                    volume = max(0.0, min(1.0, volume))
+                    self._shadow[key] = volume
+                    self._targets[key] = volume
+                    self._refresh.discard(key)
+                if mute is not None:
+                    mute = bool(mute)
+                    self._mutes[key] = mute
+                applied.append((session, volume, mute))
+            self._start()
+            self._condition.notify()
+        if self._listeners:
+            self._notify(applied)
+
+    def scale_volumes(self, sessions, volume):
+        """
+        Sets loudest session of group to volume, other sessions keep their ratio to it.
+        Ratios of group turned down to silence are remembered and used when it is turned up.
+        Returns new group volume right away.
+
+        Parameters:
+            sessions (list): Sessions of group.
+            volume (float): New volume of loudest session, clamped to 0..1.
+        """
+        volume = max(0.0, min(1.0, volume))
+        current = [self.get_volume(session) for session in sessions]
+        loudest = max(current, default=0.0)
+        group = tuple(self.backend.session_key(session) for session in sessions)
+        with self._condition:
+            if loudest > 0:
+                ratios = [old / loudest for old in current]
+            else:
+                ratios = self._balance.get(group, [1.0] * len(sessions))
+            if volume > 0:
+                self._balance.pop(group, None)
+            else:
+                self._balance[group] = ratios
+        self.apply((session, ratio * volume, None) for session, ratio in zip(sessions, ratios))
+        return volume
+
+    def get_group_volume(self, sessions):
+        """
+        Returns volume of session group: the loudest session volume
+        """
+        return max((self.get_volume(session) for session in sessions), default=0.0)
+
+    def adjust_volume(self, session, delta):
+        """
+        Shifts session volume by delta. Returns new shadow volume right away.
+        """
+        return self.set_volume(session, self.get_volume(session) + delta)
+
+    def flush(self, timeout=None):
+        """
+        Waits until every requested volume is written.
+        Without writer thread they are written at once.
+        """
+        if not self.threaded:
+            while self._targets or self._mutes:
+                self._write_pass()
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._targets or self._mutes or self._writing:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def _next_wakeup(self, now):
+        """ Returns seconds to wait for next write or reconciliation, None to wait for request """
+        if self._targets or self._mutes or self._refresh:
+            return 0
+        if self._written:
+            return max(0, min(self._written.values()) + self.settle_time - now)
+        return None
+
+    def _write(self, sessions, targets, mutes):
+        """ Performs backend writes of one batch, failed sessions are reported to listeners """
+        failed = []
+        with Tracer.span("write volumes", "audio", sessions=len(targets) + len(mutes)):
+            for key, volume in targets.items():
+                try:
+                    self.backend.set_volume(sessions[key], volume)
+                except Exception: # pylint: disable=broad-exception-caught # Reason: Session may be closed, volume is reconciled later
+                    failed.append(sessions[key])
+            for key, mute in mutes.items():
+                try:
+                    self.backend.set_mute(sessions[key], mute)
+                except Exception: # pylint: disable=broad-exception-caught # Reason: Session may be closed
+                    failed.append(sessions[key])
+        for session in failed:
+            self._notify_failure(session)
+
+    def _write_loop(self):
+        """ Writer thread loop """
+        self.backend.init_thread()
+        while self._running:
+            with self._condition:
+                timeout = self._next_wakeup(self.clock())
+                while timeout != 0 and self._running:
+                    self._condition.wait(timeout)
+                    timeout = self._next_wakeup(self.clock())
+
+                # Latest-wins: targets requested during pause replace older ones
+                pause = self._last_write + self.write_interval - self.clock()
+                while pause > 0 and self._targets and self._running:
+                    self._condition.wait(pause)
+                    pause = self._last_write + self.write_interval - self.clock()
+            self._write_pass()
+
+    def pump(self):
+        """
+        Performs writes and reconciliation due at current clock time,
+        used instead of writer thread when threaded is False (simulation)
+        """
+        now = self.clock()
+        with self._condition:
+            if self._next_wakeup(now) != 0:
+                return
+            if self._targets and now < self._last_write + self.write_interval:
+                return
+        self._write_pass()
+
+    def _write_pass(self):
+        """ Writes requested changes, reads back settled and stale volumes """
+        with self._condition:
+            targets, self._targets = self._targets, {}
+            mutes, self._mutes = self._mutes, {}
+            refresh, self._refresh = self._refresh, set()
+            now = self.clock()
+            settled = [key for key, written in self._written.items()
+                       if now - written >= self.settle_time and key not in targets]
+            sessions = dict(self._sessions)
+            self._writing = bool(targets or mutes)
+
+        self._write(sessions, targets, mutes)
+        if targets:
+            self._last_write = self.clock()
+
+        read_back = self._read_back(sessions, set(settled) | refresh)
+
+        changed = []
+        with self._condition:
+            self._writing = False
+            self._condition.notify_all()
+            for key in targets:
+                self._written[key] = self._last_write
+            for key in settled:
+                self._written.pop(key, None)
+            for key, volume in read_back.items():
+                # Request that came during reading is newer than real value
+                if key not in self._targets and key not in self._written:
+                    if self._shadow.get(key) != volume:
+                        changed.append((sessions[key], volume, None))
+                    self._shadow[key] = volume
+                    self._read_time[key] = self.clock()
+        if changed and self._listeners:
+            self._notify(changed)
+
+    def _read_back(self, sessions, keys):
+        """ Reads real volume of sessions, closed sessions are forgotten """
+        volumes = {}
+        if not keys:
+            return volumes
+        with Tracer.span("read back volumes", "audio", sessions=len(keys)):
+            for key in keys:
+                try:
+                    volumes[key] = self.backend.get_volume(sessions[key])
+                except Exception: # pylint: disable=broad-exception-caught # Reason: Session may be closed
+                    with self._condition:
+                        self._forget(key)
+                    self._notify_failure(sessions[key])
+        return volumes
+
+    def _forget(self, key):
+        """ Removes all session data """
+        for storage in (self._sessions, self._shadow, self._read_time, self._written):
+            storage.pop(key, None)
+
+    def stop(self):
+        """
+        Stops writer thread
+        """
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -1,32 +1,130 @@
 """
-Main.py of Remixer. 
+Main.py of Remixer.
 """
 
+import argparse
+import atexit
 import sys
+import traceback
 
-from PySide6.QtWidgets import QApplication
-from core.settings import SettingsManager
+from core.startup_profiler import StartupProfiler # pylint: disable=ungrouped-imports
+from PySide6.QtCore import QTimer   # pylint: disable=wrong-import-order # Reason: StartupProfiler goes first to count import time
+from PySide6.QtWidgets import QApplication   # pylint: disable=wrong-import-order # Reason: Same as above
+from core.settings import SettingsManager # pylint: disable=ungrouped-imports
 from core.drawing_window import DrawingWindow
-from modules.input_controllers import init_keyboard_controls, init_serial_controls
+from core.input_recorder import InputRecorder
+from core.thread_profiler import ThreadProfiler
+from core.tracer import Tracer
+from core.ui_watchdog import UIWatchdog
+from modules.input_controllers import init_keyboard_controls, init_serial_controls, \
+                                     init_control_server
+
+
+def parse_args(argv):
+    """ Parses Remixer command line arguments, unknown ones are left to Qt """
+    parser = argparse.ArgumentParser(prog="Remixer")
+    parser.add_argument(
+                        "--startup-benchmark",
+                        action="store_true",
+                        help="open menu once, print startup timings as JSON and exit"
+    )
+    parser.add_argument(
+                        "--record-input",
+                        metavar="FILE",
+                        help="write every input event to FILE (see benchmarks/replay_input.py)"
+    )
+    parser.add_argument(
+                        "--trace",
+                        metavar="FILE",
+                        help="write timeline in Chrome trace-event format to FILE on exit"
+    )
+    parser.add_argument(
+                        "--profile",
+                        metavar="DIR",
+                        help="profile every thread, write results per thread to DIR on exit"
+    )
+    args, _ = parser.parse_known_args(argv[1:])
+    return args
+
+
+def init_controls(settings_manager, drawing_window):
+    """
+    Installs keyboard hooks, opens serial devices and starts control server.
+    Hooks and devices only push events to input queue, UI thread performs them.
+    """
+    queue = drawing_window.input_queue
+    kinds = ("ccw", "cw", "press", "double", "hold")
+
+    def device_callbacks(config):
+        callbacks = {kind: queue.callback(kind, config["Port"], config.get("App"))
+                     for kind in kinds}
+        callbacks["slider"] = lambda target: queue.slider_callback(config["Port"], target)
+        return callbacks
+
+    init_keyboard_controls({kind: queue.callback(kind, "keyboard") for kind in kinds})
+    reader = init_serial_controls(settings_manager, device_callbacks)
+    if reader is not None:
+        atexit.register(reader.stop)
+    drawing_window.control_server = init_control_server(settings_manager, drawing_window)
+
+
+def finish_startup_benchmark():
+    """ Prints startup timings and stops application """
+    print(StartupProfiler.report(), flush=True)
+    QApplication.quit()
+
+
+def fail_startup_benchmark(exc_type, exc, exc_traceback):
+    """
+    Exception hook of startup benchmark: error in Qt slot or event handler would only be printed
+    and expected marks would never come, so application exits with code 1 instead
+    """
+    traceback.print_exception(exc_type, exc, exc_traceback)
+    QApplication.exit(1)
 
 
 if __name__ == "__main__":
+    args_ = parse_args(sys.argv)
+    StartupProfiler.mark("imports")
+
+    if args_.profile:
+        # Started before QApplication, so every Remixer thread is profiled
+        profiler = ThreadProfiler()
+        profiler.start()
+        atexit.register(profiler.save, args_.profile)
+
+    if args_.trace:
+        Tracer.start()
+        atexit.register(Tracer.save, args_.trace)
+
     app_ = QApplication(sys.argv)
 
     settings = SettingsManager()
 
+    watchdog = UIWatchdog.from_settings(settings)
+    if watchdog is not None:
+        watchdog.install()
+        atexit.register(watchdog.stop)
+
     window = DrawingWindow(settings)
     window.show()
+    StartupProfiler.mark("window")
+
+    if args_.trace:
+        # Per-module call statistics complement menu module spans in trace
+        atexit.register(lambda: print(window.menu_manager.modules.report(), flush=True))
 
-    callbacks = {
-                "ccw": window.input.control_down,
-                "cw": window.input.control_up,
-                "press": window.input.control_click,
-                "double": window.input.control_double_click,
-                "hold": window.input.control_hold
-    }
+    if args_.record_input:
+        window.input_queue.recorder = InputRecorder(args_.record_input)
+        atexit.register(window.input_queue.recorder.close)
 
-    init_keyboard_controls(callbacks)
-    init_serial_controls(settings, callbacks)
+    # Everything not needed for the first frame runs once event loop is started
+    if args_.startup_benchmark:
+        sys.excepthook = fail_startup_benchmark
+        StartupProfiler.expect(("tray_icon", "first_menu_frame"), finish_startup_benchmark)
+        QTimer.singleShot(0, window.show_menu)
+    else:
+        QTimer.singleShot(0, lambda: init_controls(settings, window))
+        QTimer.singleShot(0, settings.icon_manager.warm_up)
 
     sys.exit(app_.exec())
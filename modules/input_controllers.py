@@ -1,39 +1,105 @@
 """
 Input Controller contains methods to initialize user controls
 """
-import keyboard
-from modules.serial_port import SerialDevice
-
-def init_serial_controls(settings, callbacks):
-    """ Serial Device Initializer """
-    if settings.serial_com == "" or settings.serial_baud == 0:
-        return
-
-    SerialDevice.set_com(
-                        settings.serial_com,
-                        SerialDevice.baud_from_int(settings.serial_baud)
-    )
-    SerialDevice.add_event(
+# pylint: disable=import-outside-toplevel # Reason: keyboard, serial and control server are imported on first use to keep startup fast
+
+def init_serial_controls(settings, make_callbacks):
+    """
+    Serial Devices Initializer.
+    Returns SerialReader servicing all devices, None if there are no devices.
+
+    Parameters:
+        settings (SettingsManager): Settings with "SerialDevices" list.
+        make_callbacks (callable): Takes device settings entry and returns callbacks
+                                   ("ccw", "cw", "press", "double", "hold")
+                                   and "slider" factory taking slider target.
+    """
+    if not settings.serial_devices:
+        return None
+
+    from modules.serial_port import SerialDevice, SerialReader
+
+    reader = SerialReader()
+    for config in settings.serial_devices:
+        device = SerialDevice(
+                            config["Port"],
+                            SerialDevice.baud_from_int(config["Baud"]),
+                            config.get("Protocol", "line")
+        )
+        callbacks = make_callbacks(config)
+        if config.get("Protocol") == "slider":
+            add_sliders(device, config, callbacks["slider"])
+            reader.add_device(device)
+            continue
+
+        device.add_event(
                         SerialDevice.RotaryEncoder.EncoderEvents.ANTICLOCKWISE,
                         callbacks["ccw"]
-    )
-    SerialDevice.add_event(
+        )
+        device.add_event(
                         SerialDevice.RotaryEncoder.EncoderEvents.CLOCKWISE,
                         callbacks["cw"]
-    )
-    SerialDevice.add_event(
+        )
+        device.add_event(
                         SerialDevice.RotaryEncoder.ButtonEvents.CLICK,
                         callbacks["press"]
-    )
-    SerialDevice.add_event(SerialDevice.RotaryEncoder.ButtonEvents.DOUBLE_CLICK,
+        )
+        device.add_event(SerialDevice.RotaryEncoder.ButtonEvents.DOUBLE_CLICK,
                         callbacks["double"]
-    )
-    SerialDevice.add_event(SerialDevice.RotaryEncoder.ButtonEvents.LONG_CLICK,
+        )
+        device.add_event(SerialDevice.RotaryEncoder.ButtonEvents.LONG_CLICK,
                         callbacks["hold"]
-    )
+        )
+        reader.add_device(device)
+    return reader
+
+def add_sliders(device, config, make_callback):
+    """
+    Adds sliders of device with slider protocol.
+
+    Parameters:
+        device (SerialDevice): Device with slider protocol.
+        config (dict): Device settings entry, "Sliders" lists targets of sliders in line order:
+                       executable name or alias, list of them, or "master".
+                       Optional "MaxValue", "DeadBand", "Smoothing", "Threshold", "Invert".
+        make_callback (callable): Takes slider target and returns callback.
+    """
+    options = {
+        "max_value": config.get("MaxValue", 1023),
+        "dead_band": config.get("DeadBand", 0.01),
+        "smoothing": config.get("Smoothing", 0.5),
+        "threshold": config.get("Threshold", 0.01),
+        "invert": config.get("Invert", False)
+    }
+    for target in config.get("Sliders", []):
+        if isinstance(target, list):
+            target = tuple(target)
+        device.add_slider(make_callback(target), **options)
+
+def init_control_server(settings, window):
+    """
+    Local control server initializer.
+    Returns listening ControlServer, None if it is disabled or can not listen.
+
+    Parameters:
+        settings (SettingsManager): Settings with "ControlServer" name.
+        window (DrawingWindow): Window performing commands.
+    """
+    if not settings.control_server:
+        return None
+
+    from core.control_server import ControlServer
+
+    server = ControlServer(window, settings.control_server)
+    if not server.listen():
+        server.deleteLater()
+        return None
+    return server
 
 def init_keyboard_controls(callbacks):
     """ Keyboard hotkeys initializer"""
+    import keyboard
+
     keyboard.add_hotkey(-175, callbacks["cw"], suppress=True)
     keyboard.add_hotkey(-174, callbacks["ccw"], suppress=True)
     keyboard.add_hotkey(-173, callbacks["press"], suppress=True)
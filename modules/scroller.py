@@ -31,11 +31,88 @@ class INPUT(ctypes.Structure): # pylint: disable=too-few-public-methods # Reason
     _anonymous_ = ("_input",)
     _fields_ = [("type", ctypes.c_ulong), ("_input", _INPUT)]
 
-SendInput = ctypes.windll.user32.SendInput
+class WheelSink: # pylint: disable=too-few-public-methods # Aknowledged
+    """
+    Receives wheel events produced by scroller.
+    """
+    def send(self, events):
+        """
+        Sends wheel events.
+
+        Parameters:
+            events (list): (axis, wheel_delta) tuples, axis is "vertical" or "horizontal".
+        """
+        raise NotImplementedError
+
+
+class SendInputSink(WheelSink): # pylint: disable=too-few-public-methods # Aknowledged
+    """
+    Sends wheel events to Windows, all events of one tick in one SendInput call
+    """
+    FLAGS = {"vertical": MOUSEEVENTF_WHEEL, "horizontal": MOUSEEVENTF_HWHEEL}
+
+    def __init__(self):
+        self._send_input = None
+
+    def send(self, events):
+        if self._send_input is None:
+            self._send_input = ctypes.windll.user32.SendInput
+
+        inputs = (INPUT * len(events))()
+        for inp, (axis, wheel_delta) in zip(inputs, events):
+            # pylint: disable=attribute-defined-outside-init
+            inp.type = INPUT_MOUSE
+            inp.mi = MOUSEINPUT(
+                dx=0,
+                dy=0,
+                mouseData=wheel_delta,
+                dwFlags=self.FLAGS[axis],
+                time=0,
+                dwExtraInfo=None
+            )
+            # pylint: enable=attribute-defined-outside-init
+        self._send_input(len(events), inputs, ctypes.sizeof(INPUT))
+
+
+class RecordingSink(WheelSink):
+    """
+    Remembers wheel events instead of sending them, used for tests and benchmarks
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.events = []     # (time.perf_counter(), axis, wheel_delta)
+        self.calls = 0
+
+    def send(self, events):
+        now = time.perf_counter()
+        with self._lock:
+            self.calls += 1
+            self.events.extend((now, axis, wheel_delta) for axis, wheel_delta in events)
+
+    def total(self, axis):
+        """
+        Returns sum of sent wheel deltas on axis
+        """
+        with self._lock:
+            return sum(delta for _, event_axis, delta in self.events if event_axis == axis)
+
 
 class AdaptiveTouchScroller: # pylint: disable=too-many-instance-attributes # Aknowledged
-    """ Scroller performs commands to smooth mouse scroll """
-    def __init__(self, settings):
+    """
+    Scroller performs commands to smooth mouse scroll.
+    Scroll thread sleeps until there is something to scroll.
+    """
+    DEFAULT_SETTINGS = {
+        "step_pixels": 300,
+        "tick_rate_hz": 165,
+        "base_decay_rate": 0.5,
+        "speed_min": 1.0,
+        "speed_max": 50.0,
+        "fps_min": 7.5,
+        "fps_max": 50.0
+    }
+
+    def __init__(self, settings, sink=None):
         self.step_pixels = settings["step_pixels"]
         self.tick_interval = 1.0 / settings["tick_rate_hz"]
         self.base_decay_rate = settings["base_decay_rate"]
@@ -46,7 +123,10 @@ class AdaptiveTouchScroller: # pylint: disable=too-many-instance-attributes # Ak
         self.fps_min = settings["fps_min"]
         self.fps_max = settings["fps_max"]
 
-        self._lock = threading.Lock()
+        self.sink = sink if sink is not None else SendInputSink()
+        self.ticks = 0
+
+        self._lock = threading.Condition()
         self._accumulated_delta = 0.0            # vertical scroll
         self._accumulated_delta_x = 0.0          # horizontal scroll
         self._running = True
@@ -54,7 +134,7 @@ class AdaptiveTouchScroller: # pylint: disable=too-many-instance-attributes # Ak
         self.last_event_time = None
         self._speed_multiplier = settings["speed_min"]
 
-        self._thread = threading.Thread(target=self._scroll_loop, daemon=True)
+        self._thread = threading.Thread(target=self._scroll_loop, name="Scroller", daemon=True)
         self._thread.start()
 
     def scroll_pixels(self, delta_pixels):
@@ -74,6 +154,7 @@ class AdaptiveTouchScroller: # pylint: disable=too-many-instance-attributes # Ak
             self.last_event_time = now
 
             self._accumulated_delta -= delta_pixels * self._speed_multiplier
+            self._lock.notify()
 
     def scroll_pixels_horizontal(self, delta_pixels):
         """
@@ -92,6 +173,7 @@ class AdaptiveTouchScroller: # pylint: disable=too-many-instance-attributes # Ak
             self.last_event_time = now
 
             self._accumulated_delta_x += delta_pixels * self._speed_multiplier
+            self._lock.notify()
 
     def _update_speed_multiplier(self, current_fps):
         """
@@ -109,11 +191,20 @@ class AdaptiveTouchScroller: # pylint: disable=too-many-instance-attributes # Ak
 
     def _scroll_loop(self):
         """
-        Scroll loop to perform scroll smoothly
+        Scroll loop to perform scroll smoothly.
+        Ticks only while accumulated delta is not zero.
         """
-        while self._running:
+        while True:
+            with self._lock:
+                while self._running and not self._accumulated_delta \
+                        and not self._accumulated_delta_x:
+                    self._lock.wait()
+                if not self._running:
+                    return
+
             time.sleep(self.tick_interval)
             with self._lock:
+                self.ticks += 1
                 delta = self._accumulated_delta
                 delta_x = self._accumulated_delta_x
 
@@ -127,54 +218,24 @@ class AdaptiveTouchScroller: # pylint: disable=too-many-instance-attributes # Ak
                 else:
                     self._accumulated_delta_x *= self.base_decay_rate
 
+            events = []
             wheel_delta = int((delta / self.step_pixels) * WHEEL_DELTA)
             wheel_delta_x = int((delta_x / self.step_pixels) * WHEEL_DELTA)
 
             if wheel_delta != 0:
-                self._send_wheel_event(wheel_delta)
+                events.append(("vertical", wheel_delta))
 
             if wheel_delta_x != 0:
-                self._send_hwheel_event(wheel_delta_x)
+                events.append(("horizontal", wheel_delta_x))
 
-    def _send_wheel_event(self, wheel_delta):
-        """
-        Sends scroll whell event ot system
-        """
-        inp = INPUT()
-        # pylint: disable=attribute-defined-outside-init
-        inp.type = INPUT_MOUSE
-        inp.mi = MOUSEINPUT(
-            dx=0,
-            dy=0,
-            mouseData=wheel_delta,
-            dwFlags=MOUSEEVENTF_WHEEL,
-            time=0,
-            dwExtraInfo=None
-        )
-        # pylint: enable=attribute-defined-outside-init
-        SendInput(1, ctypes.byref(inp), ctypes.sizeof(inp))
-
-    def _send_hwheel_event(self, wheel_delta):
-        """
-        Sends horizontal scroll whell event ot system
-        """
-        inp = INPUT()
-        # pylint: disable=attribute-defined-outside-init
-        inp.type = INPUT_MOUSE
-        inp.mi = MOUSEINPUT(
-            dx=0,
-            dy=0,
-            mouseData=wheel_delta,
-            dwFlags=MOUSEEVENTF_HWHEEL,
-            time=0,
-            dwExtraInfo=None
-        )
-        # pylint: enable=attribute-defined-outside-init
-        SendInput(1, ctypes.byref(inp), ctypes.sizeof(inp))
+            if events:
+                self.sink.send(events)
 
     def stop(self):
         """
         Stops scroller from working
         """
-        self._running = False
+        with self._lock:
+            self._running = False
+            self._lock.notify()
         self._thread.join()
@@ -1,29 +1,22 @@
 """
-Class for working with custom controls, sending commands over serial interface
+Classes for working with custom controls, sending commands over serial interface.
+Every SerialDevice has its own port and event bindings,
+one SerialReader thread services all of them.
 """
+import os
+import selectors
+import socket
 import threading
 from enum import Enum
-import time
 import serial
+from core.tracer import Tracer
+from modules.serial_protocol import LineProtocol, FramedProtocol, SliderProtocol, SliderChannel
 
 
 class SerialDevice:
     """
-    Custom Serial Device Worker
+    Custom Serial Device
     """
-    _instance = None
-    _lock = threading.Lock()
-
-    _port = ''
-    _baudrate = 0
-    _timeout = 1
-
-    _serial = None
-    _thread = None
-    _running = False
-
-    _events = {}
-
     class BaudRates(Enum):
         """
         Available baud rates
@@ -63,6 +56,16 @@ class SerialDevice:
             DOUBLE_CLICK = "Rotary Encoder:: button double press"
             LONG_CLICK = "Rotary Encoder:: button long press"
 
+    FRAME_CODES = {
+        RotaryEncoder.EncoderEvents.CLOCKWISE.value: 0x01,
+        RotaryEncoder.EncoderEvents.ANTICLOCKWISE.value: 0x02,
+        RotaryEncoder.ButtonEvents.PRESS.value: 0x10,
+        RotaryEncoder.ButtonEvents.RELEASE.value: 0x11,
+        RotaryEncoder.ButtonEvents.CLICK.value: 0x12,
+        RotaryEncoder.ButtonEvents.DOUBLE_CLICK.value: 0x13,
+        RotaryEncoder.ButtonEvents.LONG_CLICK.value: 0x14
+    }
+
     class BaudException(Exception):
         """
         Invalid baud rate Exception
@@ -73,6 +76,11 @@ class SerialDevice:
         Invalid COM port Exception
         """
 
+    class ProtocolException(Exception):
+        """
+        Unknown protocol Exception
+        """
+
     @classmethod
     def baud_from_int(cls, baud_int):
         """
@@ -83,85 +91,183 @@ class SerialDevice:
         except ValueError as e:
             raise SerialDevice.BaudException("Unsupported baud rate") from e
 
-    @classmethod
-    def set_com(cls, com_port, baud):
-        """Set SerialDevice COM port parameters"""
-        if not isinstance(baud, cls.BaudRates):
+    def __init__(self, port, baud, protocol="line"):
+        """
+        Parameters:
+            port (str): Port name.
+            baud (BaudRates): Baud rate.
+            protocol (str): "line" (ASCII lines), "framed" (compact binary frames)
+                            or "slider" (absolute slider values).
+        """
+        if port == '':
+            raise SerialDevice.COMException("COM is not valid")
+        if not isinstance(baud, self.BaudRates):
             raise SerialDevice.BaudException("Invalid baud")
-        cls._port = com_port
-        cls._baudrate = baud.value
+        if protocol == "line":
+            self._protocol = LineProtocol()
+        elif protocol == "framed":
+            self._protocol = FramedProtocol(self.FRAME_CODES)
+        elif protocol == "slider":
+            self._protocol = SliderProtocol()
+        else:
+            raise SerialDevice.ProtocolException(f"Unknown protocol: {protocol}")
 
-    @classmethod
-    def _initialize(cls):
-        """Port initialization and thread start"""
-        with cls._lock:
-            if cls._instance is not None:
-                return
-            cls._instance = cls()
-            try:
-                cls._serial = serial.Serial(
-                                            port=cls._port,
-                                            baudrate=cls._baudrate,
-                                            timeout=cls._timeout
-                )
-                cls._running = True
-                cls._thread = threading.Thread(target=cls._read_loop, daemon=True)
-                cls._thread.start()
-            except serial.SerialException:
-                cls._running = False
+        self.port = port
+        self.baudrate = baud.value
+        self._lock = threading.Lock()
+        self._events = {}
+        self._serial = None
 
-    @classmethod
-    def add_event(cls, event_enum, callback):
+    def add_event(self, event_enum, callback):
         """Add event to serial message"""
-        if cls._port == '':
-            raise SerialDevice.COMException("COM is not valid")
-
-        cls._initialize()
-
-        if isinstance(event_enum, cls.RotaryEncoder.EncoderEvents):
-            event_name = event_enum.value
-        elif isinstance(event_enum, cls.RotaryEncoder.ButtonEvents):
+        if isinstance(event_enum, (self.RotaryEncoder.EncoderEvents,
+                                   self.RotaryEncoder.ButtonEvents)):
             event_name = event_enum.value
         else:
             event_name = event_enum
 
-        with cls._lock:
-            if event_enum not in cls._events:
-                cls._events[event_name] = []
-            cls._events[event_name].append(callback)
+        with self._lock:
+            if event_name not in self._events:
+                self._events[event_name] = []
+            self._events[event_name].append(callback)
+            self._protocol.compile(self._events)
 
-    @classmethod
-    def _read_loop(cls):
-        """Main loop"""
-        while cls._running:
+    def add_slider(self, callback, **options):
+        """
+        Adds slider for next value of slider line.
+
+        Parameters:
+            callback (callable): Called with new slider value in range 0..1.
+            options: SliderChannel options (max_value, dead_band, smoothing, threshold, invert).
+        """
+        if not isinstance(self._protocol, SliderProtocol):
+            raise SerialDevice.ProtocolException("Sliders need slider protocol")
+        self._protocol.add_channel(SliderChannel(callback, **options))
+
+    def open(self, blocking):
+        """
+        Opens port.
+
+        Parameters:
+            blocking (bool): Reads wait for data (own thread) or return at once (selector).
+        """
+        self._serial = serial.Serial(
+                                    port=self.port,
+                                    baudrate=self.baudrate,
+                                    timeout=None if blocking else 0
+        )
+
+    def fileno(self):
+        """
+        Returns port file descriptor, None if port can not be used with selectors (Windows)
+        """
+        try:
+            return self._serial.fileno()
+        except (AttributeError, OSError):
+            return None
+
+    def read_available(self):
+        """
+        Reads everything buffered and performs events. Blocks in blocking mode until data arrives.
+        Returns False if there was nothing to read (closed port or cancelled read).
+        """
+        chunk = self._serial.read(1)
+        waiting = self._serial.in_waiting
+        if waiting:
+            chunk += self._serial.read(waiting)
+        if not chunk:
+            return False
+
+        with Tracer.span("serial read", "serial", port=self.port, bytes=len(chunk)):
+            for callback, argument in self._protocol.feed(chunk):
+                callback(argument)
+        return True
+
+    def cancel_read(self):
+        """Interrupts blocking read"""
+        if self._serial and self._serial.is_open:
+            self._serial.cancel_read()
+
+    def close(self):
+        """Closes port"""
+        if self._serial and self._serial.is_open:
+            self._serial.close()
+            print(f"Port {self.port} closed")
+
+
+class SerialReader:
+    """
+    Reads all serial devices in one thread with selectors.
+    Ports without file descriptor (Windows COM ports can not be selected) get own blocking thread.
+    """
+    def __init__(self):
+        self._selector = selectors.DefaultSelector()
+        self._wake_receiver, self._wake_sender = socket.socketpair()
+        self._wake_receiver.setblocking(False)
+        self._selector.register(self._wake_receiver, selectors.EVENT_READ, None)
+        self._devices = []
+        self._threads = []
+        self._running = True
+        self._thread = None
+
+    def add_device(self, device):
+        """
+        Opens device port and starts reading it.
+        Returns False if port could not be opened.
+        """
+        try:
+            device.open(blocking=os.name == "nt")
+        except serial.SerialException as e:
+            print(f"Port {device.port} open error: {e}")
+            return False
+
+        self._devices.append(device)
+        if device.fileno() is None:
+            thread = threading.Thread(target=self._blocking_loop, args=(device,),
+                                      name=f"SerialReader {device.port}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+            return True
+
+        self._selector.register(device.fileno(), selectors.EVENT_READ, device)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._select_loop, name="SerialReader",
+                                            daemon=True)
+            self._thread.start()
+        return True
+
+    def _select_loop(self):
+        """Main loop, sleeps until any port has data"""
+        while self._running:
+            for key, _ in self._selector.select():
+                device = key.data
+                if device is None:
+                    self._wake_receiver.recv(64)
+                    continue
+                try:
+                    device.read_available()
+                except serial.SerialException as e:
+                    print(f"Port {device.port} read error: {e}")
+                    self._selector.unregister(key.fileobj)
+
+    def _blocking_loop(self, device):
+        """Fallback loop for one port that can not be selected"""
+        while self._running:
             try:
-                if cls._serial.in_waiting:
-                    line = cls._serial.readline().decode(errors='ignore').strip()
-                    if line:
-                        cls._dispatch_event(line)
-                else:
-                    time.sleep(0.01)
+                device.read_available()
             except serial.SerialException as e:
-                print(f"Port read error: {e}")
-                cls._running = False
-
-    @classmethod
-    def _dispatch_event(cls, line):
-        """Event handling"""
-        for event_name, callbacks in cls._events.items():
-            if str(line).startswith(event_name):
-                for callback in callbacks:
-                    callback()
+                print(f"Port {device.port} read error: {e}")
+                return
 
-    @classmethod
-    def stop(cls):
-        """Stop reading and close port"""
-        with cls._lock:
-            cls._running = False
-            if cls._thread and cls._thread.is_alive():
-                cls._thread.join()
-            if cls._serial and cls._serial.is_open:
-                cls._serial.close()
-            print("Port closed")
-            cls._instance = None
-            cls._events.clear()
+    def stop(self):
+        """Stop reading and close ports"""
+        self._running = False
+        self._wake_sender.send(b"\0")
+        for device in self._devices:
+            device.cancel_read()
+        for thread in self._threads + ([self._thread] if self._thread else []):
+            thread.join()
+        for device in self._devices:
+            device.close()
+        self._devices.clear()
+        self._selector.close()
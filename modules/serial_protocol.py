@@ -0,0 +1,284 @@
+"""
+Serial protocols turn bytes received from custom controls into events.
+
+Line protocol: ASCII lines, event is recognized by line prefix
+    ("Rotary Encoder:: direction: CLOCKWISE "), optional " t=<milliseconds>" suffix is device time.
+
+Framed protocol: 4-byte frames for fast knobs and low baud rates
+    [0xA5][event code][repeat count][checksum], checksum = (code + count) & 0xFF ^ 0xFF.
+    Repeat count lets device send several coalesced detents in one frame.
+
+Slider protocol: absolute slider values, one line per reading ("512|1023|0|77").
+
+Every protocol's feed(bytes) returns (callback, argument) pairs to call:
+argument is device time for events, new value (0..1) for sliders.
+"""
+
+
+class EventTable:
+    """
+    Registered events compiled into lookup by prefix length.
+    Matching a line takes one dictionary lookup per distinct prefix length.
+    """
+    def __init__(self, events=None):
+        self._lengths = []
+        self._table = {}
+        self.compile(events or {})
+
+    def compile(self, events):
+        """
+        Builds lookup from registered events.
+
+        Parameters:
+            events (dict): Event prefix: list of callbacks.
+        """
+        table = {}
+        for prefix, callbacks in events.items():
+            table.setdefault(len(prefix), {})[prefix] = tuple(callbacks)
+        self._table = table
+        self._lengths = sorted(table)
+
+    def match(self, line):
+        """
+        Returns callbacks of every event whose prefix line starts with
+        """
+        callbacks = ()
+        for length in self._lengths:
+            if length > len(line):
+                break
+            found = self._table[length].get(line[:length])
+            if found:
+                callbacks += found
+        return callbacks
+
+
+class LineProtocol:
+    """
+    ASCII line protocol
+    """
+    MAX_LINE_LENGTH = 4096
+
+    def __init__(self):
+        self.table = EventTable()
+        self._pending = b""
+
+    def compile(self, events):
+        """
+        Compiles registered events (prefix: callbacks)
+        """
+        self.table.compile(events)
+
+    @staticmethod
+    def parse_device_time(line):
+        """
+        Returns device time in nanoseconds from optional " t=<milliseconds>" line suffix.
+        Devices may send it to let Remixer measure real knob speed.
+        """
+        position = line.rfind(" t=")
+        if position < 0:
+            return None
+        try:
+            return int(float(line[position + 3:]) * 1_000_000)
+        except ValueError:
+            return None
+
+    def parse_line(self, line):
+        """
+        Returns (callback, device_time) pairs for one decoded line
+        """
+        callbacks = self.table.match(line)
+        if not callbacks:
+            return []
+        device_time = self.parse_device_time(line)
+        return [(callback, device_time) for callback in callbacks]
+
+    def feed(self, data):
+        """
+        Takes received bytes, returns (callback, device_time) pairs of complete lines.
+        Incomplete line is kept until the rest of it arrives.
+        """
+        *lines, self._pending = (self._pending + data).split(b"\n")
+        if len(self._pending) > self.MAX_LINE_LENGTH:
+            self._pending = b""
+
+        result = []
+        for raw_line in lines:
+            line = raw_line.decode(errors='ignore').strip()
+            if line:
+                result.extend(self.parse_line(line))
+        return result
+
+
+class FramedProtocol:
+    """
+    Compact binary protocol with one-byte event codes
+    """
+    START = 0xA5
+    FRAME_SIZE = 4
+
+    def __init__(self, codes):
+        """
+        Parameters:
+            codes (dict): Event prefix (same as for line protocol): one-byte event code.
+        """
+        self.codes = codes
+        self._callbacks = {}
+        self._pending = b""
+
+    def compile(self, events):
+        """
+        Compiles registered events (prefix: callbacks) into code lookup
+        """
+        self._callbacks = {self.codes[prefix]: tuple(callbacks)
+                           for prefix, callbacks in events.items() if prefix in self.codes}
+
+    @staticmethod
+    def checksum(code, count):
+        """
+        Returns frame checksum
+        """
+        return (code + count) & 0xFF ^ 0xFF
+
+    @classmethod
+    def encode(cls, code, count=1):
+        """
+        Returns frame bytes (used by device emulators and benchmarks)
+        """
+        return bytes((cls.START, code, count, cls.checksum(code, count)))
+
+    def feed(self, data):
+        """
+        Takes received bytes, returns (callback, device_time) pairs of complete frames.
+        Broken frames are skipped until next valid start byte.
+        """
+        buffer = self._pending + data
+        result = []
+        position = 0
+        end = len(buffer) - self.FRAME_SIZE
+        while position <= end:
+            if buffer[position] != self.START:
+                position += 1
+                continue
+            code, count, checksum = buffer[position + 1:position + self.FRAME_SIZE]
+            if checksum != self.checksum(code, count):
+                position += 1
+                continue
+            position += self.FRAME_SIZE
+            for callback in self._callbacks.get(code, ()):
+                result.extend([(callback, None)] * count)
+        self._pending = buffer[position:]
+        return result
+
+
+class SliderChannel: # pylint: disable=too-many-instance-attributes,too-few-public-methods # Aknowledged
+    """
+    One absolute slider. Filters noise and reports value only when it really changes.
+    """
+    def __init__(self, callback, max_value=1023, dead_band=0.01, smoothing=0.5, # pylint: disable=too-many-arguments,too-many-positional-arguments # Aknowledged
+                 threshold=0.01, invert=False):
+        """
+        Parameters:
+            callback (callable): Called with new value in range 0..1.
+            max_value (int): Raw value of slider upper position.
+            dead_band (float): Changes smaller than this (0..1) are noise and ignored.
+            smoothing (float): 0 - no smoothing, closer to 1 - slower and smoother value.
+            threshold (float): Minimal change of reported value.
+            invert (bool): Slider upper position is 0.
+        """
+        self.callback = callback
+        self.max_value = max_value
+        self.dead_band = dead_band
+        self.smoothing = smoothing
+        self.threshold = threshold
+        self.invert = invert
+        self.target = None
+        self.value = None
+        self.reported = None
+
+    def update(self, raw):
+        """
+        Takes raw slider value, returns value (0..1) to report or None if change is too small
+        """
+        value = min(1.0, max(0.0, raw / self.max_value))
+        if self.invert:
+            value = 1.0 - value
+
+        # Dead-band filters raw noise, smoothed value keeps moving to accepted position
+        if self.target is None or abs(value - self.target) >= self.dead_band:
+            self.target = value
+        # Ends are reachable despite smoothing and dead-band
+        if self.target <= self.dead_band:
+            self.target = 0.0
+        elif self.target >= 1 - self.dead_band:
+            self.target = 1.0
+
+        if self.value is None:
+            self.value = self.target
+        else:
+            self.value += (self.target - self.value) * (1 - self.smoothing)
+            if abs(self.target - self.value) < self.dead_band / 2:
+                self.value = self.target
+
+        # Small changes are not reported, settled position always is
+        settled = self.value == self.target
+        if self.reported is not None and self.value != self.reported \
+                and abs(self.value - self.reported) < self.threshold and not settled:
+            return None
+        if self.value == self.reported:
+            return None
+        self.reported = self.value
+        return round(self.value, 4)
+
+
+class SliderProtocol:
+    """
+    deej-style absolute slider protocol: lines of raw values separated by "|", e.g. "512|1023|0|77"
+    """
+    MAX_LINE_LENGTH = 4096
+
+    def __init__(self):
+        self.channels = []
+        self._pending = b""
+
+    def compile(self, events):
+        """
+        Sliders have no events, channels are added with add_channel
+        """
+
+    def add_channel(self, channel):
+        """
+        Adds SliderChannel for next value in line
+        """
+        self.channels.append(channel)
+
+    def parse_line(self, line):
+        """
+        Returns (callback, value) pairs of channels that changed
+        """
+        result = []
+        for channel, raw in zip(self.channels, line.split("|")):
+            try:
+                value = channel.update(int(raw))
+            except ValueError:
+                continue
+            if value is not None:
+                result.append((channel.callback, value))
+        return result
+
+    def feed(self, data):
+        """
+        Takes received bytes, returns (callback, value) pairs of changed channels.
+        Every line goes through channel filters, so held position converges to real value,
+        unchanged value is not reported again.
+        """
+        *lines, self._pending = (self._pending + data).split(b"\n")
+        if len(self._pending) > self.MAX_LINE_LENGTH:
+            self._pending = b""
+
+        result = []
+        for raw_line in lines:
+            raw_line = raw_line.strip()
+            if not raw_line:
+                continue
+            result.extend(self.parse_line(raw_line.decode(errors='ignore')))
+        return result
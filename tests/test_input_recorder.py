@@ -0,0 +1,56 @@
+"""
+Input recorder regression tests.
+
+Usage (from repository root):
+    python -m unittest discover tests
+"""
+import os
+import tempfile
+import unittest
+
+from core.input_queue import InputEvent
+from core.input_recorder import InputRecorder, InputReplayer
+
+
+class InputRecorderTest(unittest.TestCase):
+    """ Recorded events read back as they were pushed """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory() # pylint: disable=consider-using-with # Reason: Removed by cleanup
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "input.rmxi")
+
+    def test_round_trip_keeps_targets(self):
+        """ Knob bound to application replays to the same application """
+        events = [
+            InputEvent("cw", 1000, "COM3", 50, "Music.exe"),
+            InputEvent("press", 2000, "COM3", None, "Music.exe"),
+            InputEvent("ccw", 3000, "keyboard"),
+            InputEvent("double", 4000, "COM4", 70, "Game.exe"),
+            InputEvent("slider", 5000, "COM5", target=("Call.exe", "Chat.exe"), value=0.25),
+            InputEvent("slider", 6000, "COM5", target="master", value=1.0),
+        ]
+        recorder = InputRecorder(self.path)
+        for event in events:
+            recorder.record(event)
+        recorder.close()
+
+        replayed = InputReplayer(self.path).events
+        self.assertEqual(
+            [(event.kind, event.source, event.offset, event.device_time, event.target, event.value)
+             for event in replayed],
+            [(event.kind, event.source, event.timestamp - 1000, event.device_time, event.target,
+              event.value) for event in events]
+        )
+
+    def test_long_slider_target(self):
+        """ Slider target longer than 255 bytes is recorded """
+        target = tuple(f"Application{index}.exe" for index in range(40))
+        recorder = InputRecorder(self.path)
+        recorder.record(InputEvent("slider", 1000, "COM5", target=target, value=0.5))
+        recorder.close()
+        self.assertEqual(InputReplayer(self.path).events[0].target, target)
+
+
+if __name__ == "__main__":
+    unittest.main()
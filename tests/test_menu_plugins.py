@@ -0,0 +1,76 @@
+"""
+Menu module loader regression tests.
+
+Usage (from repository root):
+    python -m unittest discover tests
+"""
+import threading
+import unittest
+from collections import defaultdict
+
+from core.audio_backend import FakeAudioBackend
+from core.menu import Button, Menu, MenuModule
+from core.menu_manager import MenuManager
+from core.menu_plugins import LazyModuleItem
+from core.settings import SettingsManager
+
+
+class CountingModule(MenuModule):
+    """ Module with one submenu, counts its calls """
+    def __init__(self):
+        self.calls = 0
+        self.threads = set()
+
+    def is_enabled(self, _):
+        return True
+
+    def get_menu_item(self, menu_manager):
+        self.calls += 1
+        self.threads.add(threading.current_thread())
+        return Menu("Counting", "Settings", [Button("Back", "Back", menu_manager.menu_back)])
+
+
+class MenuModuleLoaderTest(unittest.TestCase):
+    """ Opening modules and repeated menu builds """
+
+    def setUp(self):
+        settings = SettingsManager()
+        settings.audio_backend = FakeAudioBackend()
+        settings.menu_modules = ["Counting"]
+        settings.menu_module_budget = 1000
+        self.module = CountingModule()
+        self.manager = MenuManager(settings, defaultdict(lambda: None))
+        self.manager.modules.register("Counting", lambda: self.module)
+        self.manager.reload_menu()
+        self.manager.menu_enter(self.manager.current_menu.index("Menu"))
+
+    def focus(self, condition):
+        """ Focuses first item of current menu matching condition, returns it """
+        index = next(i for i, item in enumerate(self.manager.current_menu.items)
+                     if condition(item))
+        self.manager.focused_index = index
+        return self.manager.current_menu.items[index]
+
+    def test_open_rebuilds_menu(self):
+        """ Opened module enters its submenu, parent menu has module item instead of lazy one """
+        original = self.manager.current_menu
+        self.focus(lambda item: isinstance(item, LazyModuleItem)).action()
+        self.assertEqual(self.manager.current_menu.name, "Counting")
+        parent, index = self.manager.menu_stack[-1]
+        self.assertIsNot(parent, original)
+        self.assertEqual(parent.name, original.name)
+        self.assertIs(parent.items[index], self.manager.current_menu)
+        self.assertFalse(any(isinstance(item, LazyModuleItem) for item in parent.items))
+        self.assertEqual(self.module.calls, 1)
+
+    def test_builds_reuse_module_thread(self):
+        """ Every menu build calls module in the same worker thread """
+        self.focus(lambda item: isinstance(item, LazyModuleItem)).action()
+        for _ in range(5):
+            self.manager.build_menu()
+        self.assertEqual(self.module.calls, 6)
+        self.assertEqual(len(self.module.threads), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
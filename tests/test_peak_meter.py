@@ -0,0 +1,42 @@
+"""
+Peak meter regression tests.
+
+Usage (from repository root):
+    python -m unittest discover tests
+"""
+import unittest
+
+from core.audio_backend import FakeAudioBackend
+from core.peak_meter import PeakMeterSampler
+
+
+class PeakMeterTest(unittest.TestCase):
+    """ Sampling without thread on test time """
+
+    def setUp(self):
+        self.now = 0.0
+        self.backend = FakeAudioBackend(["Music.exe", "Game.exe"])
+        self.sampler = PeakMeterSampler(self.backend, attack=1.0)
+        self.sampler.clock = lambda: self.now
+        self.sampler.threaded = False
+
+    def test_sample_of_previous_sessions_is_dropped(self):
+        """ Level read before watched sessions changed does not land in other session's slot """
+        music, game = self.backend.sessions
+
+        def get_peaks(sessions):
+            # Menu changes while audio backend is read
+            self.sampler.watch([game])
+            return [1.0] * len(sessions)
+        self.backend.get_peaks = get_peaks
+        self.sampler.watch([music])
+        self.sampler.pump()
+        self.assertEqual(self.sampler.level([game]), 0.0)
+
+        self.backend.get_peaks = lambda sessions: [0.5] * len(sessions)
+        self.sampler.pump()
+        self.assertAlmostEqual(self.sampler.level([game]), 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+Serial protocol regression tests.
+
+Usage (from repository root):
+    python -m unittest discover tests
+"""
+import unittest
+
+from modules.serial_protocol import EventTable, FramedProtocol, SliderChannel, SliderProtocol
+
+
+class SliderProtocolTest(unittest.TestCase):
+    """ Slider line parsing and filtering """
+
+    def feed_lines(self, protocol, lines):
+        """ Feeds lines one by one, returns reported values """
+        values = []
+        for line in lines:
+            values.extend(value for _, value in protocol.feed(line.encode() + b"\n"))
+        return values
+
+    def test_held_position_converges(self):
+        """ Slider held at one position reaches its real value despite repeated lines """
+        protocol = SliderProtocol()
+        protocol.add_channel(SliderChannel(lambda value: None, max_value=1023))
+        values = self.feed_lines(protocol, ["0"] + ["800"] * 51)
+        self.assertAlmostEqual(values[-1], 800 / 1023, delta=0.01)
+        self.assertEqual(len(values), len(set(values)), "unchanged value reported again")
+
+    def test_held_position_is_not_reported_again(self):
+        """ Lines repeating converged value report nothing """
+        protocol = SliderProtocol()
+        protocol.add_channel(SliderChannel(lambda value: None, max_value=1023))
+        self.feed_lines(protocol, ["512"] * 30)
+        self.assertEqual(self.feed_lines(protocol, ["512"] * 10), [])
+
+
+class EventTableTest(unittest.TestCase):
+    """ Event lookup by line prefix """
+
+    def setUp(self):
+        self.table = EventTable({
+            "Rotary Encoder:: direction: CLOCKWISE ": ["cw"],
+            "Rotary Encoder:: button single press": ["press", "log"],
+            "Rotary Encoder:: button": ["any button"]
+        })
+
+    def test_prefix_with_suffix_matches(self):
+        """ Device time suffix does not prevent match """
+        self.assertEqual(self.table.match("Rotary Encoder:: direction: CLOCKWISE t=12.5"),
+                         ("cw",))
+
+    def test_every_matching_prefix_is_returned(self):
+        """ Callbacks of shorter and longer matching prefixes are all returned """
+        self.assertEqual(sorted(self.table.match("Rotary Encoder:: button single press")),
+                         ["any button", "log", "press"])
+
+    def test_unknown_and_short_lines_match_nothing(self):
+        """ Unregistered and truncated lines return no callbacks """
+        self.assertEqual(self.table.match("Debug: heartbeat 42"), ())
+        self.assertEqual(self.table.match("Rotary Encoder:: dir"), ())
+        self.assertEqual(self.table.match(""), ())
+
+
+class FramedProtocolTest(unittest.TestCase):
+    """ Binary frame parsing """
+
+    CW, CCW = 0x01, 0x02
+
+    def setUp(self):
+        self.protocol = FramedProtocol({"cw": self.CW, "ccw": self.CCW})
+        self.protocol.compile({"cw": ["cw"], "ccw": ["ccw"]})
+
+    def events(self, data):
+        """ Feeds bytes, returns called callbacks """
+        return [callback for callback, _ in self.protocol.feed(data)]
+
+    def test_repeat_count(self):
+        """ Frame with repeat count performs event that many times """
+        self.assertEqual(self.events(FramedProtocol.encode(self.CW, 3)), ["cw"] * 3)
+
+    def test_resync_after_garbage(self):
+        """ Noise before and between frames, including false start bytes, is skipped """
+        data = (b"\x00\xa5\x13" + FramedProtocol.encode(self.CW)
+                + b"\xff\xa5" + FramedProtocol.encode(self.CCW, 2))
+        self.assertEqual(self.events(data), ["cw", "ccw", "ccw"])
+
+    def test_bad_checksum_is_rejected(self):
+        """ Frame with wrong checksum performs nothing, following frame still does """
+        broken = bytearray(FramedProtocol.encode(self.CW, 5))
+        broken[3] ^= 0x01
+        self.assertEqual(self.events(bytes(broken) + FramedProtocol.encode(self.CCW)), ["ccw"])
+
+    def test_frame_split_between_reads(self):
+        """ Incomplete frame is kept until the rest of it arrives """
+        frame = FramedProtocol.encode(self.CCW, 2)
+        self.assertEqual(self.events(frame[:1]), [])
+        self.assertEqual(self.events(frame[1:3]), [])
+        self.assertEqual(self.events(frame[3:]), ["ccw", "ccw"])
+
+    def test_unregistered_code_is_ignored(self):
+        """ Valid frame of code without callbacks performs nothing """
+        self.assertEqual(self.events(FramedProtocol.encode(0x7F) + FramedProtocol.encode(self.CW)),
+                         ["cw"])
+
+
+if __name__ == "__main__":
+    unittest.main()
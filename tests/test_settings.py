@@ -0,0 +1,60 @@
+"""
+Settings regression tests.
+
+Usage (from repository root):
+    python -m unittest discover tests
+"""
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# pylint: disable=wrong-import-position # Reason: Qt platform is chosen before Qt is imported
+from PySide6.QtGui import QGuiApplication
+from core.settings import SettingsManager
+
+
+class SettingsPathTest(unittest.TestCase):
+    """ Settings are read from and written to given files only """
+
+    def setUp(self):
+        self.app = QGuiApplication.instance() or QGuiApplication(["remixer-test"])
+        directory = tempfile.TemporaryDirectory() # pylint: disable=consider-using-with # Reason: Removed by cleanup
+        self.addCleanup(directory.cleanup)
+        self.settings_path = os.path.join(directory.name, "settings.json")
+        self.themes_path = os.path.join(directory.name, "themes.json")
+        shutil.copy("settings.json", self.settings_path)
+        shutil.copy("themes.json", self.themes_path)
+        with open(self.settings_path, encoding="utf-8") as file:
+            settings = json.load(file)
+        settings["Aliases"] = {"Test.exe": "Test"}
+        with open(self.settings_path, "w", encoding="utf-8") as file:
+            json.dump(settings, file)
+
+    def read_settings(self):
+        """ Returns contents of test settings file """
+        with open(self.settings_path, encoding="utf-8") as file:
+            return json.load(file)
+
+    def test_load_and_save_use_settings_path(self):
+        """ Theme and profile changes go to loaded file, repository settings stay untouched """
+        with open("settings.json", encoding="utf-8") as file:
+            original = file.read()
+        settings = SettingsManager(self.settings_path, self.themes_path)
+        self.assertEqual(settings.aliases, {"Test.exe": "Test"})
+
+        theme = settings.themes[-1]
+        settings.change_theme(theme)
+        settings.save_volume_profile("Test", {"Test.exe": {"Volume": 0.5, "Mute": False}})
+        saved = self.read_settings()
+        self.assertEqual(saved["SelectedTheme"], theme.name)
+        self.assertIn("Test", saved["VolumeProfiles"])
+        with open("settings.json", encoding="utf-8") as file:
+            self.assertEqual(file.read(), original)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+"""
+Headless simulation regression tests.
+
+Usage (from repository root):
+    python -m unittest discover tests
+"""
+import os
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# pylint: disable=wrong-import-position # Reason: Qt platform is chosen before Qt is imported
+from core.input_recorder import RecordedEvent
+from core.menu import AppVolume
+from core.simulation import Simulation
+
+
+class SimulationTest(unittest.TestCase):
+    """ Repeatability of simulated runs """
+
+    @staticmethod
+    def spin_events():
+        """ Opens menu, activates first application and turns knob back and forth """
+        kinds = ["press", "cw", "press"] + ["cw" if i < 100 else "ccw" for i in range(200)]
+        return [RecordedEvent(kind, "test", (i + 1) * 5_000_000, None)
+                for i, kind in enumerate(kinds)]
+
+    def run_simulation(self):
+        """ Returns report of one run """
+        simulation = Simulation(session_names=["Music.exe", "Game.exe"])
+        try:
+            return simulation.run(self.spin_events(), tail=2.0)
+        finally:
+            simulation.stop()
+
+    def test_backend_calls_are_repeatable(self):
+        """ Identical input makes identical audio backend calls """
+        first = self.run_simulation()
+        second = self.run_simulation()
+        self.assertGreater(first["backend_calls"]["set_volume"], 0)
+        self.assertEqual(first["backend_calls"], second["backend_calls"])
+
+
+class GroupMenuTest(unittest.TestCase):
+    """ Application with several sessions in menu """
+
+    def setUp(self):
+        self.simulation = Simulation(session_names=["Game.exe", "Game.exe", "Music.exe"])
+        self.addCleanup(self.simulation.stop)
+        self.menu_manager = self.simulation.window.menu_manager
+
+    def press(self):
+        """ Presses knob and performs press in next frame """
+        self.simulation.push(RecordedEvent("press", "test", 0, None))
+        self.simulation.frame()
+
+    def test_one_sector_per_application(self):
+        """ Group has one menu item, press opens its sessions """
+        self.press()
+        applications = [item for item in self.menu_manager.current_menu.items
+                        if isinstance(item, AppVolume)]
+        self.assertEqual([item.name for item in applications], ["Game", "Music"])
+
+        self.menu_manager.set_focus_by_condition(lambda item: item is applications[0])
+        self.press()
+        expanded = self.menu_manager.current_menu.items
+        self.assertEqual([item.name for item in expanded],
+                         ["Game all", "Game 1", "Game 2", "Back"])
+        self.assertEqual(expanded[0].sessions, applications[0].sessions)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+Volume ramp and ducking regression tests.
+
+Usage (from repository root):
+    python -m unittest discover tests
+"""
+import unittest
+
+from core.audio_backend import FakeAudioBackend
+from core.volume_ramps import VolumeRamps
+from core.volume_writer import VolumeWriter
+
+
+class VolumeRampsTest(unittest.TestCase):
+    """ Ramps and ducking stepped without threads on test time """
+
+    def setUp(self):
+        self.now = 0.0
+        self.backend = FakeAudioBackend(["Call.exe", "Music.exe", "Game.exe"])
+        self.peak = 0.0
+        self.backend.get_peaks = lambda sessions: [self.peak] * len(sessions)
+        self.writer = VolumeWriter(self.backend)
+        self.writer.clock = lambda: self.now
+        self.writer.threaded = False
+        self.ramps = self.create_ramps({"AttackMs": 0, "ReleaseMs": 0, "HoldMs": 0})
+
+    def create_ramps(self, timing):
+        """ Returns unthreaded scheduler ducking for Call.exe to half volume """
+        ramps = VolumeRamps(self.writer, ducking={"App": "Call.exe", "Level": 0.5, **timing})
+        ramps.clock = lambda: self.now
+        ramps.threaded = False
+        return ramps
+
+    def advance(self, seconds):
+        """ Pumps ramps and writer every 10 ms for given time """
+        for _ in range(round(seconds / 0.01)):
+            self.now += 0.01
+            self.ramps.pump()
+            self.writer.pump()
+
+    def test_replaced_ramp_completes_on_done(self):
+        """ Callback of ramp replaced by newer one is not lost """
+        done = []
+        session = self.backend.sessions[1]
+        self.ramps.ramp([session], 0.0, 1000, lambda: done.append("first"))
+        self.advance(0.1)
+        self.ramps.ramp([session], 0.5, 100, lambda: done.append("second"))
+        self.advance(0.5)
+        self.assertEqual(done, ["first", "second"])
+
+    def test_user_volume_survives_ducking(self):
+        """ Session changed by user while ducked is not restored """
+        music, game = self.backend.sessions[1:]
+        self.peak = 1.0
+        self.advance(0.3)
+        self.assertAlmostEqual(self.writer.get_volume(music), 0.5)
+        self.writer.set_volume(game, 0.8)
+        self.peak = 0.0
+        self.advance(0.3)
+        self.writer.flush()
+        self.assertAlmostEqual(music.volume, 1.0)
+        self.assertAlmostEqual(game.volume, 0.8)
+
+    def test_duck_during_restore_keeps_original(self):
+        """ Call audio stopping and starting does not lower other sessions step by step """
+        self.ramps = self.create_ramps({"AttackMs": 100, "ReleaseMs": 800, "HoldMs": 500})
+        music = self.backend.sessions[1]
+        for _ in range(4):
+            self.peak = 1.0
+            self.advance(0.5)
+            self.peak = 0.0
+            self.advance(0.9)
+        self.advance(5.0)
+        self.writer.flush()
+        self.assertAlmostEqual(music.volume, 1.0)
+
+    def test_no_release_while_loud(self):
+        """ Without hold time sessions stay ducked while trigger is loud """
+        music = self.backend.sessions[1]
+        self.peak = 1.0
+        for _ in range(10):
+            self.advance(0.1)
+            self.assertAlmostEqual(self.writer.get_volume(music), 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+"""
+Volume writer regression tests.
+
+Usage (from repository root):
+    python -m unittest discover tests
+"""
+import unittest
+
+from core.audio_backend import FakeAudioBackend
+from core.volume_writer import VolumeWriter
+
+
+class ScaleVolumesTest(unittest.TestCase):
+    """ Volume of application with several sessions """
+
+    def setUp(self):
+        self.backend = FakeAudioBackend(["Game.exe", "Game.exe"])
+        self.sessions = self.backend.sessions
+        self.sessions[1].volume = 0.5
+        self.writer = VolumeWriter(self.backend, 60)
+
+    def tearDown(self):
+        self.writer.stop()
+
+    def volumes(self):
+        """ Returns volumes written to backend """
+        self.writer.flush(5)
+        return [session.volume for session in self.sessions]
+
+    def test_balance_is_kept(self):
+        """ Quieter session keeps its ratio to the loudest one """
+        self.writer.scale_volumes(self.sessions, 0.6)
+        self.assertEqual(self.volumes(), [0.6, 0.3])
+
+    def test_balance_is_restored_after_silence(self):
+        """ Group turned down to silence gets its balance back when turned up """
+        self.writer.scale_volumes(self.sessions, 0.0)
+        self.assertEqual(self.volumes(), [0.0, 0.0])
+        self.writer.scale_volumes(self.sessions, 0.8)
+        self.assertEqual(self.volumes(), [0.8, 0.4])
+
+
+if __name__ == "__main__":
+    unittest.main()